@@ -11,13 +11,29 @@
 
 from __future__ import print_function, division  # Required for stderr output, must be the first import
 import os  # Pathes processing
+import sys
+import struct  # Binary header of the CSR cache
+import hashlib  # Content hash of the cached network
 try:
 	from igraph import Graph
 except ImportError:
 	Graph = None  # Note: for some functions the Graph class is not required
+try:
+	import numpy as np  # Required for the binary CSR cache of the networks
+except ImportError:
+	np = None  # Note: the networks are parsed from the text without the binary cache
 
 _DEBUG_TRACE = False  # Trace start / stop and other events to stderr;  1 - brief, 2 - detailed, 3 - in-cycles
 
+EXTCSR = '.csr'  # Extension of the binary CSR cache appended to the network file name
+# CSR cache header: magic, flags, offsets item size, nodes, links, source size, source mtime (ns),
+# size of the node ids in bytes, SHA1 of the source content
+_CSRHDR = struct.Struct('<8sIIQQQqQ20s')
+_CSRMAGIC = b'NSLCSR03'  # Version 02 has float64 weights, 03 orders the nodes by their first links
+_CSRALIGN = 64  # Alignment of the header and arrays in the CSR cache
+_CSRDIRECTED = 1  # Directed flag of the CSR cache
+_CSRWEIGHTED = 2  # Weighted flag of the CSR cache
+
 
 def asymnet(netext, asym=None):
 	"""Whether the network is asymmetric (directed, specified by arcs rather than edges)
@@ -142,7 +158,7 @@ def parseHeaderNsl(network, directed=None):
 
 
 def loadNsl(network, directed=None):
-	"""Load the graph from NSL(nse, nsa) file
+	"""Load the graph from NSL(nse, nsa) file using its binary CSR cache if possible
 
 	network  - file name of the input network
 	directed  - whether the input network is directed
@@ -153,6 +169,15 @@ def loadNsl(network, directed=None):
 	if Graph is None:
 		raise ImportError('ERROR, the igraph.Graph is required to be imported')
 
+	csr = loadNslCsr(network, directed)
+	if csr is not None:
+		graph = Graph(n=len(csr.ids), directed=csr.directed)
+		graph.vs["name"] = csr.ids  #pylint: disable=E1137
+		graph.add_edges(np.column_stack((csr.srcs(), csr.dsts)).tolist())
+		if csr.weighted:
+			graph.es["weight"] = csr.wgts.tolist()  #pylint: disable=E1137
+		return graph
+
 	graph = None
 	with open(network) as finp:
 		# Prase the header if exists
@@ -208,3 +233,218 @@ def loadNsl(network, directed=None):
 			assert len(links) == len(weights), 'Weights are not synchronized with links'
 			graph.es["weight"] = weights  #pylint: disable=E1137
 	return graph
+
+
+class NetCsr(object):
+	"""Network in the CSR (Compressed Sparse Row) format loaded from the binary cache
+
+	The links are stored as specified in the network file (edges are not duplicated
+	backward) and grouped by the source nodes. The source nodes are indexed in the order
+	of their first outbound link and followed by the remained nodes in the order of their
+	appearance, so the links of the network file having contiguous links of each source
+	node (the ordinary NSL layout) are retained in their original order. Otherwise,
+	the links of each source node are joined at its first link like in the text parser
+	of the converter. The weights are retained as float64 values rather than the text,
+	so their textual representation is canonical (e.g. 1e-5 -> 1e-05, 0.10 -> 0.1).
+	"""
+	__slots__ = ('directed', 'weighted', 'ids', 'offs', 'dsts', 'wgts')
+
+	def __init__(self, directed, weighted, ids, offs, dsts, wgts=None):
+		"""CSR network attributes
+
+		directed: bool  - the network is directed (specified by arcs)
+		weighted: bool  - the network is weighted
+		ids: list(str)  - node ids (names) by the node index
+		offs: np.array(int32 or int64)  - offsets of the source nodes links in dsts and wgts, len(ids) + 1 items
+		dsts: np.array(int32)  - destination node indices of the links
+		wgts: np.array(float64)  - link weights, None if not weighted
+		"""
+		assert len(offs) == len(ids) + 1 and (wgts is None or len(wgts) == len(dsts)), (
+			'Inconsistent CSR arrays  ids: {}, offs: {}, dsts: {}, wgts: {}'.format(
+			len(ids), len(offs), len(dsts), None if wgts is None else len(wgts)))
+		self.directed = directed
+		self.weighted = weighted
+		self.ids = ids
+		self.offs = offs
+		self.dsts = dsts
+		self.wgts = wgts
+
+	def srcs(self):
+		"""Source node indices of the links
+
+		return  np.array(int32)  - source node index for each link
+		"""
+		return np.repeat(np.arange(len(self.ids), dtype=np.int32), np.diff(self.offs))
+
+
+def nslHash(network, blocksize=1 << 20):
+	"""SHA1 digest of the network file content
+
+	network: str  - file name of the network
+	blocksize: uint  - size of the reading blocks in bytes
+
+	return  bytes  - SHA1 digest
+	"""
+	sha = hashlib.sha1()
+	with open(network, 'rb') as finp:
+		for block in iter(lambda: finp.read(blocksize), b''):
+			sha.update(block)
+	return sha.digest()
+
+
+def _alignCsr(pos):
+	"""Align the position in the CSR cache"""
+	return (pos + _CSRALIGN - 1) // _CSRALIGN * _CSRALIGN
+
+
+def parseNslCsr(network, directed=None):
+	"""Parse NSL(nse, nsa) file to the CSR network
+
+	network: str  - file name of the input network
+	directed: bool  - whether the input network is directed
+		None  - define automatically by the file extension
+
+	return NetCsr  - parsed network
+	"""
+	with open(network) as finp:
+		netinfo = parseHeaderNslFile(finp, asymnet(os.path.splitext(network)[1].lower(), directed))
+		weighted = netinfo.weighted
+		ndsmap = {}  # Node indices by the node ids
+		ids = []
+		srcs = []
+		dsts = []
+		weights = []
+		for ln in finp:
+			# Skip empty lines and comments
+			if not ln or ln[0] == '#':
+				continue
+			parts = ln.split(None, 2)
+			if not parts:
+				continue
+			if weighted is None:
+				weighted = len(parts) == 3
+			elif len(parts) != 2 + weighted:
+				raise ValueError('Weights are inconsistent; weighted: {}, line: {}'
+					.format(weighted, ' '.join(parts)))
+			for nd in parts[:2]:
+				if nd not in ndsmap:
+					ndsmap[nd] = len(ids)
+					ids.append(nd)
+			srcs.append(ndsmap[parts[0]])
+			dsts.append(ndsmap[parts[1]])
+			if weighted:
+				weights.append(float(parts[2]))
+	if netinfo.ndsnum and len(ids) != netinfo.ndsnum:
+		print('WARNING, The number of nodes in the header of "{}" is imprecise: {} != {}'
+			.format(os.path.split(network)[1], netinfo.ndsnum, len(ids)))
+	srcs = np.array(srcs, dtype=np.int32)
+	dsts = np.array(dsts, dtype=np.int32)
+	# Reindex the nodes by their first outbound links to retain the order of the source nodes
+	srcids, srcpos = np.unique(srcs, return_index=True)
+	isrc = np.zeros(len(ids), dtype=bool)
+	isrc[srcids] = True
+	perm = np.concatenate((srcids[np.argsort(srcpos, kind='mergesort')], np.flatnonzero(~isrc))).astype(np.int32)
+	remap = np.empty(len(ids), dtype=np.int32)
+	remap[perm] = np.arange(len(ids), dtype=np.int32)
+	ids = [ids[i] for i in perm.tolist()]
+	srcs = remap[srcs]
+	dsts = remap[dsts]
+	# Note: the stable sorting retains the order of the links of each source node
+	order = np.argsort(srcs, kind='mergesort')
+	offs = np.zeros(len(ids) + 1, dtype=np.int32 if len(srcs) < 1 << 31 else np.int64)
+	np.cumsum(np.bincount(srcs, minlength=len(ids)), out=offs[1:])
+	return NetCsr(bool(netinfo.directed), bool(weighted), ids, offs
+		, dsts[order]
+		, None if not weighted else np.array(weights, dtype=np.float64)[order])
+
+
+def saveNslCsr(csr, network, cache=None):
+	"""Save the CSR network to the binary cache
+
+	csr: NetCsr  - the network to be saved
+	network: str  - file name of the source network
+	cache: str  - file name of the binary cache, network + EXTCSR by default
+	"""
+	if cache is None:
+		cache = network + EXTCSR
+	stat = os.stat(network)
+	ids = '\n'.join(csr.ids).encode('utf8')
+	hdr = _CSRHDR.pack(_CSRMAGIC, _CSRDIRECTED * csr.directed | _CSRWEIGHTED * csr.weighted
+		, csr.offs.dtype.itemsize, len(csr.ids), len(csr.dsts), stat.st_size
+		, getattr(stat, 'st_mtime_ns', int(stat.st_mtime * 1e9)), len(ids), nslHash(network))
+	# Note: the cache is written to the temporary file and then renamed to be consistent for the concurrent readers
+	tmpcache = '{}.{}.tmp'.format(cache, os.getpid())
+	try:
+		with open(tmpcache, 'wb') as fout:
+			for data in (hdr, ids, csr.offs, csr.dsts, csr.wgts):
+				if data is None:
+					continue
+				fout.seek(_alignCsr(fout.tell()))
+				fout.write(data if isinstance(data, bytes) else np.ascontiguousarray(data).tobytes())
+		os.rename(tmpcache, cache)
+	finally:
+		if os.path.exists(tmpcache):
+			os.remove(tmpcache)
+
+
+def loadNslCsr(network, directed=None, update=True):
+	"""Load the CSR network from the binary cache of NSL(nse, nsa) file
+
+	The arrays are memory mapped, so the concurrent processes share them via the page cache.
+	The cache is validated by the size and modification time of the network file
+	and then by its content hash.
+
+	network: str  - file name of the input network
+	directed: bool  - whether the input network is directed
+		None  - define automatically by the file extension
+	update: bool  - create or update the cache if it is absent or outdated, otherwise None is returned
+
+	return NetCsr  - loaded network or None if the cache is not available
+	"""
+	if np is None:
+		return None
+	cache = network + EXTCSR
+	try:
+		with open(cache, 'rb') as fcache:
+			(magic, flags, offsize, ndsnum, lnsnum, srcsize, srcmtime, idsnum, srchash
+				) = _CSRHDR.unpack(fcache.read(_CSRHDR.size))
+			if magic != _CSRMAGIC:
+				raise ValueError('Unexpected format of the CSR cache: ' + cache)
+			stat = os.stat(network)
+			mtime = getattr(stat, 'st_mtime_ns', int(stat.st_mtime * 1e9))
+			if srcsize != stat.st_size or (srcmtime != mtime and srchash != nslHash(network)):
+				raise ValueError('The CSR cache is outdated: ' + cache)
+			if srcmtime != mtime:
+				# The content is not changed (touched or copied network), so the modification time is updated
+				# in the header to omit the hashing on the subsequent loading
+				try:
+					with open(cache, 'r+b') as fhdr:
+						fhdr.write(_CSRHDR.pack(magic, flags, offsize, ndsnum, lnsnum, stat.st_size, mtime
+							, idsnum, srchash))
+				except (IOError, OSError) as err:
+					if _DEBUG_TRACE:
+						print('  The header of the CSR cache can not be updated: {}'.format(err), file=sys.stderr)
+			pos = _alignCsr(_CSRHDR.size)
+			fcache.seek(pos)
+			ids = fcache.read(idsnum).decode('utf8').split('\n') if ndsnum else []
+		pos = _alignCsr(pos + idsnum)
+		offs = np.memmap(cache, dtype=np.int32 if offsize == 4 else np.int64, mode='r', offset=pos, shape=(ndsnum + 1,))
+		pos = _alignCsr(pos + offs.nbytes)
+		dsts = np.memmap(cache, dtype=np.int32, mode='r', offset=pos, shape=(lnsnum,)) if lnsnum else np.empty(0, np.int32)
+		wgts = None
+		if flags & _CSRWEIGHTED:
+			pos = _alignCsr(pos + dsts.nbytes)
+			wgts = np.memmap(cache, dtype=np.float64, mode='r', offset=pos, shape=(lnsnum,)) if lnsnum else np.empty(0, np.float64)
+		# Note: the network type defined by the header overwrites the specified one
+		return NetCsr(bool(flags & _CSRDIRECTED), bool(flags & _CSRWEIGHTED), ids, offs, dsts, wgts)
+	except (IOError, OSError, ValueError, struct.error) as err:
+		if not update:
+			return None
+		if _DEBUG_TRACE and os.path.exists(cache):
+			print('  The CSR cache is rebuilt: {}'.format(err), file=sys.stderr)
+	csr = parseNslCsr(network, directed)
+	try:
+		saveNslCsr(csr, network, cache)
+	except (IOError, OSError) as err:
+		print('WARNING, the CSR cache of "{}" can not be saved: {}'.format(network, err), file=sys.stderr)
+	return csr
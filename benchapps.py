@@ -216,41 +216,51 @@ class PyBin(object):
 	_pypy3 = None
 	_pypy = None
 	_python3 = None
+	_probed = False  # The existing Python interpreters are identified
 
-	# Initialized existing Python interpreters once
-	try:
-		with open(os.devnull, 'wb') as fdevnull:
-			# Note: More accurate solution is not check "python -V" output, but it fails on Python2 for the
-			# 'python -V' (but works for the 'python -h')
-			# pyverstr = subprocess.check_output([PYEXEC, '-V']).decode()  # Note: Xcoding is required for Python3
-			##pyverstr = subprocess.Popen((PYEXEC, '-V'), stdout=subprocess.PIPE).communicate()[0].decode()
-			# pyver = int(reFirstDigits.search(pyverstr).group())  # Take the first digits, i.e. the major version
-			# pybin = 'python' if pyver >= 3 else PYEXEC
-			#
-			# Check for the pypy interpreter/JIT in the system if required
-			# ATTENTION: due to some bug 'python -V' does not output results
-			# to the specified pipe and .check_output() also fails to deliver results,
-			# always outputting to the stdout (which is not desirable in our case);
-			# 'python -V' works fine only for the Python3 that is why it is not used here.
-			try:
-				if not subprocess.call(('pypy3', '-h'), stdout=fdevnull):
-					_pypy3 = 'pypy3'
-			except OSError:
-				pass
-			try:
-				if not subprocess.call(('pypy', '-h'), stdout=fdevnull):
-					_pypy = 'pypy'
-			except OSError:
-				pass
-			try:
-				if not subprocess.call(('python3', '-h'), stdout=fdevnull):
-					_python3 = 'python3'
-			except OSError:
-				pass
-	except IOError:
-		# Note: the required interpreter existence in the system can't be checked here,
-		# only 'python' is assumed to be present by default.
-		pass
+	@staticmethod
+	def _probe():
+		"""Identify existing Python interpreters once on the first request
+
+		Note: the interpreters are not probed on the module import to not spawn
+		the processes by each script importing this module
+		"""
+		if PyBin._probed:
+			return
+		PyBin._probed = True
+		try:
+			with open(os.devnull, 'wb') as fdevnull:
+				# Note: More accurate solution is not check "python -V" output, but it fails on Python2 for the
+				# 'python -V' (but works for the 'python -h')
+				# pyverstr = subprocess.check_output([PYEXEC, '-V']).decode()  # Note: Xcoding is required for Python3
+				##pyverstr = subprocess.Popen((PYEXEC, '-V'), stdout=subprocess.PIPE).communicate()[0].decode()
+				# pyver = int(reFirstDigits.search(pyverstr).group())  # Take the first digits, i.e. the major version
+				# pybin = 'python' if pyver >= 3 else PYEXEC
+				#
+				# Check for the pypy interpreter/JIT in the system if required
+				# ATTENTION: due to some bug 'python -V' does not output results
+				# to the specified pipe and .check_output() also fails to deliver results,
+				# always outputting to the stdout (which is not desirable in our case);
+				# 'python -V' works fine only for the Python3 that is why it is not used here.
+				try:
+					if not subprocess.call(('pypy3', '-h'), stdout=fdevnull):
+						PyBin._pypy3 = 'pypy3'
+				except OSError:
+					pass
+				try:
+					if not subprocess.call(('pypy', '-h'), stdout=fdevnull):
+						PyBin._pypy = 'pypy'
+				except OSError:
+					pass
+				try:
+					if not subprocess.call(('python3', '-h'), stdout=fdevnull):
+						PyBin._python3 = 'python3'
+				except OSError:
+					pass
+		except IOError:
+			# Note: the required interpreter existence in the system can't be checked here,
+			# only 'python' is assumed to be present by default.
+			pass
 
 	@staticmethod
 	def bestof(pypy, v3):
@@ -259,6 +269,7 @@ class PyBin(object):
 		pypy  - whether to consider PyPy versions, give priority to pypy over the CPython (standard interpreter)
 		v3  - whether to consider interpretors of v3.x, give priority to the largest version
 		"""
+		PyBin._probe()
 		pybin = PYEXEC
 		pyname = os.path.split(pybin)[1]
 		if pypy and v3 and PyBin._pypy3:
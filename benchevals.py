@@ -51,14 +51,20 @@ if not hasattr(time, 'perf_counter'):  #pylint: disable=C0413
 
 from subprocess import PIPE
 # Queue is required to asynchronously save evaluated quality measures to the persistent storage
-from multiprocessing import cpu_count  # , Value, sharedctypes, Process, Queue
-# try:
-# 	import queue  # queue in Python3
-# except ImportError:  # Queue in Python2
-# 	import Queue as queue  # For exceptions handling: queue.Full, etc.
+from multiprocessing import cpu_count, Process, Queue
+try:
+	# The persister is spawned to open the storage being opened by the caller
+	from multiprocessing import get_context
+except ImportError:
+	get_context = None  # Python 2, the storage is read by the caller before the persister starts
+try:
+	import queue  # queue in Python3
+except ImportError:  # Queue in Python2
+	import Queue as queue  # For exceptions handling: queue.Empty, etc.
 
 # Required for the aggregation of the quality evaluations
 import math
+import warnings  # Suppression of the expected NumPy warnings
 # import copy
 import fnmatch  # Matching of the name wildcards
 import itertools  # chain
@@ -70,7 +76,7 @@ import h5py  # HDF5 storage
 
 # from benchapps import  # funcToAppName,
 from benchutils import viewitems, viewvalues, syncedTime, \
- tobackup, funcToAppName, staticTrace, \
+ tobackup, funcToAppName, \
  SEPPARS, UTILDIR, ALGSDIR, \
  TIMESTAMP_START  #, escapePathWildcards, envVarDefined, SEPPATHID, SEPINST, TIMESTAMP_START_HEADER, TIMESTAMP_START_STR
 from utils.mpepool import Task, Job, AffinityMask
@@ -99,6 +105,10 @@ EXTRESCONS = '.rcp'  # Extension for the Resource Consumption Profile (made by t
 EXTAGGRES = '.res'  # Extension for the aggregated results
 EXTAGGRESEXT = '.resx'  # Extension for the extended aggregated results
 _EXTQDATASET = '.dat'  # Extension for the HDF5 datasets
+# Extension for the HDF5 datasets of the evaluation timestamps of each measure,
+# used to omit evaluation of the existent results
+_EXTQTIMES = '.tms'
+_AGGBLOCKMAX = 1 << 20  # Max number of the quality values in the dataset block read at once on the aggregation
 # Job/Task name parts separator ('/' is the best choice because it can not appear in a file name,
 # which can be part of job name)
 SEPNAMEPART = '/'
@@ -287,106 +297,288 @@ class QEntry(object):
 		return ', '.join([': '.join((name, str(self.__getattribute__(name)))) for name in self.__slots__])
 
 
+def putAlive(holder, item, timeout=1):
+	"""Put the item to the persister queue while the persister is alive
+
+	holder: list  - holder of the persister queue and process: [queue, persister]
+	item  - the item to be put: QEntry, storage modification request or None (termination request)
+	timeout: float  - period of the persister liveness check in sec while the queue is full
+
+	Raises:
+		RuntimeError  - the persister has died, so the item can not be saved
+	"""
+	qsqueue, persister = holder
+	while True:
+		# Note: the liveness is checked before the putting to not wait for the dead persister on each item
+		if not persister.is_alive():
+			raise RuntimeError('The persister has died with the code {}'.format(persister.exitcode))
+		try:
+			qsqueue.put(item, timeout=timeout)
+			return
+		except queue.Full:
+			pass
+
+
+def openUnlocked(storage, mode):
+	"""Open the HDF5 storage without the file locking
+
+	The storage is modified by the persister process and read concurrently
+	to check the existent evaluations.
+
+	storage: str  - file name of the HDF5 storage
+	mode: str  - opening mode of the storage
+
+	return  h5py.File  - the opened storage
+	"""
+	try:
+		return h5py.File(storage, mode=mode, libver='latest', locking=False)
+	except TypeError:  # The locking parameter is not supported by h5py < 3.5
+		os.environ['HDF5_USE_FILE_LOCKING'] = 'FALSE'
+		return h5py.File(storage, mode=mode, libver='latest')
+
+
+class QGroup(object):
+	"""Structure mirror of the HDF5 group of the quality evaluations storage
+
+	The storage file is owned by the persister process of the QualitySaver,
+	so the groups and their attributes are created in this mirror and the
+	modifications are propagated to the persister via the queue.
+	"""
+	__slots__ = ('name', 'parent', 'attrs', '_groups', '_queue')
+
+	def __init__(self, name, parent, queue):
+		"""Group initialization
+
+		name: str  - absolute name of the group: '/' or /<algname>[/<basenet><pathid>]
+		parent: QGroup  - parent group, None for the root
+		queue: list  - holder of the queue and the persister process to propagate
+			the modifications: [queue, persister], shared by the whole storage mirror
+		"""
+		self.name = name
+		self.parent = parent
+		self.attrs = QAttrs(self)
+		self._groups = {}
+		self._queue = queue
+
+	def _send(self, item):
+		"""Propagate the modification to the persister
+
+		item: tuple  - the modification request
+		"""
+		if self._queue[0] is None:
+			raise RuntimeError('The storage modification requires an active QualitySaver context: ' + self.name)
+		putAlive(self._queue, item)
+
+	def __getitem__(self, name):
+		"""Fetch the subgroup
+
+		name: str  - relative name of the subgroup
+
+		return  group: QGroup  - the subgroup, KeyError is raised if it does not exist
+		"""
+		group = self
+		for gname in name.split('/'):
+			if gname:
+				group = group._groups[gname]  #pylint: disable=W0212
+		return group
+
+	def __contains__(self, name):
+		try:
+			self[name]
+		except KeyError:
+			return False
+		return True
+
+	def __iter__(self):
+		return iter(self._groups)
+
+	def _add(self, name):
+		"""Add the direct subgroup to the mirror without the propagation"""
+		group = QGroup(self.name.rstrip('/') + '/' + name, self, self._queue)
+		self._groups[name] = group
+		return group
+
+	def create_group(self, name):
+		"""Create the direct subgroup
+
+		name: str  - name of the subgroup
+
+		return  group: QGroup  - the created subgroup, ValueError is raised if it already exists
+		"""
+		assert name and '/' not in name, 'A direct subgroup name is expected: ' + name
+		if name in self._groups:
+			raise ValueError('The group already exists: ' + name)
+		group = self._add(name)
+		self._send((QualitySaver.REQ_GROUP, group.name))
+		return group
+
+	def require_group(self, name):
+		"""Open the direct subgroup creating it if required
+
+		name: str  - name of the subgroup
+
+		return  group: QGroup  - the subgroup
+		"""
+		group = self._groups.get(name)
+		return group if group is not None else self.create_group(name)
+
+
+class QAttrs(dict):
+	"""Attributes of the QGroup, propagated to the persister on creation"""
+	__slots__ = ('_group',)
+
+	def __init__(self, group):
+		"""Attributes initialization
+
+		group: QGroup  - owner group
+		"""
+		super(QAttrs, self).__init__()
+		self._group = group
+
+	def create(self, name, data, shape=None, dtype=None):
+		"""Create or overwrite the attribute like h5py.AttributeManager.create()
+
+		name: str  - attribute name
+		data  - attribute value
+		shape: tuple  - shape of the attribute value
+		dtype  - type of the attribute value
+		"""
+		val = np.array(data, dtype=dtype)
+		if shape is not None:
+			val = val.reshape(shape)
+		self[name] = val
+		self._group._send((QualitySaver.REQ_ATTR, self._group.name, name, val))  #pylint: disable=W0212
+
+
 class QualitySaver(object):
-	"""Quality evaluations saver to the persistent storage"""
+	"""Quality evaluations saver to the persistent storage
+
+	The evaluations are streamed via the queue to the dedicated persister process,
+	which exclusively owns the on-disk HDF5 storage and writes the batched
+	values to the chunked datasets flushing them periodically.
+	The storage structure (groups and their attributes) is mirrored in the
+	calling process (.storage) and the modifications are propagated to the persister.
+	"""
 	# Max number of the buffered items in the queue that have not been processed
 	# before blocking the caller on appending more items
 	# Should not be too much to save them into the persistent store on the
 	# program termination or any external interruptions
 	QUEUE_SIZEMAX = max(128, cpu_count() * 2)  # At least 128 or twice the number of the logical CPUs in the system
+	BATCH_SIZEMAX = 1024  # Max number of the buffered values in the persister before writing them to the storage
+	LATENCY = 2  # Flushing period of the persister in seconds
+	# Requests of the persister
+	REQ_GROUP = 'g'  # Group creation: (REQ_GROUP, name)
+	REQ_ATTR = 'a'  # Attribute creation: (REQ_ATTR, group_name, attr_name, value)
+	# Note: QEntry is the value saving request and None is the termination request
+
+	@staticmethod
+	def _persist(storage, qsqueue, compression=None, latency=LATENCY, batchmax=BATCH_SIZEMAX):
+		"""Persister process function to save data to the persistent storage
+
+		storage: str  - file name of the HDF5 storage
+		qsqueue: Queue  - quality saver queue of QEntry items and storage modification requests
+		compression: str  - compression filter of the created datasets: None, 'gzip', 'lzf'
+		latency: float  - flushing period of the persister in sec, recommended value: 1-3 sec
+		batchmax: uint  - max number of the buffered values before writing them to the storage
+		"""
+		fstorage = openUnlocked(storage, 'a')
+		batches = {}  # Buffered values of the datasets: {(group, dsname, runs): [(index, val)]}
+		nvals = 0  # The number of the buffered values
+		tflush = time.perf_counter()
+		try:
+			while True:
+				try:
+					qm = qsqueue.get(timeout=max(latency - (time.perf_counter() - tflush), 0.01))
+				except queue.Empty:
+					qm = False
+				if qm is None:
+					break
+				if isinstance(qm, QEntry):
+					runs = QMSRUNS.get(qm.smeta.measure, 1)
+					ind = (qm.smeta.iins, qm.smeta.ishf, qm.smeta.ilev, qm.smeta.irun)
+					# Timestamp of the evaluation shared by all metrics of the measure
+					batches.setdefault((qm.smeta.group, qm.smeta.measure + (_SUFULEV if qm.smeta.ulev else '')
+						+ _EXTQTIMES, qm.smeta.ulev, runs), []).append((ind, time.time()))
+					for metric, mval in viewitems(qm.data):
+						# Construct dataset name based on the quality measure binary name and its metric name
+						# (in case of multiple metrics are evaluated by the executing app)
+						dsname = qm.smeta.measure if not metric else _PREFMETR.join((qm.smeta.measure, metric))
+						if qm.smeta.ulev:
+							dsname += _SUFULEV
+						batches.setdefault((qm.smeta.group, dsname + _EXTQDATASET, qm.smeta.ulev
+							, runs), []).append((ind, mval))
+					nvals += len(qm.data)
+				elif qm:
+					try:
+						if qm[0] == QualitySaver.REQ_GROUP:
+							fstorage.require_group(qm[1])
+						else:
+							assert qm[0] == QualitySaver.REQ_ATTR, 'Unexpected request: ' + str(qm[0])
+							fstorage[qm[1]].attrs.create(qm[2], qm[3])
+					except Exception as err:  #pylint: disable=W0703
+						print('ERROR, the storage modification {} failed: {}. {}'.format(
+							qm, err, traceback.format_exc(5)), file=sys.stderr)
+				if nvals >= batchmax or (time.perf_counter() - tflush >= latency and nvals):
+					QualitySaver._write(fstorage, batches, compression)
+					batches.clear()
+					nvals = 0
+					fstorage.flush()
+					tflush = time.perf_counter()
+		finally:
+			if batches:
+				QualitySaver._write(fstorage, batches, compression)
+			fstorage.close()
 
-	# LATENCY = 1  # Latency in seconds
+	@staticmethod
+	def _write(fstorage, batches, compression=None):
+		"""Write batches of the values to the storage datasets
 
-	# TODO: Efficient multiprocess implementation requires a single instance of the storage to not reload
-	# the storage after each creation of a new group or dataset in it. So, group and dataset creation requests
-	# should be performed via the queue together with the ordinary data entry creation requests implemented as follows.
-	# @staticmethod
-	# def __datasaver(qsqueue, syncstorage, active, timeout=None, latency=2.):
-	# 	"""Worker process function to save data to the persistent storage
-	#
-	# 	qsqueue: Queue  - quality saver queue of QEntry items
-	# 	syncstorage: h5py.File  - synchronized wrapper of the HDF5 storage
-	# 	active: Value('B', lock=False)  - the saver process is operational (the requests can be processed)
-	# 	timeout: float  - global operational timeout in seconds, None means no timeout
-	# 	latency: float  - latency of the datasaver in sec, recommended value: 1-3 sec
-	# 	"""
-	# 	# def fetchAndSave():
-	#
-	# 	tstart = time.perf_counter()  # Global start time
-	# 	tcur = tstart  # Start of the current iteration
-	# 	while (active.value and (timeout is None or tcur - tstart < timeout)):
-	# 		# Fetch and serialize items from the queue limiting their number
-	# 		# (can be added in parallel) to avoid large latency
-	# 		i = 0
-	# 		while not qsqueue.empty() and i < QualitySaver.QUEUE_SIZEMAX:
-	# 			i += 1
-	# 			# qm = qsqueue.get(True, timeout=latency)  # Measures to be stored
-	# 			qm = qsqueue.get_nowait()
-	# 			assert isinstance(qm, QEntry), 'Unexpected type of the quality entry: ' + type(qm).__name__
-	# 			# Save data elements (entries)
-	# 			for metric, mval in  viewitems(qm.data):
-	# 				try:
-	# 					# Metric is  str (or can be unicode in Python2)
-	# 					assert isinstance(mval, float), 'Invalid data type, metric: {}, value: {}'.format(
-	# 						type(metric).__name__, type(mval).__name__)
-	# 					# Construct dataset name based on the quality measure binary name and its metric name
-	# 					# (in case of multiple metrics are evaluated by the executing app)
-	# 					dsname = qm.smeta.measure if not metric else _PREFMETR.join((qm.smeta.measure, metric))
-	# 					if qm.smeta.ulev:
-	# 						dsname += _SUFULEV
-	# 					dsname += _EXTQDATASET
-	# 					# Open or create the required dataset
-	# 					qmgroup = syncstorage.value[qm.smeta.group]
-	# 					qmdata = None
-	# 					try:
-	# 						qmdata = qmgroup[dsname]
-	# 					except KeyError:
-	# 						# Such dataset does not exist, create it
-	# 						nins = 1
-	# 						nshf = 1
-	# 						nlev = 1
-	# 						if not qm.smeta.ulev:
-	# 							nins = qmgroup.attrs[SATTRNINS]
-	# 							nshf = qmgroup.attrs[SATTRNSHF]
-	# 							nlev = qmgroup.parent.attrs[SATTRNLEV]
-	# 						qmdata = qmgroup.create_dataset(dsname, shape=(nins, nshf, nlev, QMSRUNS.get(qm.smeta.measure, 1)),
-	# 							# 32-bit floating number, checksum (fletcher32)
-	# 							dtype='f4', fletcher32=True, fillvalue=np.float32(np.nan), track_times=True)
-	# 							# NOTE: Numpy NA (not available) instead of NaN (not a number) might be preferable
-	# 							# but it requires latest NumPy versions.
-	# 							# https://www.numpy.org/NA-overview.html
-	# 							# Numpy NAs (https://docs.scipy.org/doc/numpy-1.14.0/neps/missing-data.html):
-	# 							# np.NA,  dtype='NA[f4]', dtype='NA', np.dtype('NA[f4,NaN]')
-	# 					# Save data to the storage
-	# 					with syncstorage.get_lock():
-	# 						qmdata[qm.smeta.iins][qm.smeta.ishf][qm.smeta.ilev][qm.smeta.irun] = mval
-	# 				except Exception as err:  #pylint: disable=W0703;  # queue.Empty as err:  # TypeError (HDF5), KeyError
-	# 					print('ERROR, saving of {} in {}{}{} failed: {}. {}'.format(mval, qm.smeta.measure,
-	# 						'' if not metric else _PREFMETR + metric, '' if not qm.smeta.ulev else _SUFULEV,
-	# 						err, traceback.format_exc(5)), file=sys.stderr)
-	# 				# alg = apps.require_dataset('Pscan01'.encode(),shape=(0,),dtype=h5py.special_dtype(vlen=bytes),chunks=(10,),maxshape=(None,),fletcher32=True)
-	# 				# 	# Allocate chunks of 10 items starting with empty dataset and with possibility
-	# 				# 	# to resize up to 500 items (params combinations)
-	# 				# 	self.apps[app] = appsdir.require_dataset(app, shape=(0,), dtype=h5py.special_dtype(vlen=_h5str)
-	# 				# 		, chunks=(10,), maxshape=(500,))  # , maxshape=(None,), fletcher32=True
-	# 				# self.evals = self.storage.require_group('evals')  # Quality evaluations dir (group)
-	# 		# Prepare for the next iteration considering the processing latency to reduce CPU loading
-	# 		duration = time.perf_counter() - tcur
-	# 		if duration < latency:
-	# 			time.sleep(latency - duration)
-	# 			duration = latency
-	# 		tcur += duration
-	# 	active.value = False
-	# 	if not qsqueue.empty():
-	# 		try:
-	# 			print('WARNING QualitySaver, {} items remained unsaved in the terminating queue'
-	# 				.format(qsqueue.qsize()))
-	# 		except NotImplementedError:
-	# 			print('WARNING QualitySaver, some items remained unsaved in the terminating queue')
-	# 	# Note: qsqueue closing in the worker process (here) causes exception on the QualSaver destruction
-	# 	# qsqueue.close()  # Close queue to prevent scheduling another tasks
-
-	def __init__(self, seed, update=False):  # , timeout=None;  algs, qms, nets=None
+		fstorage: h5py.File  - the opened HDF5 storage
+		batches: dict((group, dsname, ulev, runs), [(index, val)])  - buffered values of the datasets
+		compression: str  - compression filter of the created datasets
+		"""
+		for (gname, dsname, ulev, runs), items in viewitems(batches):
+			# Note: timestamps require the double precision and 0 means the absence of the value
+			dtype = np.float64 if dsname.endswith(_EXTQTIMES) else np.float32
+			try:
+				qmgroup = fstorage[gname]
+				qmdata = qmgroup.get(dsname)
+				if qmdata is None:
+					# Such dataset does not exist, create it
+					nins = int(np.ravel(qmgroup.attrs[SATTRNINS])[0])
+					nshf = int(np.ravel(qmgroup.attrs[SATTRNSHF])[0])
+					nlev = 1 if ulev else int(np.ravel(qmgroup.parent.attrs[SATTRNLEV])[0])
+					# Note: a chunk holds all levels and runs of the network instance shuffle,
+					# which are evaluated together
+					qmdata = qmgroup.create_dataset(dsname, shape=(nins, nshf, nlev, runs),
+						# 32-bit floating number, checksum (fletcher32)
+						dtype=dtype, chunks=(1, 1, nlev, runs), compression=compression,
+						fletcher32=True, fillvalue=dtype(np.nan if dtype is np.float32 else 0), track_times=True)
+					# NOTE: Numpy NA (not available) instead of NaN (not a number) might be preferable
+					# but it requires latest NumPy versions.
+					# https://www.numpy.org/NA-overview.html
+				# Note: the out of bound values are omitted in case of update
+				inds = np.array([ind for ind, _ in items], dtype=np.uint32)
+				inbound = (inds < qmdata.shape).all(axis=1)
+				if not inbound.all():
+					print('WARNING, {} out of bound values are omitted in {}/{}'.format(
+						len(items) - inbound.sum(), gname, dsname), file=sys.stderr)
+					inds = inds[inbound]
+				if not len(inds):
+					continue
+				vals = np.array([val for _, val in items], dtype=dtype)[inbound]
+				# Update the bounding hyperslab of the values at once
+				imin = inds.min(axis=0)
+				imax = inds.max(axis=0) + 1
+				slab = tuple(slice(b, e) for b, e in zip(imin, imax))
+				block = qmdata[slab]
+				block[tuple((inds - imin).T)] = vals
+				qmdata[slab] = block
+			except Exception as err:  #pylint: disable=W0703
+				print('ERROR, saving of {} values into {}/{} failed: {}. {}'.format(
+					len(items), gname, dsname, err, traceback.format_exc(5)), file=sys.stderr)
+
+	def __init__(self, seed, update=False, compression=None):  # , timeout=None;  algs, qms, nets=None
 		"""Creating or open HDF5 storage and prepare for the quality measures evaluations
 
 		Check whether the storage exists, copy/move old storage to the backup and
@@ -394,22 +586,18 @@ class QualitySaver(object):
 
 		seed: uint64  - benchmarking seed, natural number
 		update: bool  - update existing storage creating if not exists, or create a new one backing up the existent
+		compression: str  - compression filter of the created datasets: None, 'gzip', 'lzf'
 
 		Members:
-			storage: h5py.File  - HDF5 storage with synchronized access
-				ATTENTION: parallel write to the storage is not supported, i.e. requires synchronization layer
+			storage: QGroup  - structure mirror of the HDF5 storage, which is modified
+				by the persister process in the QualitySaver context
+			path: str  - file name of the HDF5 storage
+			queue: Queue  - multiprocess queue whose items are saved (persisted)
+			_persister: Process  - persister worker process
+			_fqtimes: h5py.File  - storage opened in the context to load the evaluation timestamps on the first check
 		"""
-		# timeout: float  - global operational timeout in seconds, None means no timeout
-		# Members:
-		# 	_persister: Process  - persister worker process
-		# 	queue: Queue  - multiprocess queue whose items are saved (persisted)
-		# 	_active: Value('B')  - the storage is operational (the requests can be processed)
-
-		# and (timeout is None or timeout >= 0)
 		assert isinstance(seed, int), 'Invalid seed type: {}'.format(type(seed).__name__)
 		# Open or init the HDF5 storage
-		# self._tstart = time.perf_counter()
-		# self.timeout = timeout
 		timefmt = '%y%m%d-%H%M%S'  # Start time of the benchmarking, time format: YYMMDD_HHMMSS
 		timestamp = time.strftime(timefmt, TIMESTAMP_START)  # Timestamp string
 		seedstr = str(seed)
@@ -427,7 +615,7 @@ class QualitySaver(object):
 			bcksftime = None
 			if update:
 				try:
-					fstorage = h5py.File(storage, mode='r', driver='core', libver='latest')
+					fstorage = h5py.File(storage, mode='r', libver='latest')
 					ublocksize = fstorage.userblock_size
 					fstorage.close()
 				except OSError:
@@ -466,7 +654,7 @@ class QualitySaver(object):
 		# Create HFD5 storage if required
 		if not update:
 			# Create the storage, fail if exists ('w-' or 'x')
-			fstorage = h5py.File(storage, mode='w-', driver='core', libver='latest', userblock_size=ublocksize)
+			fstorage = h5py.File(storage, mode='w-', libver='latest', userblock_size=ublocksize)
 			ubsize = fstorage.userblock_size  # Actual user block size of the storage
 			fstorage.close()
 			# Write the userblock
@@ -482,163 +670,166 @@ class QualitySaver(object):
 					', initial data size: {} (seed: {}, sep: {}, timestamp:{})'.format(storage, ubsize,
 					len(seedstr) + len(ublocksep) + len(timestamp), len(seedstr), len(ublocksep), len(timestamp)))
 			# print('> HDF5 storage userblock created: ', seedstr, ublocksep, timestamp)
-		# Note: append mode is the default one; core driver is a memory-mapped file, block_size is default (64 Kb)
-		# Persistent storage object (file)
-		self.storage = h5py.File(storage, mode='a', driver='core', libver='latest', userblock_size=ublocksize)
+		# Note: the storage is on-disk (sec2 driver) to bound the memory consumption for the large
+		# evaluation grids, it is modified only by the persister process after the initialization
+		fstorage = h5py.File(storage, mode='a', libver='latest', userblock_size=ublocksize)
 		# Add attributes if required
 		dqrname = 'dims_qms_raw'
-		if self.storage.attrs.get(dqrname) is None or update:
+		if fstorage.attrs.get(dqrname) is None or update:
 			# Describe dataset dimensions
 			# Note: the dimension is implicitly omitted in the visualizing table if its size equals to 1
 			dims_qms_raw = ('inst', 'shuf', 'levl', 'mrun')
 			dqrlen = max((len(s) for s in dims_qms_raw)) + 1
 			dqrtype = 'a' + str(dqrlen)  # Zero terminated bytes, fixed length
 			# NOTE: the existing attribute is overwritten
-			self.storage.attrs.create(dqrname, data=np.array(dims_qms_raw, dtype=dqrtype))
+			fstorage.attrs.create(dqrname, data=np.array(dims_qms_raw, dtype=dqrtype))
 			# shape=(len(dims_qms_raw),), dtype=dqrtype)
 			# dims_qms_agg = ('net'): ('avg', 'var', 'num')  # 'dims_qms_agg'
 
-		# except Exception as err:  #pylint: disable=W0703
-		# 	print('ERROR, HDF5 storage creation failed: {}. {}'.format(err, traceback.format_exc(5)), file=sys.stderr)
-		# 	raise
+		# Load the structure mirror of the storage (groups and their attributes)
+		self._queue = [None, None]  # Holder of the queue and persister shared with the storage mirror
+		self.storage = QGroup('/', None, self._queue)
+		# Evaluation timestamps of the measures loaded on the first access: {(group, measure[+u]): np.array or str},
+		# where str is the name of the dataset to be loaded
+		self._qtimes = {}
+		def mirror(name, obj):
+			"""Mirror the HDF5 group and names of the evaluation timestamps datasets"""
+			if isinstance(obj, h5py.Dataset):
+				if name.endswith(_EXTQTIMES):
+					parent, _, dsname = name.rpartition('/')
+					self._qtimes[('/' + parent, dsname[:-len(_EXTQTIMES)])] = name
+			elif isinstance(obj, h5py.Group):
+				parent, _, gname = name.rpartition('/')
+				group = (self.storage if not parent else self.storage[parent])._add(gname)  #pylint: disable=W0212
+				for aname, aval in viewitems(obj.attrs):
+					dict.__setitem__(group.attrs, aname, aval)
+		try:
+			for aname, aval in viewitems(fstorage.attrs):
+				dict.__setitem__(self.storage.attrs, aname, aval)
+			fstorage.visititems(mirror)
+		finally:
+			fstorage.close()
+		self.path = storage
+		self.compression = compression
+		self._persister = None
+		# Storage to load the evaluation timestamps in the context, which is opened before the persister
+		# since the storage opened for write can not be opened by another process
+		self._fqtimes = None
 
-		# Initialize or update metadata and groups
-		# # rescons meta data (h5str array)
-		# try:
-		# 	self.mrescons = [b.encode() for b in self.storage.value['rescons.inf'][()]]
-		# except KeyError:  # IndexError
-		# 	self.mrescons = ['ExecTime', 'CPU_time', 'RSS_peak']
-		# 	# Note: None in maxshape means resizable, fletcher32 used for the checksum
-		# 	self.storage.create_dataset('rescons.inf', shape=(len(self.mrescons),)
-		# 		, dtype=h5str, data=[s.decode() for s in self.mrescons], fletcher32=True)  # fillvalue=''
-		# # # Note: None in maxshape means resizable, fletcher32 used for the checksum,
-		# # # exact used to require shape and type to match exactly
-		# # metares = self.storage.require_dataset('rescons.meta', shape=(len(self.mrescons),), dtype=h5str
-		# # 	, data=self.mrescons, exact=True, fletcher32=True)  # fillvalue=''
-		# #
-		# # rescons str to the index mapping
-		# self.irescons = {s: i for i, s in enumerate(self.mrescons)}
-
-		# self.queue = None  # Note: the multiprocess queue is created in the enter blocks
-		# # The storage is not operational until the queue is created
-		# # Note: a shared value for the active state is sufficient, exact synchronization is not required
-		# self._active = Value('B', False, lock=False)
-		# self._persister = None
+	def valueExists(self, smeta, tstamp=0):
+		"""Whether the evaluation already exists in the storage
+
+		The evaluations of the measure are loaded on its first check, so the evaluations
+		persisted afterwards are not considered.
+
+		smeta: SMeta  - serialization meta data of the evaluation
+		tstamp: float  - the least timestamp (UTC, seconds since the epoch) of the valid evaluation,
+			typically the modification time of the evaluating clustering
+
+		return  bool  - the evaluation exists and is newer than tstamp
+		"""
+		qkey = (smeta.group, smeta.measure + (_SUFULEV if smeta.ulev else ''))
+		qtimes = self._qtimes.get(qkey)
+		if qtimes is None:
+			return False
+		if isinstance(qtimes, str):
+			# Load the timestamps of the measure on the first access
+			fqtimes = None
+			try:
+				fqtimes = self._fqtimes or openUnlocked(self.path, 'r')
+				qtimes = fqtimes[qtimes][()]
+			except Exception as err:  #pylint: disable=W0703
+				# Note: the storage is modified concurrently by the persister (the datasets have checksums),
+				# so the evaluations are recomputed if the timestamps are inconsistent
+				print('WARNING, the evaluation timestamps {} can not be loaded: {}'.format(qtimes, err)
+					, file=sys.stderr)
+				qtimes = np.zeros((0, 0, 0, 0))
+			finally:
+				if fqtimes is not None and fqtimes is not self._fqtimes:
+					fqtimes.close()
+			self._qtimes[qkey] = qtimes
+		ind = (smeta.iins, smeta.ishf, smeta.ilev, smeta.irun)
+		# Note: the dimensions of the persisted dataset might be smaller than the processing ones
+		if any(i >= n for i, n in zip(ind, qtimes.shape)):
+			return False
+		# Note: zero timestamp means the absence of the evaluation
+		return bool(qtimes[ind] > tstamp) if qtimes[ind] else False
+
+	@property
+	def queue(self):
+		"""Multiprocess queue of the persister, None out of the context"""
+		return self._queue[0]
 
 	def __call__(self, qm):
-		"""Worker process function to save data to the persistent storage
+		"""Save data to the persistent storage via the persister
 
 		qm: QEntry  - quality metric (data and metadata) to be saved into the persistent storage
 		"""
 		assert isinstance(qm, QEntry), 'Unexpected type of the quality entry: ' + type(qm).__name__
-		# Save data elements (entries)
-		for metric, mval in viewitems(qm.data):
-			try:
-				# Metric is  str (or can be unicode in Python2)
-				assert isinstance(mval, float), 'Invalid data type, metric: {}, value: {}'.format(
-					type(metric).__name__, type(mval).__name__)
-				# Construct dataset name based on the quality measure binary name and its metric name
-				# (in case of multiple metrics are evaluated by the executing app)
-				dsname = qm.smeta.measure if not metric else _PREFMETR.join((qm.smeta.measure, metric))
-				if qm.smeta.ulev:
-					dsname += _SUFULEV
-				#print('> dsname: {}, metric: {}, mval: {}; location: {}'.format(dsname, metric, mval, qm.smeta))
-				dsname += _EXTQDATASET
-				# Open or create the required dataset
-				qmgroup = self.storage[qm.smeta.group]
-				# qmdata = qmgroup.create_dataset(dsname, shape=(nins, nshf, nlev, QMSRUNS.get(qm.smeta.measure, 1)),
-				# 	# 32-bit floating number, checksum (fletcher32), "exact" used to require both shape and type to match exactly
-				# 	dtype='f4', exact=True, fletcher32=True, fillvalue=np.float32(np.nan), track_times=True)
-				qmdata = None
-				try:
-					# Note: the out of bound values are omitted in case of update
-					qmdata = qmgroup[dsname]
-				except KeyError:
-					# Such dataset does not exist, create it
-					nins = qmgroup.attrs[SATTRNINS]
-					nshf = qmgroup.attrs[SATTRNSHF]
-					nlev = 1 if qm.smeta.ulev else qmgroup.parent.attrs[SATTRNLEV]
-					qmdata = qmgroup.create_dataset(dsname, shape=(nins, nshf, nlev, QMSRUNS.get(qm.smeta.measure, 1)),
-						# 32-bit floating number, checksum (fletcher32)
-						dtype='f4', fletcher32=True, fillvalue=np.float32(np.nan), track_times=True)
-					# NOTE: Numpy NA (not available) instead of NaN (not a number) might be preferable
-					# but it requires latest NumPy versions.
-					# https://www.numpy.org/NA-overview.html
-					# Numpy NAs (https://docs.scipy.org/doc/numpy-1.14.0/neps/missing-data.html):
-					# np.NA,  dtype='NA[f4]', dtype='NA', np.dtype('NA[f4,NaN]')
-
-				# Save data to the storage
-				# with syncstorage.get_lock():
-				# print('>> [{},{},{},{}]{}: {}'.format(qm.smeta.iins, qm.smeta.ishf, qm.smeta.ilev, qm.smeta.irun,
-				# 	'' if not qm.smeta.ulev else 'u', mval))
-				qmdata[qm.smeta.iins, qm.smeta.ishf, qm.smeta.ilev,
-					qm.smeta.irun] = mval
-			except Exception as err:  #pylint: disable=W0703;  # queue.Empty as err:  # TypeError (HDF5), KeyError
-				print('ERROR, saving of {} into {}{}{}[{},{},{},{}] failed: {}. {}'.format(
-					mval, qm.smeta.measure, '' if not metric else _PREFMETR + metric,
-					'' if not qm.smeta.ulev else _SUFULEV, qm.smeta.iins, qm.smeta.ishf,
-					qm.smeta.ilev, qm.smeta.irun, err, traceback.format_exc(5)), file=sys.stderr)
-			# alg = apps.require_dataset('Pscan01'.encode(),shape=(0,),dtype=h5py.special_dtype(vlen=bytes),chunks=(10,),maxshape=(None,),fletcher32=True)
-			# 	# Allocate chunks of 10 items starting with empty dataset and with possibility
-			# 	# to resize up to 500 items (params combinations)
-			# 	self.apps[app] = appsdir.require_dataset(app, shape=(0,), dtype=h5py.special_dtype(vlen=_h5str)
-			# 		, chunks=(10,), maxshape=(500,))  # , maxshape=(None,), fletcher32=True
-			# self.evals = self.storage.require_group('evals')  # Quality evaluations dir (group)
+		if self.queue is None:
+			print('ERROR, saving of {} is discarded out of the QualitySaver context'.format(qm), file=sys.stderr)
+			return
+		# Note: the caller is blocked only if the persister is overloaded
+		try:
+			putAlive(self._queue, qm)
+		except RuntimeError as err:
+			print('ERROR, saving of {} is discarded: {}'.format(qm, err), file=sys.stderr)
 
 	def __del__(self):
 		"""Destructor"""
-		# self._active.value = False
-		# try:
-		# 	if self.queue is not None:
-		# 		try:
-		# 			if not self.queue.empty():
-		# 				print('WARNING, terminating the persistency layer with {} queued data entries, call stack: {}'
-		# 					.format(self.queue.qsize(), traceback.format_exc(5)), file=sys.stderr)
-		# 		except OSError:   # The queue has been already closed from another process
-		# 			pass
-		# 		self.queue.close()  # No more data can be put in the queue
-		# 		self.queue.join_thread()
-		# 	if self._persister is not None:
-		# 		self._persister.join(0)  # Note: timeout is 0 to avoid destructor blocking
-		# finally:
-		# 	if self.storage is None:
-		# 		return
-		# 	with self.storage.get_lock():
-		# 		if self.storage.value is not None:
-		# 			self.storage.close()
-
-		if self.storage is not None:
-			self.storage.close()
+		if self._persister is not None and self._persister.is_alive():
+			print('WARNING, terminating the persister with the unsaved data entries', file=sys.stderr)
+			self._persister.terminate()
+		if self._fqtimes is not None:
+			self._fqtimes.close()
+			self._fqtimes = None
 
 	def __enter__(self):
-		# 	"""Context entrence"""
-		# 	self.queue = Queue(self.QUEUE_SIZEMAX)  # Qulity measures persistence queue, data pool
-		# 	self._active.value = True
-		# 	# __datasaver(qsqueue, active, timeout=None, latency=2.)
-		# 	self._persister = Process(target=self.__datasaver, args=(self.queue, self.storage, self._active, self.timeout))
-		# 	self._persister.start()
+		"""Context entrence, starts the persister"""
+		mpctx = None if get_context is None else get_context('spawn')  # Multiprocessing context of the persister
+		# Note: the spawned persister does not inherit the storage opened to load the timestamps
+		if mpctx is not None and any(isinstance(qtimes, str) for qtimes in viewvalues(self._qtimes)):
+			self._fqtimes = openUnlocked(self.path, 'r')
+		# Quality measures persistence queue, data pool
+		self._queue[0] = (Queue if mpctx is None else mpctx.Queue)(self.QUEUE_SIZEMAX)
+		self._persister = (Process if mpctx is None else mpctx.Process)(target=self._persist
+			, args=(self.path, self.queue, self.compression))
+		self._persister.start()
+		self._queue[1] = self._persister
 		return self
 
 	def __exit__(self, etype, evalue, tracebk):
-		"""Contex exit
+		"""Contex exit, waits for the persister to save all data entries
 
 		etype  - exception type
 		evalue  - exception value
 		tracebk  - exception traceback
 		"""
-		# 	self._active.value = False
-		# 	try:
-		# 		self.queue.close()  # No more data can be put in the queue
-		# 		self.queue.join_thread()
-		# 		self._persister.join(None if self.timeout is None else self.timeout - self._tstart)
-		# 	finally:
-		# 		with self.storage.get_lock():
-		# 			if self.storage.value is not None:
-		# 				self.storage.value.flush()  # Allow to reuse the instance in several context managers
-		# 	# Note: the exception (if any) is propagated if True is not returned here
-
-		if self.storage is not None:
-			self.storage.flush()  # Allow to reuse the instance in several context managers
+		holder = self._queue[:]
+		qsqueue = holder[0]
+		self._queue[:] = (None, None)
+		try:
+			try:
+				putAlive(holder, None)  # Request the termination of the persister
+			except RuntimeError as err:
+				print('ERROR, the unsaved data entries of {} are discarded: {}'.format(self.path, err)
+					, file=sys.stderr)
+			qsqueue.close()  # No more data can be put in the queue
+			# Note: the persister consumes all entries till the termination request unless it died
+			self._persister.join()
+			if self._persister.exitcode:
+				# The queued entries can not be flushed without the persister
+				qsqueue.cancel_join_thread()
+			qsqueue.join_thread()
+		finally:
+			if self._persister.exitcode:
+				print('ERROR, the persister of {} failed with the code {}'.format(
+					self.path, self._persister.exitcode), file=sys.stderr)
+			self._persister = None
+			if self._fqtimes is not None:
+				self._fqtimes.close()
+				self._fqtimes = None
+		# Note: the exception (if any) is propagated if True is not returned here
 
 
 def metainfo(afnmask=None, intrinsic=False, multirun=1):
@@ -725,16 +916,11 @@ def qmeasure(qmapp, workdir=UTILDIR):
 			workdir: str  - working directory of the quality measure (qmeasure location)
 			revalue: bool  - whether to revalue the existent results or omit such evaluations
 				calculating and saving only the values which are not present in the dataset.
-				NOTE: The default value is True because of the straight forward out of the box implementation.
-				ATTENTION: Not all quality measure implementations might support early omission
-					of the calculations on revalue=False, in which case a warning should be issued.
+				NOTE: the existent evaluations are omitted by the caller via QualitySaver.valueExists()
+				before the execution, so the value is not used here.
 
 			return jobsnum: uint  - the number of started jobs
 			"""
-			if not revalue:
-				# TODO: implement early exit on qualsaver.valueExists(smeta, metrics),
-				# where metrics are provided by the quality measure app by it's qparams
-				staticTrace(qmsname, 'Omission of the existent results formation is not supported yet')
 			# qsqueue: Queue  - multiprocess queue of the quality results saver (persister)
 			assert execpool and callable(save) and isinstance(smeta, SMeta
 			) and isinstance(cfpath, str) and isinstance(inpfpath, str) and (seed is None or isinstance(seed, int)
@@ -1039,16 +1225,11 @@ def execImeasures(execpool, save, smeta, qparams, cfpath, inpfpath, asym=False,
 	workdir: str  - working directory of the quality measure (qmeasure location)
 	revalue: bool  - whether to revalue the existent results or omit such evaluations
 		calculating and saving only the values which are not present in the dataset.
-		NOTE: The default value is True because of the straight forward out of the box implementation.
-		ATTENTION: Not all quality measure implementations might support early omission
-			of the calculations on revalue=False, in which case a warning should be issued.
+		NOTE: the existent evaluations are omitted by the caller via QualitySaver.valueExists()
+		before the execution, so the value is not used here.
 
 	return jobsnum: uint  - the number of started jobs
 	"""
-	if not revalue:
-		# TODO: implement early exit on qualsaver.valueExists(smeta, metrics),
-		# where metrics are provided by the quality measure app by it's qparams
-		staticTrace('Imeasures', 'Omission of the existent results is not supported yet')
 	# qsqueue: Queue  - multiprocess queue of the quality results saver (persister)
 	assert execpool and callable(save) and isinstance(smeta, SMeta
 		) and isinstance(cfpath, str) and isinstance(inpfpath, str) and (
@@ -1273,6 +1454,77 @@ def scalar(val):
 	return val if not isinstance(val, np.ndarray) else val.item(0)
 
 
+def nanavg(vals):
+	"""Average of the non-NAN values
+
+	vals: np.array  - values
+
+	return  avg: float, num: int  - average of the non-NAN values (NAN if they are absent)
+		and their number
+
+	>>> avg, num = nanavg(np.array([1, np.nan, 3.6])); round(avg, 2) == 2.3 and num == 2
+	True
+	>>> str(nanavg(np.array([np.nan]))[0]) == 'nan'
+	True
+	"""
+	vld = ~np.isnan(vals)
+	num = int(np.count_nonzero(vld))
+	return np.nan if not num else float(vals[vld].sum()) / num, num
+
+
+def aggdataset(dmsr, maxins=0, blockmax=_AGGBLOCKMAX):
+	"""Aggregate quality measure dataset over the instances
+
+	The dataset is read by the blocks of instances and each block is reduced at once:
+	the best (max) level of the average over the runs is taken for each shuffle,
+	mean and standard deviation are evaluated over the shuffles and then averaged
+	over the instances.
+
+	dmsr: h5py.Dataset or np.array  - quality measure dataset: (iinst)[(ishuf)][(ilev)][(qmirun)]: float4
+	maxins: int >= 0  - max number of instances to process, 0 means all
+	blockmax: uint  - max number of items in the block of instances to be read at once
+
+	return  qv: QValStat  - aggregated quality value
+
+	>>> qv = aggdataset(np.array([[[[1, 3]], [[np.nan, 3]]], [[[np.nan, np.nan]], [[1, 1]]]]))
+	>>> qv.avg == 1.75 and qv.sd == 0.25 and qv.conf == 0.5
+	True
+	"""
+	shape = tuple(dmsr.shape) + (1,) * (4 - len(dmsr.shape))  # Note: len(shape) <= 4 for the valid datasets
+	nins = shape[0] if not maxins else min(maxins, shape[0])
+	# Identify whether the quality measure dataset has multiple shuffles, levels or runs
+	mshf = shape[1] >= 2 or shape[2] >= 2 or shape[3] >= 2
+	# Per-instance values: average over the shuffles, their standard deviation and the ratio of the NAN shuffles
+	insavg = np.empty(nins)
+	inssd = np.full(nins, np.nan)
+	insrnan = np.full(nins, np.nan)
+	iblock = max(1, blockmax // max(1, shape[1] * shape[2] * shape[3]))  # The number of instances in the block
+	with warnings.catch_warnings():
+		# Omit warnings of the reduction of all NAN values, which results in NAN
+		warnings.simplefilter('ignore', RuntimeWarning)
+		for i in range(0, nins, iblock):
+			ie = min(i + iblock, nins)
+			vals = np.asarray(dmsr[i:ie], dtype=np.float64).reshape((ie - i,) + shape[1:])
+			if not mshf:
+				insavg[i:ie] = vals.reshape(ie - i)
+				continue
+			# Select level with the highest average value over the runs
+			vals = np.nanmax(np.nanmean(vals, axis=3), axis=2)  # (iinst, ishuf)
+			vld = ~np.isnan(vals)
+			num = np.count_nonzero(vld, axis=1)
+			vals[~vld] = 0
+			vsum = vals.sum(axis=1)
+			vsum2 = (vals * vals).sum(axis=1)
+			insavg[i:ie] = np.where(num, vsum / np.maximum(num, 1), np.nan)
+			inssd[i:ie] = np.where(num, np.sqrt(np.maximum(vsum2 - vsum * insavg[i:ie], 0) / np.maximum(num, 1)), np.nan)
+			nans = shape[1] - num
+			insrnan[i:ie] = np.where(nans, nans / float(shape[1]), np.nan)
+	avg, num = nanavg(insavg)
+	rshf, nrshf = nanavg(insrnan)
+	# conf: float4  - confidance (rins*rshf*rrun)
+	return QValStat(avg, nanavg(inssd)[0], np.nan if not nins else num / float(nins) * (1 if not nrshf else rshf))
+
+
 def aggeval(aggevals, nets, qaggopts, exclude, qmsname, revalue=False, maxins=0):
 	"""Aggregate evaluation results from the specified HDF5 storage
 
@@ -1303,15 +1555,9 @@ def aggeval(aggevals, nets, qaggopts, exclude, qmsname, revalue=False, maxins=0)
 	# HDF5 Storage: qmeasures_<seed>.h5
 	# qmsdir = RESDIR + QMSDIR  # Quality measures directory
 	print('Opening for the aggregation', qmsname)
-	qmeasures = h5py.File(qmsname, mode='r', driver='core', libver='latest')
+	# Note: the datasets are read by blocks, so the default (on-disk) driver bounds the memory consumption
+	qmeasures = h5py.File(qmsname, mode='r', libver='latest')
 	print('Aggregating', qmeasures.name)
-	avgres = ValAcc()  # Average resulting value over all instances
-	avgsd = ValAcc()  # Average standard deviation over all instances
-	nansfavg = ValAcc()  #  Average number of NAN shuffles and runs for the instances
-	# Shuffles statistics
-	varshf = VarAcc()  # Variance over the instance shuffles
-	avgrshf = ValAcc()  # Average ration of the NAN shuffles (used to evaluate confidence of the results)
-	avgrun = ValAcc() # Average value of measure for multiple runs of the evaluation app
 	for galg in viewvalues(qmeasures):
 		alg = os.path.split(galg.name)[1]
 		aflt = None if not aflts else aflts.get(alg)  # Algorithm aggregation filter
@@ -1338,6 +1584,9 @@ def aggeval(aggevals, nets, qaggopts, exclude, qmsname, revalue=False, maxins=0)
 					#	.format(fltout, aflt, netmatch))
 					continue
 			for dmsr in viewvalues(gnet):
+				# Omit the accessory datasets (evaluation timestamps)
+				if not dmsr.name.endswith(_EXTQDATASET):
+					continue
 				# Add result to the aggevals
 				# a) considering '+u' suffix of the unified representative clusters
 				# 	forming a single level from the multi-lev clustering and
@@ -1356,62 +1605,9 @@ def aggeval(aggevals, nets, qaggopts, exclude, qmsname, revalue=False, maxins=0)
 						#print('> Omitted by the filtering 3, fltout: {}, aflt: {}, netmatch: {}'
 						#	.format(fltout, aflt, match))
 						continue
-				# Identify whether the quality measure dataset multilevel and has multiple runs:
-				# (iinst)[(ishuf)][(ilev)][(qmirun)]: float4
-				i = 3
-				mrun = len(dmsr.shape) >= i + 1 and dmsr.shape[i] >= 2
-				i -= 1
-				mlev = mrun or (len(dmsr.shape) >= i + 1 and dmsr.shape[i] >= 2)
-				i -= 1
-				mshf = mlev or (len(dmsr.shape) >= i + 1 and dmsr.shape[i] >= 2)
-				avgres.reset()
-				avgsd.reset()
-				avgrshf.reset()  # Empty if all shuffles are successfully processed, otherwise the ratio of not NaNs
-				nansfavg.reset()
-				for iins, inst in enumerate(dmsr):
-					if maxins and iins >= maxins:  # Note: iins indexing starts from 0, which corresponds to maxins = 1
-						break
-					if mshf:
-						varshf.reset()
-						for shf in inst:
-							if mlev:
-								# Select level with the highest resulting value
-								if mrun:
-									vmax = -np.inf
-									for lev in shf:
-										avgrun.reset()
-										for run in lev:
-											avgrun.add(run)
-											#if alg == 'Daoc' and net == '5K5' and msr == 'Xmeasures:MF1h_w':
-											#	print('>> run:', run)
-										if vmax < avgrun.avg():
-											vmax = avgrun.avg()
-									if math.isinf(vmax):
-										vmax = np.nan
-								else:
-									vmax = max(shf)
-								varshf.add(scalar(vmax))
-								#if alg == 'Daoc' and net == '5K5' and msr == 'Xmeasures:MF1h_w':
-								#	print('>> ml shf:', scalar(vmax))
-							else:
-								varshf.add(scalar(shf))
-								#if alg == 'Daoc' and net == '5K5' and msr == 'Xmeasures:MF1h_w':
-								#	print('>> u shf:', scalar(shf))
-						avgres.add(varshf.avg())
-						#if alg == 'Daoc' and net == '5K5' and msr == 'Xmeasures:MF1h_w':
-						#	print('>> avgval:', scalar(varshf.avg()))
-						avgsd.add(varshf.sd())
-						if varshf.nans:
-							avgrshf.add(varshf.nans / float(varshf.nans + varshf.num))
-					else:
-						avgres.add(scalar(inst))
-						#if alg == 'Daoc' and net == '5K5' and msr == 'Xmeasures:MF1h_w':
-						#	print('>> inst:', scalar(inst))
+				qv = aggdataset(dmsr, maxins)
 				# Networks evaluations for each measure and each algorithm
 				netsevs = aggevals.setdefault(msr, {}).setdefault(alg, NamedList(keys=nets))
-				# conf: float4  - confidance (rins*rshf*rrun)
-				qv = QValStat(avgres.avg(), avgsd.avg(), np.nan if not dmsr else  # dmsr.size, len(dmsr)
-					avgres.num / float(avgres.nans + avgres.num) * (1 if not avgrshf.num else avgrshf.avg()))
 				#if alg == 'Daoc' and net == '5K5' and msr == 'Xmeasures:MF1h_w':
 				#	print('> 5K5 qv:', qv)
 				netsevs.insert(net, qv)
@@ -81,7 +81,7 @@ from benchutils import viewitems, timeSeed, dirempty, tobackup, dhmsSec, syncedT
 import benchevals  # Required for the functions name mapping to/from the quality measures names
 from benchevals import aggEvals, RESDIR, CLSDIR, QMSDIR, EXTRESCONS, QMSRAFN, QMSINTRIN, QMSRUNS, \
 	SATTRNINS, SATTRNSHF, SATTRNLEV, QualitySaver, NetInfo, SMeta
-from utils.mpepool import AffinityMask, ExecPool, Job, Task, secondsToHms
+from utils.mpepool import AffinityMask, ExecPool, Job, PyJob, Task, pycontext, secondsToHms
 from utils.mpewui import WebUiApp  #, bottle
 from algorithms.utils.parser_nsl import asymnet, dflnetext
 
@@ -95,6 +95,7 @@ _NETSDIR = 'networks/'  # Networks sub-directory of the synthetic networks (insi
 assert RESDIR.endswith('/'), 'A directory should have a valid terminator'
 _SEEDFILE = RESDIR + 'seed.txt'
 _PATHIDFILE = RESDIR + 'pathid.map'  # Path id map file for the results interpretation (mapping back to the input networks)
+_JOBSHIST = RESDIR + 'jobs.hist'  # Persistent resource consumption history of the executed jobs
 _TIMEOUT = 36 * 60*60  # Default execution timeout for each algorithm for a single network instance
 _GENSEPSHF = '%'  # Shuffle number separator in the synthetic networks generation parameters
 _WPROCSMAX = max(cpu_count()-1, 1)  # Maximal number of the worker processes, should be >= 1
@@ -301,6 +302,8 @@ class Params(object):
 		port: int  - WebUI port
 		runtimeout: uint  - clustering algorithms execution timeout
 		evaltimeout: uint  - resulting clusterings evaluations timeout
+		jnldir: str  - directory of the jobs journals (JobJournal) of the execution pools to resume
+			the interrupted clustering and evaluations skipping the completed jobs, None to disable
 		"""
 		self.syntpo = None  # SyntPathOpts()
 		self.runalgs = False
@@ -320,6 +323,7 @@ class Params(object):
 		self.port = _PORT
 		self.runtimeout = _RUNTIMEOUT
 		self.evaltimeout = _EVALTIMEOUT
+		self.jnldir = None
 
 
 def unquote(text):
@@ -433,6 +437,17 @@ def parseParams(args):
 					raise ValueError('Unexpected argument: ' + arg)
 				opts.evaltimeout = dhmsSec(arg[nend+1:])
 				continue
+			elif arg.startswith('--journal'):
+				nend = len('--journal')
+				if len(arg) == nend:
+					opts.jnldir = RESDIR
+				elif len(arg) <= nend + 1 or arg[nend] != '=':
+					raise ValueError('Unexpected argument: ' + arg)
+				else:
+					opts.jnldir = arg[nend+1:]
+					if not opts.jnldir.endswith('/'):
+						opts.jnldir += '/'
+				continue
 			else:
 				raise ValueError('Unexpected argument: ' + arg)
 
@@ -1277,8 +1292,14 @@ def convertNets(datas, overwrite=False, resdub=False, timeout1=7*60, convtimeout
 
 	global _execpool
 	assert _execpool is None, 'The global execution pool should not exist'
+	# Note: the conversion is performed by the warm Python workers having preloaded converter if possible
+	pywarm = pycontext() is not None
+	if pywarm:
+		# Note: the converter is referenced by its module to be unpickled by the workers without the __main__ execution
+		from utils.convert import convertArgv  # Note: preloaded by the warm workers server
 	# Note: afnstep = 1 because the processes are not cache-intensive, not None, because the workers are single-threaded
-	with ExecPool(_WPROCSMAX, afnmask=AffinityMask(1), memlimit=_VMLIMIT, name='convnets') as _execpool:
+	with ExecPool(_WPROCSMAX, afnmask=AffinityMask(1), memlimit=_VMLIMIT, name='convnets'
+	, pypreload=None if not pywarm else ('utils.convert',)) as _execpool:
 		def convertNet(inpnet, overwrite=False, resdub=False, timeout=7*60):  # 7 min
 			"""Convert input networks to another formats
 
@@ -1288,11 +1309,18 @@ def convertNets(datas, overwrite=False, resdub=False, timeout1=7*60, convtimeout
 			timeout  - network conversion timeout, 0 means unlimited
 			"""
 			try:
-				args = [PYEXEC, UTILDIR + 'convert.py', inpnet, '-o rcg', '-r ' + ('o' if overwrite else 's')]
+				# Note: the binary CSR cache of the network is built to be reused by the subsequent conversions and loadings
+				args = [inpnet, '-o', 'rcg', '-r', 'o' if overwrite else 's', '-b']
 				if resdub:
 					args.append('-d')
-				_execpool.execute(Job(name=os.path.splitext(os.path.split(inpnet)[1])[0], args=args, timeout=timeout
-					, category='convert', size=os.path.getsize(inpnet)))
+				jname = os.path.splitext(os.path.split(inpnet)[1])[0]
+				if pywarm:
+					job = PyJob(name=jname, func=convertArgv, fargs=(args,), timeout=timeout
+						, category='convert', size=os.path.getsize(inpnet))
+				else:
+					job = Job(name=jname, args=[PYEXEC, UTILDIR + 'convert.py'] + args, timeout=timeout
+						, category='convert', size=os.path.getsize(inpnet))
+				_execpool.execute(job)
 			except Exception as err:  #pylint: disable=W0703
 				print('ERROR on "{}" conversion to .rcg, the conversion is canceled: {}. {}'
 					.format(inpnet, err, traceback.format_exc(5)), file=sys.stderr)
@@ -1379,7 +1407,8 @@ def clarifyApps(appnames, appsmodule, namefn=None):
 	return appfns
 
 
-def runApps(appsmodule, algorithms, datas, seed, exectime, timeout, runtimeout=10*24*60*60):  # 10 days
+def runApps(appsmodule, algorithms, datas, seed, exectime, timeout, runtimeout=10*24*60*60  # 10 days
+, jnldir=None):
 	"""Run specified applications (clustering algorithms) on the specified datasets
 
 	appsmodule  - module with algorithms definitions to be run; sys.modules[__name__]
@@ -1390,6 +1419,8 @@ def runApps(appsmodule, algorithms, datas, seed, exectime, timeout, runtimeout=1
 	exectime  - elapsed time since the benchmarking started
 	timeout  - timeout per each algorithm execution
 	runtimeout  - timeout for all algorithms execution, >= 0, 0 means unlimited time
+	jnldir: str  - directory of the jobs journal to resume the interrupted execution skipping
+		the completed jobs, None to disable
 	"""
 	# return  netnames: iterable(str) or None  - network names with path id and without the base directory
 	# netnames = None  # Network names with path id and without the base directory
@@ -1408,7 +1439,8 @@ def runApps(appsmodule, algorithms, datas, seed, exectime, timeout, runtimeout=1
 	assert _execpool is None, 'The global execution pool should not exist'
 	# Note: set affinity in a way to maximize the CPU cache L1/2 for each process
 	with ExecPool(_WPROCSMAX, afnmask=AffinityMask(AffinityMask.CORE_THREADS)
-	, memlimit=_VMLIMIT, name='runapps', webuiapp=_webuiapp) as _execpool:
+	, memlimit=_VMLIMIT, name='runapps', webuiapp=_webuiapp, history=_JOBSHIST
+	, journal=None if jnldir is None else jnldir + 'runapps.jnl') as _execpool:
 		# Run all algs if not specified the concrete algorithms to be run
 		# # Algorithms callers
 		# execalgs = [getattr(appsmodule, func) for func in dir(appsmodule) if func.startswith(PREFEXEC)]
@@ -1596,7 +1628,7 @@ def gtpath(net, idir):
 
 
 def evalResults(qmsmodule, qmeasures, appsmodule, algorithms, datas, seed, exectime, timeout  #pylint: disable=W0613
-, evaltimeout=14*24*60*60, update=True, revalue=False):  #pylint: disable=W0613;  # , netnames=None
+, evaltimeout=14*24*60*60, update=True, revalue=False, jnldir=None):  #pylint: disable=W0613;  # , netnames=None
 	"""Run specified applications (clustering algorithms) on the specified datasets
 
 	qmsmodule: module  - module with quality measures definitions to be run; sys.modules[__name__]
@@ -1617,6 +1649,8 @@ def evalResults(qmsmodule, qmeasures, appsmodule, algorithms, datas, seed, exect
 	revalue: bool  - whether to revalue the existent results or omit such evaluations
 		calculating and saving only the absent values in the dataset,
 		actual only for the update flag set
+	jnldir: str  - directory of the jobs journals to resume the interrupted evaluations skipping
+		the completed jobs, None to disable
 	"""
 	# netnames: iterable(str)  - input network names with path id and without the base path,
 	# 	used to form meta data in the evaluation storage. Explicit specification is useful
@@ -1704,8 +1738,9 @@ def evalResults(qmsmodule, qmeasures, appsmodule, algorithms, datas, seed, exect
 				afn = AffinityMask(1)
 
 			# Perform quality evaluations
-			with ExecPool(_WPROCSMAX, afnmask=afn, memlimit=_VMLIMIT
-			, name='runqms_' + str(afn.afnstep) + ('f' if afn.first else 'a'), webuiapp=_webuiapp) as _execpool:
+			pname = 'runqms_' + str(afn.afnstep) + ('f' if afn.first else 'a')  # Pool name
+			with ExecPool(_WPROCSMAX, afnmask=afn, memlimit=_VMLIMIT, name=pname, webuiapp=_webuiapp
+			, history=_JOBSHIST, journal=None if jnldir is None else jnldir + pname + '.jnl') as _execpool:
 				def runapp(net, asym, netshf, pathidsuf='', tasks=None, netinf=None):
 					"""Execute algorithms on the specified network counting number of ran jobs
 
@@ -1858,6 +1893,11 @@ def evalResults(qmsmodule, qmeasures, appsmodule, algorithms, datas, seed, exect
 											# 	os.path.split(net)[1], os.path.split(fcl)[1],
 											# 	smeta.iins, smeta.ishf, smeta.ilev, smeta.irun))
 											#assert task, 'Job tasks is expected to be specified'
+											# Omit the evaluations persisted after the modification of the evaluating files
+											if not revalue and qualsaver.valueExists(smeta, max(
+											os.path.getmtime(fcl), os.path.getmtime(ifpath))):
+												xargs['omitted'] += 1
+												continue
 											jobsnum += eq(_execpool, qualsaver, smeta, qm[1:], cfpath=fcl, inpfpath=ifpath,
 												asym=asym, timeout=timeout, seed=seed, task=task, revalue=revalue)
 							except Exception as err:  #pylint: disable=W0703
@@ -1886,7 +1926,8 @@ def evalResults(qmsmodule, qmeasures, appsmodule, algorithms, datas, seed, exect
 				xargs = {'asym': False,  # Asymmetric network
 						'pathidsuf': '',  # Network path id prepended with the path separator, used to deduplicate the network name shortcut
 						'jobsnum': 0,  # Number of the processing network jobs (can be several per each instance if shuffles exist)
-						'netcount': 0}  # Number of processing network instances (includes multiple shuffles)
+						'netcount': 0,  # Number of processing network instances (includes multiple shuffles)
+						'omitted': 0}  # Number of the omitted existent evaluations (actual if not revalue)
 				ctasks = [Task(qme[0][0]) for qme in cqmes]  # Current tasks
 				# tasks.extend(ctasks)
 				assert ctasks, 'Root tasks shoult be formed'
@@ -1899,6 +1940,8 @@ def evalResults(qmsmodule, qmeasures, appsmodule, algorithms, datas, seed, exect
 				if evaltimeout <= 0:
 					evaltimeout = timeout * xargs['jobsnum']
 				timelim = min(timeout * xargs['jobsnum'], evaltimeout)
+				if xargs['omitted']:
+					print('{} existent quality evaluations are omitted'.format(xargs['omitted']))
 				print('Waiting for the quality evaluation on {} jobs from {} networks'
 					' with {} sec ({} h {} m {:.4f} s) timeout ...'
 					.format(xargs['jobsnum'], xargs['netcount'], timelim, *secondsToHms(timelim)))
@@ -1959,14 +2002,14 @@ def benchmark(*args):
 	opts = parseParams(args)
 	print('The benchmark is started, parsed params:\n\tsyntpo: "{}"\n\tconvnets: 0b{:b}'
 		'\n\trunalgs: {}\n\talgorithms: {}\n\tquality measures: {}\n\tqupdate: {}\n\tqrevalue: {}\n\tdatas: {}'
-		'\n\tqaggopts: {}\n\twebui: {}\n\ttimeout: {} h {} m {:.4f} sec'
+		'\n\tqaggopts: {}\n\twebui: {}\n\tjnldir: {}\n\ttimeout: {} h {} m {:.4f} sec'
 	 .format(opts.syntpo, opts.convnets, opts.runalgs
 		, ', '.join(opts.algorithms) if opts.algorithms else ''
 		, None if opts.qmeasures is None else ' '.join([qm[0] for qm in opts.qmeasures]), opts.qupdate, opts.qrevalue
 		, '; '.join([str(pathopts) for pathopts in opts.datas])  # Note: ';' because the internal separator is ','
 		, '-' if opts.qaggopts is None else '; '.join(opts.qaggopts)  # Note: ';' because the internal separator is ','
 		# , ', '.join(opts.aggrespaths) if opts.aggrespaths else ''
-		, None if opts.host is None else '{}:{}'.format(opts.host, opts.port)
+		, None if opts.host is None else '{}:{}'.format(opts.host, opts.port), opts.jnldir
 		, *secondsToHms(opts.timeout)))
 
 	# Start WebUI if required
@@ -2031,13 +2074,15 @@ def benchmark(*args):
 	# Run the opts.algorithms and measure their resource consumption
 	if opts.runalgs:
 		runApps(appsmodule=benchapps, algorithms=opts.algorithms, datas=opts.datas
-			, seed=seed, exectime=exectime, timeout=opts.timeout, runtimeout=opts.runtimeout)
+			, seed=seed, exectime=exectime, timeout=opts.timeout, runtimeout=opts.runtimeout
+			, jnldir=opts.jnldir)
 
 	# Evaluate results
 	if opts.qmeasures is not None:
 		evalResults(qmsmodule=benchevals, qmeasures=opts.qmeasures, appsmodule=benchapps
 			, algorithms=opts.algorithms, datas=opts.datas, seed=seed, exectime=exectime
-			, timeout=opts.timeout, evaltimeout=opts.evaltimeout, update=opts.qupdate, revalue=opts.qrevalue)
+			, timeout=opts.timeout, evaltimeout=opts.evaltimeout, update=opts.qupdate, revalue=opts.qrevalue
+			, jnldir=opts.jnldir)
 			# , netnames=netnames
 
 	if opts.qaggopts is not None:
@@ -2086,7 +2131,7 @@ if __name__ == '__main__':
 			' [-i[f][a][{gensepshuf}<shuffles_number>]=<datasets_{{dir,file}}_wildcard>'
 			' [-c[f][r]] [-a=[-]"app1 app2 ..."] [-r] [-q[="qmapp [arg1 arg2 ...]"]]'
 			' [-s[p][*][[{{-,+}}]=<alg>[{qsepmsr}<qmeasure1>,<qmeasure2>,...][{qsepnet}<net1>,<net2>,...][{qsepgroup}<alg>...]]]'
-			' [-t[{{s,m,h}}]=<timeout>] [-d=<seed_file>] [-w=<webui_addr>] | -h',
+			' [-t[{{s,m,h}}]=<timeout>] [-d=<seed_file>] [-w=<webui_addr>] [--journal[=<jnldir>]] | -h',
 			'',
 			'Example:',
 			'  {0} -g=3{gensepshuf}5 -r -q -th=2.5 1> {resdir}bench.log 2> {resdir}bench.err',
@@ -2208,6 +2253,9 @@ if __name__ == '__main__':
 			' format [<days>d][<hours>h][<minutes>m<seconds>], default: {runtimeout}.',
 			'  --evaltimeout  - global clustering algorithms execution timeout in the'
 			' format [<days>d][<hours>h][<minutes>m<seconds>], default: {evaltimeout}.',
+			'  --journal  - journal the executing clustering and evaluation jobs to <jnldir>/<pool_name>.jnl'
+			' (default <jnldir>: {resdir}) to resume the interrupted benchmarking skipping the completed jobs'
+			' on the rerun with the same options.',
 			)).format(sys.argv[0], gensepshuf=_GENSEPSHF, qsepmsr=_QSEPMSR, qsepnet=_QSEPNET, qsepgroup=_QSEPGROUP
 				, resdir=RESDIR, syntdir=_SYNTDIR, netsdir=_NETSDIR
 				, sepinst=SEPINST, seppars=SEPPARS, sepshf=SEPSHF, rsvpathsmb=(SEPPARS, SEPINST, SEPSHF, SEPPATHID)
@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:Description:  Performance benchmarks of the benchmarking framework itself.
+
+	Measures the hot paths of the framework on the synthetic stand-in data, so the
+	benchmarks are reproducible offline and do not require the clustering algorithms:
+	- ExecPool scheduling throughput and start latency vs the number of workers
+		(sleep and memory allocating jobs)
+	- QualitySaver write rate
+	- aggeval() time vs the dataset size
+	- utils/convert.py parsing speed
+	- loadNsl() load time (the binary CSR cache if igraph is not available)
+
+	The results are output in JSON to track regressions over time.
+
+	Usage:
+		$ ./benchperf.py [-o <results>.json] [-q] [-s <seed>]
+
+:Authors: (c) Artem Lutov <artem@exascale.info>
+:Organizations: eXascale Infolab <http://exascale.info/>, Lumais <http://www.lumais.com/>
+:Date: 2018-11
+"""
+from __future__ import print_function, division  # Required for stderr output, must be the first import
+import sys
+import os
+import time
+import json
+import random
+import shutil
+import tempfile
+import platform
+import argparse
+from multiprocessing import cpu_count
+# Consider time interface compatibility for Python before v3.3
+if not hasattr(time, 'perf_counter'):  #pylint: disable=C0413
+	time.perf_counter = time.time
+
+import h5py
+import numpy as np
+
+from benchapps import PYEXEC
+from benchevals import aggeval, QualitySaver, QEntry, SMeta, SATTRNINS, SATTRNSHF, SATTRNLEV, _EXTQDATASET
+from utils.mpepool import ExecPool, Job
+from utils.convert import convert, parseArgs as convParseArgs
+from algorithms.utils.parser_nsl import loadNsl, loadNslCsr, Graph, EXTCSR
+
+
+_REPEAT = 3  # The number of repetitions of each micro benchmark, the best time is reported
+_WKSNUMS = (1, 2, 4, 8)  # The number of workers in the execution pool benchmarks
+_NETSIZES = (1000, 10000, 100000)  # The number of links in the generated networks
+_DSSIZES = (16, 64, 256)  # The number of network instances in the aggregated datasets
+
+
+class Quiet(object):
+	"""Context suppressing the stdout of the benchmarking routines"""
+	def __init__(self):
+		self._stdout = None
+
+	def __enter__(self):
+		self._stdout = sys.stdout
+		sys.stdout = open(os.devnull, 'w')
+		return self
+
+	def __exit__(self, etype, evalue, tracebk):
+		sys.stdout.close()
+		sys.stdout = self._stdout
+
+
+def besttime(func, repeat=_REPEAT):
+	"""Execution time of the function
+
+	func: callable  - the benchmarking function without arguments
+	repeat: int  - the number of repetitions
+
+	return  tbest, tavg: float  - the best and average execution time in seconds
+	"""
+	tms = []
+	for _ in range(repeat):
+		tstart = time.perf_counter()
+		func()
+		tms.append(time.perf_counter() - tstart)
+	return min(tms), sum(tms) / len(tms)
+
+
+def genNet(path, lnsnum, rnd):
+	"""Generate an undirected random network in the NSE format
+
+	path: str  - file name of the generating network
+	lnsnum: int  - the number of links
+	rnd: Random  - random generator
+	"""
+	ndsnum = max(2, lnsnum // 8)
+	with open(path, 'w') as fnet:
+		fnet.write('# Nodes: {} Edges: {} Weighted: 0\n'.format(ndsnum, lnsnum))
+		for _ in range(lnsnum):
+			fnet.write('{} {}\n'.format(rnd.randrange(ndsnum), rnd.randrange(ndsnum)))
+
+
+def perfExecPool(wksnums=_WKSNUMS, jobsnum=64, jobdur=0.05):
+	"""ExecPool scheduling throughput and start latency of the jobs
+
+	wksnums: iterable(int)  - the number of workers, limited by the number of logical CPUs
+	jobsnum: int  - the number of jobs per each evaluation
+	jobdur: float  - duration of each sleeping job in seconds
+
+	return  list(dict)  - results per each kind of the jobs and the number of workers
+	"""
+	res = []
+	# Memory allocating job consuming 32 MB evaluated by the memory-limited pool
+	allocjob = (PYEXEC, '-c', 'import time; buf = bytearray(32 << 20); time.sleep({})'.format(jobdur))
+	for kind, args, memlimit in (('sleep', ('sleep', str(jobdur)), 0), ('alloc', allocjob, 4)):
+		for wksnum in sorted(set(min(wn, cpu_count()) for wn in wksnums)):
+			jobs = []
+			with Quiet(), ExecPool(wksnum, memlimit=memlimit, name='perf' + kind) as execpool:
+				tstart = time.perf_counter()
+				for i in range(jobsnum):
+					job = Job(name='{}{}'.format(kind, i), args=args, stdout=os.devnull
+						, params={'tsched': time.perf_counter()})
+					jobs.append(job)
+					execpool.execute(job)
+				execpool.join()
+				duration = time.perf_counter() - tstart
+			lats = [job.tstart - job.params['tsched'] for job in jobs if job.tstart is not None]
+			res.append({'kind': kind, 'workers': wksnum, 'jobs': jobsnum, 'jobdur': jobdur
+				, 'duration': duration, 'throughput': jobsnum / duration
+				# Ratio of the actual duration to the ideal one (without the scheduling overhead)
+				, 'overhead': duration * wksnum / (jobsnum * jobdur)
+				, 'latency_avg': sum(lats) / len(lats), 'latency_max': max(lats)})
+	return res
+
+
+def perfQualitySaver(workdir, nins=16, nshf=4, nlev=8, msrs=4):
+	"""QualitySaver write rate
+
+	workdir: str  - working directory of the storage
+	nins, nshf, nlev: int  - dimensions of the evaluated datasets (a single run per each value)
+	msrs: int  - the number of measures
+
+	return  dict  - results
+	"""
+	alg = 'PerfAlg'
+	net = 'perfnet'
+	values = nins * nshf * nlev * msrs
+	cwd = os.getcwd()
+	os.chdir(workdir)
+	try:
+		with Quiet():
+			tstart = time.perf_counter()
+			with QualitySaver(seed=random.randrange(1, 1 << 31), update=False) as qsaver:
+				group = qsaver.storage.require_group(alg)
+				group.attrs.create(SATTRNLEV, nlev, shape=(1,), dtype='B')
+				group = group.create_group(net)
+				group.attrs.create(SATTRNINS, nins, shape=(1,), dtype='B')
+				group.attrs.create(SATTRNSHF, nshf, shape=(1,), dtype='B')
+				tfill = time.perf_counter()
+				for iins in range(nins):
+					for ishf in range(nshf):
+						for ilev in range(nlev):
+							qsaver(QEntry(SMeta(group.name, 'Perf', False, iins, ishf, ilev)
+								, {'m{}'.format(im): random.random() for im in range(msrs)}))
+				tqueue = time.perf_counter()
+			# Note: the context exit waits until the persister saves all the entries
+			duration = time.perf_counter() - tstart
+	finally:
+		os.chdir(cwd)
+	return {'values': values, 'duration': duration, 'queuing': tqueue - tfill
+		, 'rate': values / duration}
+
+
+def perfAggeval(workdir, sizes=_DSSIZES, nshf=4, nlev=8, runs=2):
+	"""aggeval() time vs the dataset size
+
+	workdir: str  - working directory of the storage
+	sizes: iterable(int)  - the number of network instances in the aggregated datasets
+	nshf, nlev, runs: int  - remained dimensions of the datasets
+
+	return  list(dict)  - results per each size
+	"""
+	res = []
+	rnd = np.random.RandomState(0)
+	for nins in sizes:
+		qmsname = os.path.join(workdir, 'qmagg{}.h5'.format(nins))
+		with h5py.File(qmsname, mode='w', libver='latest') as qms:
+			gnet = qms.create_group('PerfAlg').create_group('perfnet')
+			data = rnd.random_sample((nins, nshf, nlev, runs)).astype(np.float32)
+			data[data < 0.05] = np.nan  # Non-evaluated values
+			gnet.create_dataset('Perf' + _EXTQDATASET, data=data)
+		with Quiet():
+			tbest, tavg = besttime(lambda: aggeval({}, None, None, False, qmsname))  #pylint: disable=W0640
+		res.append({'instances': nins, 'values': data.size, 'time_best': tbest, 'time_avg': tavg})
+	return res
+
+
+def perfConvert(workdir, sizes=_NETSIZES, seed=0):
+	"""Parsing speed of utils/convert.py converting NSE to RCG
+
+	workdir: str  - working directory of the networks
+	sizes: iterable(int)  - the number of links in the generated networks
+	seed: int  - seed of the generated networks
+
+	return  list(dict)  - results per each network size
+	"""
+	res = []
+	rnd = random.Random(seed)
+	for lnsnum in sizes:
+		net = os.path.join(workdir, 'conv{}.nse'.format(lnsnum))
+		genNet(net, lnsnum, rnd)
+		# Note: the parsed arguments hold the state of the conversion, so they are parsed on each run
+		with Quiet():
+			tbest, tavg = besttime(lambda: convert(convParseArgs([net, '-o', 'rcg', '-r', 'o'])))  #pylint: disable=W0640
+		res.append({'links': lnsnum, 'time_best': tbest, 'time_avg': tavg, 'rate': lnsnum / tbest})
+	return res
+
+
+def perfLoadNsl(workdir, sizes=_NETSIZES, seed=0):
+	"""Load time of the NSL networks
+
+	The CSR cache is evaluated on both the initial parsing and the subsequent load,
+	loadNsl() is evaluated only if igraph is available.
+
+	workdir: str  - working directory of the networks
+	sizes: iterable(int)  - the number of links in the generated networks
+	seed: int  - seed of the generated networks
+
+	return  list(dict)  - results per each network size
+	"""
+	res = []
+	rnd = random.Random(seed)
+	for lnsnum in sizes:
+		net = os.path.join(workdir, 'load{}.nse'.format(lnsnum))
+		genNet(net, lnsnum, rnd)
+		rec = {'links': lnsnum}
+
+		def parse():
+			"""Parse the network rebuilding the CSR cache"""
+			if os.path.exists(net + EXTCSR):
+				os.remove(net + EXTCSR)
+			loadNslCsr(net)
+		rec['csr_parse_best'], rec['csr_parse_avg'] = besttime(parse)
+		rec['csr_load_best'], rec['csr_load_avg'] = besttime(lambda: loadNslCsr(net))  #pylint: disable=W0640
+		if Graph is not None:
+			with Quiet():
+				rec['nsl_best'], rec['nsl_avg'] = besttime(lambda: loadNsl(net))  #pylint: disable=W0640
+		res.append(rec)
+	return res
+
+
+def benchPerf(quick=False, seed=0):
+	"""Execute all the performance benchmarks
+
+	quick: bool  - reduced sizes of the benchmarks for the smoke testing
+	seed: int  - seed of the generated data
+
+	return  dict  - results
+	"""
+	random.seed(seed)
+	workdir = tempfile.mkdtemp(prefix='benchperf_')
+	try:
+		res = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())
+			, 'host': platform.node(), 'python': platform.python_version(), 'cpus': cpu_count()
+			, 'seed': seed, 'quick': quick}
+		netsizes = _NETSIZES[:2] if quick else _NETSIZES
+		res['execpool'] = perfExecPool(jobsnum=8 if quick else 64)
+		res['qualitysaver'] = perfQualitySaver(workdir, nins=2 if quick else 16)
+		res['aggeval'] = perfAggeval(workdir, _DSSIZES[:1] if quick else _DSSIZES)
+		res['convert'] = perfConvert(workdir, netsizes, seed)
+		res['loadnsl'] = perfLoadNsl(workdir, netsizes, seed)
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+	return res
+
+
+def parseArgs(params=None):
+	"""Parse input parameters (arguments)
+
+	params  - the list of arguments to be parsed (argstr.split()), sys.argv is used if args is None
+
+	return args  - parsed arguments
+	"""
+	parser = argparse.ArgumentParser(description='Performance benchmarks of the benchmarking framework'
+		' on the synthetic data, the results are output in JSON.')
+	parser.add_argument('-o', '--output', default=None
+		, help='output file of the results, stdout by default; the results are appended as a JSON line'
+		' to the existing file to track them over time')
+	parser.add_argument('-q', '--quick', action='store_true', help='reduced sizes for the smoke testing')
+	parser.add_argument('-s', '--seed', type=int, default=0, help='seed of the generated data')
+	return parser.parse_args(params)
+
+
+if __name__ == '__main__':
+	args = parseArgs()
+	results = benchPerf(args.quick, args.seed)
+	if args.output:
+		with open(args.output, 'a') as fout:
+			fout.write(json.dumps(results, sort_keys=True) + '\n')
+	else:
+		json.dump(results, sys.stdout, indent=1, sort_keys=True)
+		print()
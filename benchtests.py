@@ -17,8 +17,21 @@ import tempfile
 import shutil
 import tarfile
 import time
+import sys
+import json
+import errno
+import subprocess
 from multiprocessing import Value
+try:
+	from unittest import mock
+except ImportError:
+	import mock  # Python 2
 from benchutils import nameVersion, tobackup, syncedTime, ORIGDIR, _BCKDIR
+from utils.mpepool import ExecPool, Job, JobJournal, JobQueue, Task
+from utils import mpepool
+from utils.mpeagent import ExecAgent, request
+from utils.convert import convertArgv
+from algorithms.utils.parser_nsl import loadNslCsr, EXTCSR, np
 # from benchapps import preparePath
 
 
@@ -125,6 +138,500 @@ class TestUtils(unittest.TestCase):
 			shutil.rmtree(bdir)
 
 
+class TestExecPool(unittest.TestCase):
+	"""Tests for the extensions of the Execution Pool"""
+
+
+	def test_journalSkip(self):
+		"""Jobs completed according to the journal are skipped notifying their task once on its completion"""
+		jdir = tempfile.mkdtemp()
+		try:
+			jnlpath = os.path.join(jdir, 'tpool.jnl')
+			with open(jnlpath, 'w') as fjnl:
+				fjnl.write('D\t{:.3f}\ttjnl/j1\t0\t0.1000\n'.format(time.time()))
+			finished = []  # Task completion statistics: [(numadded, numdone),]
+			task = Task('tjnl', onfinish=lambda tk: finished.append((tk.numadded, tk.numdone)))
+			with ExecPool(1, journal=jnlpath) as xpool:
+				# The skipped first job should not finish the task having non-added jobs
+				self.assertEqual(xpool.execute(Job('j1', args=('true',), task=task)), 0)
+				self.assertFalse(finished)
+				xpool.execute(Job('j2', args=('true',), task=task))
+				# The job having the same name in another task is not skipped
+				xpool.execute(Job('j1', args=('true',), task=Task('tother')))
+				self.assertTrue(xpool.join(10))
+			self.assertEqual(finished, [(2, 2)])
+			self.assertEqual(JobJournal(jnlpath).done, {'tjnl/j1', 'tjnl/j2', 'tother/j1'})
+		finally:
+			shutil.rmtree(jdir)
+
+
+	def test_adaptiveTick(self):
+		"""The adaptive tick falls back to the latency for the jobs having unknown duration"""
+		with ExecPool(1) as xpool:
+			tick = xpool._ExecPool__tick  #pylint: disable=W0212,E1101
+			xpool.execute(Job('tunknown', args=('sleep', '0.2')))
+			self.assertEqual(tick(), xpool.latency)
+			self.assertTrue(xpool.join(10))
+			# The tick is adapted to the observed duration of the completed jobs
+			xpool.execute(Job('tknown', args=('sleep', '0.2')))
+			self.assertLess(tick(), xpool.latency)
+			self.assertTrue(xpool.join(10))
+
+
+class TestTaskTimeout(unittest.TestCase):
+	"""Tests for the timeouts of the tasks"""
+
+
+	def test_expiration(self):
+		"""Jobs of the expired task and its subtasks are terminated or canceled, the other tasks are retained"""
+		finished = []  # Finished tasks with their expiration
+		onfinish = lambda tk: finished.append((tk.name, tk.expired))
+		task = Task('ttask', timeout=0.5, onfinish=onfinish)
+		subtask = Task('tsubtask', task=task, onfinish=onfinish)
+		rtask = Task('trtask', timeout=5, onfinish=onfinish)
+		started = []  # Started jobs
+		with ExecPool(1, latency=0.05) as xpool:
+			def executeJob(name, task, duration):
+				"""Execute the job recording its start"""
+				return xpool.execute(Job(name, args=('sleep', str(duration)), task=task
+					, onstart=lambda jb: started.append(jb.name)))
+
+			tstart = time.perf_counter()
+			executeJob('tlong', task, 5)
+			executeJob('tsub', subtask, 0.1)
+			executeJob('tretained', rtask, 0.1)
+			self.assertTrue(xpool.join(10))
+			self.assertLess(time.perf_counter() - tstart, 3)
+			self.assertEqual(started, ['tlong', 'tretained'])
+			self.assertEqual(sorted(jinf.name for jinf in xpool.failures), ['tlong', 'tsub'])
+			self.assertEqual(sorted(finished), [('trtask', False), ('tsubtask', False), ('ttask', True)])
+			# The jobs of the expired task are canceled on their scheduling
+			self.assertEqual(executeJob('tlate', subtask, 0.1), errno.ETIME)
+			self.assertEqual(started, ['tlong', 'tretained'])
+
+
+class TestJobQueue(unittest.TestCase):
+	"""Tests for the queue of the non-started jobs"""
+
+
+	def test_order(self):
+		"""Jobs are ordered by the workers limit, priority and the scheduling order"""
+		jq = JobQueue()
+		jobs = {name: Job(name, category=name[0]) for name in ('a1', 'a2', 'b1', 'b2', 'c1')}
+		jq.push(jobs['a1'], 2)
+		jq.push(jobs['b1'], 3)
+		jq.push(jobs['a2'], 2)
+		jq.push(jobs['c1'], 2, True)
+		jq.push(jobs['b2'])
+		self.assertEqual([job.name for job in jq], ['b1', 'c1', 'a1', 'a2', 'b2'])
+		self.assertEqual([job.name for job in jq.head(3)], ['b1', 'c1', 'a1'])
+		self.assertTrue(jq.ahead(jobs['c1'], jobs['a1']))
+		# Relocation retains the scheduling order or locates the job directly before the specified one
+		jq.relocate(jobs['b2'], 2)
+		self.assertEqual([job.name for job in jq], ['b1', 'c1', 'a1', 'a2', 'b2'])
+		jq.relocate(jobs['b1'], 2, jobs['a2'])
+		self.assertEqual([job.name for job in jq], ['c1', 'a1', 'b1', 'a2', 'b2'])
+		self.assertEqual([job.name for job in jq.category('b')], ['b1', 'b2'])
+		self.assertEqual(jq.categories(), {'a': 2, 'b': 2, 'c': 1})
+		self.assertEqual(jq.pop().name, 'c1')
+		self.assertNotIn(jobs['c1'], jq)
+		self.assertEqual(jq.categories(), {'a': 2, 'b': 2})
+
+
+	def test_removal(self):
+		"""Removed jobs are omitted by all queries and the stale entries are compacted"""
+		jq = JobQueue()
+		jobs = [Job('j' + str(i), category=i % 3) for i in range(200)]
+		jq.extend((job, i % 4) for i, job in enumerate(jobs))
+		expected = sorted(jobs, key=lambda job: (-(int(job.name[1:]) % 4), int(job.name[1:])))
+		self.assertEqual(list(jq), expected)
+		for job in jobs[::2] + jobs[1:150:2]:
+			jq.remove(job)
+		remained = [job for job in expected if job in jobs[151::2]]
+		self.assertEqual(len(jq), len(remained))
+		self.assertEqual(list(jq), remained)
+		self.assertEqual(jq.head(10), remained[:10])
+		self.assertEqual(jq.category(0), [job for job in remained if job.category == 0])
+		self.assertLess(len(jq._heap), len(jobs))  #pylint: disable=W0212
+		self.assertEqual([jq.pop() for _ in range(len(remained))], remained)
+		self.assertFalse(jq)
+		self.assertIsNone(jq.peek())
+		self.assertRaises(IndexError, jq.pop)
+
+
+class TestMemAdmission(unittest.TestCase):
+	"""Tests for the memory-aware admission of the queued jobs"""
+	_MEMLIMIT = 1.  # Memory limit of the pool in GB
+
+
+	def setUp(self):
+		if not mpepool._LIMIT_WORKERS_RAM:  #pylint: disable=W0212
+			self.skipTest('The memory limit requires psutil')
+		if mpepool._memavail() - ExecPool._MEMLOW <= self._MEMLIMIT:  #pylint: disable=W0212
+			self.skipTest('Insufficient available memory')
+		# The started jobs in the order of their starting with the number of the started workers revisions
+		self.started = []
+		self.revisions = 0
+		revise = ExecPool._ExecPool__reviseWorkers  #pylint: disable=W0212,E1101
+
+		def reviseWorkers(xpool, *args, **kwargs):
+			"""Count the workers revisions"""
+			self.revisions += 1
+			return revise(xpool, *args, **kwargs)
+
+		ptc = mock.patch.object(ExecPool, '_ExecPool__reviseWorkers', reviseWorkers)
+		ptc.start()
+		self.addCleanup(ptc.stop)
+		# Note: the sleeping jobs do not require the dedicated CPUs
+		with mock.patch.object(ExecPool, '_CPUS', max(ExecPool._CPUS, 3)):  #pylint: disable=W0212
+			self.xpool = ExecPool(3, memlimit=self._MEMLIMIT, latency=0.05)
+		self.xpool.__enter__()
+		self.addCleanup(self.xpool.__exit__, None, None, None)
+		# The light running job to apply the memory constraints on the admission of the subsequent jobs
+		self.worker = self.executeJob('tworker', 'tsmall', 1)
+
+
+	def executeJob(self, name, category, duration, mem=None):
+		"""Execute the job recording its start
+
+		name: str  - job name
+		category: str  - job category identifying its memory estimation by the history
+		duration: float  - duration of the job in seconds
+		mem: float  - consumed memory of the job in GB from its past run (restarted job), None if not run
+
+		return  Job  - the job
+		"""
+		job = Job(name, args=('sleep', str(duration)), category=category
+			, onstart=lambda jb: self.started.append((jb, self.revisions)))
+		if mem is not None:
+			job.mem = mem
+		self.xpool.execute(job)
+		return job
+
+
+	def startOrder(self):
+		"""The started jobs with their concurrency to the running worker
+
+		return  list((str, bool))  - names of the started jobs and whether they are started before
+			the worker completion
+		"""
+		return [(job.name, job.tstart < self.worker.tstop) for job, _ in self.started]
+
+
+	def test_packing(self):
+		"""The largest fitting job is started instead of the job exceeding the available memory"""
+		history = self.xpool._history  #pylint: disable=W0212
+		for category, mem in (('thuge', 0.8), ('tmid', 0.3), ('tlarge', 0.4)):
+			history._update((category, 'sleep'), 0, mem, 1., 0)  #pylint: disable=W0212
+		for name in ('thuge', 'tmid', 'tlarge'):
+			self.executeJob(name, name, 0.1)
+		self.assertTrue(self.xpool.join(10))
+		# The fitting jobs are packed in the decreasing order of their memory with the running tworker
+		self.assertEqual(self.startOrder(), [('tworker', True), ('tlarge', True), ('tmid', True), ('thuge', False)])
+
+
+	def test_postponement(self):
+		"""The restarted job exceeding the available memory is postponed until the memory is released"""
+		self.executeJob('theavy', 'theavy', 0.1, 0.75)
+		self.assertTrue(self.xpool.join(10))
+		self.assertEqual(self.startOrder(), [('tworker', True), ('theavy', False)])
+		self.assertTrue(self.xpool.metrics.postponed)
+
+
+	def test_restarts(self):
+		"""The consumed memory of the restarted jobs is accounted once on their admission"""
+		self.xpool._history._update(('thuge', 'sleep'), 0, 0.8, 1., 0)  #pylint: disable=W0212
+		# Note: the restarted jobs are queued after the non-fitting job and admitted by the packing
+		self.executeJob('thuge', 'thuge', 0.1)
+		for i in range(2):
+			self.executeJob('trestart' + str(i), 'trestart', 0.1, 0.3)
+		self.assertTrue(self.xpool.join(10))
+		self.assertEqual(self.startOrder(), [('tworker', True), ('trestart0', True), ('trestart1', True)
+			, ('thuge', False)])
+		# Both restarted jobs are admitted by the same workers revision
+		self.assertEqual(self.started[1][1], self.started[2][1])
+
+
+	def test_startFailure(self):
+		"""The memory reserved for the job failed to be started is released for the subsequent jobs"""
+		history = self.xpool._history  #pylint: disable=W0212
+		for category, mem in (('thuge', 0.8), ('tfail', 0.45), ('tok', 0.3)):
+			history._update((category, 'sleep'), 0, mem, 1., 0)  #pylint: disable=W0212
+		self.executeJob('thuge', 'thuge', 0.1)
+		self.xpool.execute(Job('tfail', args=('sleep', '0.1'), category='tfail', onstart=lambda jb: 1 / 0))
+		self.executeJob('tok', 'tok', 0.1)
+		self.assertTrue(self.xpool.join(10))
+		self.assertEqual(self.startOrder(), [('tworker', True), ('tok', True), ('thuge', False)])
+		# tok is admitted by the first workers revision after the failed start of the larger tfail
+		self.assertEqual(self.started[1][1], 1)
+
+
+class TestJobCgroup(unittest.TestCase):
+	"""Tests for the memory accounting and limitation of the jobs by the cgroup v2 on the mocked cgroupfs"""
+
+
+	def setUp(self):
+		self.root = tempfile.mkdtemp()  # The delegated cgroup
+		# Note: the cleanups are performed in the reversed order, so the cgroupfs is restored before the removal
+		self.addCleanup(shutil.rmtree, self.root)
+		self.cgfiles = {}  # Interface files of the removed job cgroups:  {name: {file: content}}
+
+
+	def mockCgroup(self, current, peak, oomkills):
+		"""Patch the cgroupfs forming the interface files of the job cgroups on their creation
+
+		current: int  - memory.current in bytes
+		peak: int  - memory.peak in bytes
+		oomkills: int  - the number of the oom kills in memory.events
+
+		return  list(mock)  - the active patches
+		"""
+		cginit = mpepool.JobCgroup.__init__
+		rmdir = os.rmdir
+
+		def initCgroup(cgroup, path, memlim=0.):
+			"""Create the cgroup with the interface files provided by the kernel"""
+			cginit(cgroup, path, memlim)
+			for name, val in (('cgroup.procs', ''), ('memory.current', str(current))
+			, ('memory.peak', str(peak)), ('memory.events', 'low 0\noom 0\noom_kill {}\n'.format(oomkills))):
+				with open(os.path.join(path, name), 'w') as fcg:
+					fcg.write(val)
+
+		def rmCgroup(path):
+			"""Remove the cgroup recording its interface files"""
+			if os.path.dirname(path) != self.root:
+				return rmdir(path)
+			files = self.cgfiles.setdefault(os.path.basename(path), {})
+			for name in os.listdir(path):
+				with open(os.path.join(path, name)) as fcg:
+					files[name] = fcg.read()
+				os.remove(os.path.join(path, name))
+			return rmdir(path)
+
+		patches = [mock.patch.object(mpepool, '_CGROUP', self.root)
+			, mock.patch.object(mpepool.JobCgroup, '__init__', initCgroup)
+			, mock.patch('os.rmdir', rmCgroup)]
+		for ptc in patches:
+			ptc.start()
+			self.addCleanup(ptc.stop)
+		return patches
+
+
+	@unittest.skipUnless(mpepool._LIMIT_WORKERS_RAM, 'The memory accounting requires psutil')  #pylint: disable=W0212
+	def test_accounting(self):
+		"""The memory limit is set to the cgroup of the job, which accounts the memory of the job"""
+		self.mockCgroup(current=64 * 1024**2, peak=128 * 1024**2, oomkills=0)
+		with ExecPool(1, memlimit=1, latency=0.05) as xpool:
+			job = Job('tcg', args=('sleep', '0.3'), memlim=0.5)
+			xpool.execute(job)
+			self.assertTrue(xpool.join(10))
+			self.assertFalse(xpool.failures)
+		self.assertEqual(len(self.cgfiles), 1)
+		files = next(iter(self.cgfiles.values()))
+		self.assertEqual(files['memory.max'], str(512 * 1024**2))
+		self.assertEqual(files['cgroup.procs'], str(job.proc.pid))
+		self.assertEqual(files['cgroup.kill'], '1')
+		self.assertAlmostEqual(job._mempeak, mpepool.inGigabytes(128 * 1024**2))  #pylint: disable=W0212
+		# Note: the memory of the sleeping process itself is much lower than the accounted one
+		self.assertGreaterEqual(job.mem, mpepool.inGigabytes(64 * 1024**2) * 0.5)
+		self.assertFalse(os.listdir(self.root))
+
+
+	@unittest.skipUnless(mpepool._LIMIT_WORKERS_RAM, 'The memory accounting requires psutil')  #pylint: disable=W0212
+	def test_oomKill(self):
+		"""The job killed by the memory limit of its cgroup is failed"""
+		self.mockCgroup(current=1024**2, peak=512 * 1024**2, oomkills=1)
+		with ExecPool(1, memlimit=1, latency=0.05) as xpool:
+			job = Job('tcgoom', args=('true',), memlim=0.5)
+			xpool.execute(job)
+			self.assertTrue(xpool.join(10))
+			self.assertEqual([jinf.name for jinf in xpool.failures], ['tcgoom'])
+		self.assertGreaterEqual(job.mem, 0.5)
+		self.assertFalse(os.listdir(self.root))
+
+
+class TestExecAgent(unittest.TestCase):
+	"""Tests for the jobs execution by the local execution agents"""
+	_AGENT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'utils', 'mpeagent.py')
+
+
+	def setUp(self):
+		self.tdir = tempfile.mkdtemp()
+		self.agents = []  # Processes of the agents
+
+
+	def tearDown(self):
+		for agent in self.agents:
+			if agent.poll() is None:
+				agent.kill()
+			agent.wait()
+		shutil.rmtree(self.tdir)
+
+
+	def startAgent(self, name, wksnum, args=()):
+		"""Start the agent listening on the Unix socket
+
+		name: str  - name of the agent socket
+		wksnum: int  - the number of the agent workers
+		args: list(str)  - additional arguments of the agent
+
+		return  str  - address of the agent
+		"""
+		address = os.path.join(self.tdir, name + '.sock')
+		self.agents.append(subprocess.Popen([sys.executable, self._AGENT, 'serve', address
+			, '-w', str(wksnum), '-l', '0.05'] + list(args), stdout=subprocess.DEVNULL))
+		tlim = time.time() + 10
+		while time.time() < tlim:
+			try:
+				if request(address, {'op': 'info'}):
+					return address
+			except (IOError, OSError):
+				time.sleep(0.1)
+		self.fail('The agent is not started: ' + address)
+
+
+	def test_remoteJob(self):
+		"""Output and exit code of the remote job are relayed, its timeout cancels the remote execution"""
+		address = self.startAgent('agent', 1)
+		executors = {}  # Executors of the started jobs:  {name: address}, None means the local host
+		rcodes = {}  # Exit codes of the finished jobs
+		with ExecPool(1, latency=0.1, agents=[address]) as xpool:
+			def executeJob(name, cmd, **kwargs):
+				"""Execute the job recording its executor and exit code"""
+				job = Job(name, args=('sh', '-c', cmd), stdout=subprocess.PIPE
+					, onstart=lambda jb: executors.update({jb.name: jb._agent and jb._agent.address})  #pylint: disable=W0212
+					, onfinish=lambda jb: rcodes.update({jb.name: jb.proc.returncode}), **kwargs)
+				xpool.execute(job)
+				return job
+
+			# Note: the concurrent jobs occupy both the local host and the agent
+			jobs = [executeJob('tout' + str(i), 'sleep 0.5; echo Output {}; exit 3'.format(i)) for i in range(2)]
+			self.assertTrue(xpool.join(10))
+			self.assertEqual(sorted(executors.values(), key=str), [address, None])
+			for i, job in enumerate(jobs):
+				self.assertEqual(rcodes[job.name], 3)
+				self.assertIn('Output ' + str(i), job.pipedout)
+			# The timeout of the master terminates the job on the agent
+			flags = [os.path.join(self.tdir, 'tflag' + str(i)) for i in range(2)]
+			for i, flag in enumerate(flags):
+				executeJob('ttimeout' + str(i), 'sleep 1.5; touch ' + flag, timeout=0.5)
+			self.assertTrue(xpool.join(10))
+			self.assertEqual(sorted(jinf.name for jinf in xpool.failures), ['tout0', 'tout1', 'ttimeout0', 'ttimeout1'])
+		time.sleep(2)
+		for flag in flags:
+			self.assertFalse(os.path.exists(flag), 'The job should be terminated by the timeout: ' + flag)
+
+
+	def test_restrictedAccess(self):
+		"""The agent socket is accessible only by its owner and the job output is confined to its workdir"""
+		address = self.startAgent('agent', 1)
+		self.assertFalse(os.stat(address).st_mode & 0o077)
+		wdir = os.path.join(self.tdir, 'wdir')
+		os.mkdir(wdir)
+		spec = {'name': 'tout', 'args': ['echo', 'Output'], 'workdir': wdir, 'timeout': 0, 'memlim': 0., 'omitafn': False
+			, 'category': None, 'size': 0, 'stdout': os.path.join(self.tdir, 'tout.log'), 'stderr': None}
+		with open(os.devnull, 'wb') as fdevnull:
+			self.assertEqual(subprocess.call([sys.executable, self._AGENT, 'exec', address, json.dumps(spec)]
+				, stderr=fdevnull), errno.EACCES)
+			spec['stdout'] = os.path.join(wdir, 'tout.log')
+			self.assertEqual(subprocess.call([sys.executable, self._AGENT, 'exec', address, json.dumps(spec)]
+				, stderr=fdevnull), 0)
+		self.assertFalse(os.path.exists(os.path.join(self.tdir, 'tout.log')))
+		self.assertTrue(os.path.exists(spec['stdout']))
+		# The TCP socket requires the secret
+		secret = os.environ.pop('MPEAGENT_SECRET', None)
+		try:
+			self.assertRaises(ValueError, ExecAgent, 'localhost:8091')
+		finally:
+			if secret is not None:
+				os.environ['MPEAGENT_SECRET'] = secret
+
+
+	def test_outputTail(self):
+		"""The agent applying the affinity relays only the tail of the huge output"""
+		address = self.startAgent('agent', 1, ('-a', '1'))
+		spec = {'name': 'tout', 'args': ['sh', '-c', 'yes Output | head -c 1000000; echo Done']
+			, 'workdir': self.tdir, 'timeout': 0, 'memlim': 0., 'omitafn': False
+			, 'category': None, 'size': 0, 'stdout': None, 'stderr': None}
+		proxy = subprocess.Popen([sys.executable, self._AGENT, 'exec', address, json.dumps(spec)]
+			, stdout=subprocess.PIPE)
+		out = proxy.communicate()[0]
+		self.assertEqual(proxy.returncode, 0)
+		self.assertLessEqual(len(out), Job('tout').pipetail)
+		self.assertTrue(out.endswith(b'Done\n') and b'Output\n' in out)
+
+
+	def test_agentLoss(self):
+		"""Jobs are executed by the remained executors when the agent goes away"""
+		addresses = [self.startAgent('agent' + str(i), 1) for i in range(2)]
+		executors = {}  # Executors of the started jobs:  {name: address}, None means the local host
+		done = []  # Successfully completed jobs
+		with ExecPool(1, latency=0.1, agents=addresses) as xpool:
+			def executeJob(name, args):
+				"""Execute the job recording its executor"""
+				xpool.execute(Job(name, args=args, ondone=lambda jb: done.append(jb.name)
+					, onstart=lambda jb: executors.update({jb.name: jb._agent and jb._agent.address})))  #pylint: disable=W0212
+
+			# Note: the concurrent jobs occupy the local host and both agents
+			for i in range(3):
+				executeJob('tlong' + str(i), ('sleep', '2'))
+			time.sleep(0.5)
+			self.agents[0].kill()
+			lost = [name for name, address in executors.items() if address == addresses[0]]
+			for i in range(3):
+				executeJob('tjob' + str(i), ('true',))
+			self.assertTrue(xpool.join(20))
+			self.assertEqual([jinf.name for jinf in xpool.failures], lost)
+		self.assertEqual(len(lost), 1)
+		self.assertEqual(sorted(done), sorted(['tjob0', 'tjob1', 'tjob2'] + [name for name in executors
+			if name.startswith('tlong') and name not in lost]))
+
+
+@unittest.skipIf(np is None, 'numpy is required for the binary CSR cache')
+class TestNslCsr(unittest.TestCase):
+	"""Tests for the binary CSR cache of the NSL networks"""
+	# Note: the node 5 appears as a destination before being a source, the last link of the node 1 is not contiguous
+	_LINKS = (('1', '5', '0.10'), ('1', '3', '2'), ('2', '4', '1e-5'), ('2', '1', '3.25'), ('5', '2', '0.5')
+		, ('1', '2', '1'))
+
+
+	def setUp(self):
+		self.tdir = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.tdir)
+		self.net = os.path.join(self.tdir, 'tnet.nse')
+		with open(self.net, 'w') as fnet:
+			fnet.write('# Nodes: 5, Edges: {}, Weighted: 1\n'.format(len(self._LINKS)))
+			for ln in self._LINKS:
+				fnet.write(' '.join(ln) + '\n')
+
+
+	def convertLinks(self, *args):
+		"""Convert the network to .nsa returning its links: [(src, dst, weight: float),]"""
+		convertArgv([self.net, '-o', 'nsa'] + list(args))
+		with open(os.path.splitext(self.net)[0] + '.nsa') as fnet:
+			return [(ln[0], ln[1], float(ln[2])) for ln in (ln.split() for ln in fnet) if ln and ln[0][0] != '#']
+
+
+	def test_links(self):
+		"""The cached links retain the order of the contiguous links of each source node"""
+		links = [(s, d, float(w)) for s, d, w in self._LINKS]
+		links.insert(2, links.pop())  # The non-contiguous link is joined at the first link of its source
+		csr = loadNslCsr(self.net)
+		self.assertTrue(os.path.isfile(self.net + EXTCSR))
+		for ncsr in (csr, loadNslCsr(self.net, update=False)):
+			ids = ncsr.ids
+			self.assertEqual([(ids[s], ids[d], w) for s, d, w in zip(ncsr.srcs().tolist(), ncsr.dsts.tolist()
+				, ncsr.wgts.tolist())], links)
+
+
+	def test_convert(self):
+		"""Conversion of the network from the CSR cache is equivalent to the text one"""
+		links = self.convertLinks()
+		self.assertFalse(os.path.exists(self.net + EXTCSR))
+		self.assertEqual(self.convertLinks('-b'), links)
+		self.assertTrue(os.path.isfile(self.net + EXTCSR))
+		# The built cache is reused without the option
+		self.assertEqual(self.convertLinks(), links)
 
 
 if __name__ == '__main__':
@@ -40,7 +40,7 @@ Note: works on both Python3 and Python2 / pypy
 """
 from __future__ import print_function, division  # Required for stderr output, must be the first import
 # Exporting Functions
-__all__ = ["convert", "FormatSpec"]
+__all__ = ["convert", "convertArgv", "FormatSpec"]
 
 
 # Required to efficiently traverse items of dictionaries in both Python 2 and 3
@@ -78,6 +78,16 @@ import sys
 import os
 import argparse
 import time  # Required when the file should be renamed
+try:
+	# Binary CSR cache of the NSL networks, which is optional (requires numpy)
+	from algorithms.utils.parser_nsl import loadNslCsr  #pylint: disable=E0611,E0401
+except ImportError:
+	try:
+		# Note: the converter is typically executed as a standalone script from the utils/
+		sys.path.append(os.path.split(os.path.split(os.path.abspath(__file__))[0])[0])
+		from algorithms.utils.parser_nsl import loadNslCsr  #pylint: disable=E0611,E0401
+	except ImportError:
+		loadNslCsr = None
 
 
 # Approximate block size in links (at list this number of links if not interrupted by the section completion)
@@ -239,6 +249,56 @@ def parseBlockNsl(directed):
 	return parser
 
 
+def parseBlockCsr(csr):
+	"""Parse NSE or NSA input block from the binary CSR cache instead of the input stream
+	csr  - the input network loaded from the CSR cache, NetCsr
+	"""
+	inext = [0]  # Index of the next source node to be parsed
+	def parser(inpfmt, finp, unweight, blsnum=DEFAULT_BLOCK_LINKS):  #pylint: disable=W0613
+		"""CSR parser of the NSL(E/A) network
+
+		inpfmt  - input format
+		finp  - input stream, omitted
+		unweight  - omit weights
+		blsnum  - approximate block size in links (at list this number of links
+			if not interrupted by the section completion)
+
+		return parsing  - whether the parsng is not completed yet
+		"""
+		parsed = inpfmt.parsed
+		if parsed.directed is None:
+			assert not parsed.links, 'There should not be any parsed links on start'
+			parsed.directed = csr.directed
+			parsed.newsection = True
+			parsed.ndsnum = len(csr.ids)
+			parsed.lnsnum = len(csr.dsts)
+			parsed.weighted = csr.weighted
+		else:
+			parsed.newsection = False
+			parsed.links.clear()
+		ids = csr.ids
+		ndsnum = len(ids)
+		lnsformed = 0  # The number of formed links
+		i = inext[0]
+		while i < ndsnum and lnsformed < blsnum:
+			beg, end = int(csr.offs[i]), int(csr.offs[i + 1])
+			if beg != end:
+				dsts = [ids[d] for d in csr.dsts[beg:end].tolist()]
+				if csr.wgts is None or unweight:
+					parsed.links[ids[i]] = [[d, None] for d in dsts]
+				else:
+					# Note: str() of float64 is the shortest representation of the parsed weight (without the loss),
+					# the integral weights are represented without the fractional part like in the input
+					parsed.links[ids[i]] = [[d, w if not w.endswith('.0') else w[:-2]] for d, w
+						in zip(dsts, csr.wgts[beg:end].astype(str).tolist())]
+				lnsformed += end - beg
+			i += 1
+		inext[0] = i
+		return i < ndsnum
+
+	return parser
+
+
 def parseBlockMetis(inpfmt, finp, unweight, blsnum=DEFAULT_BLOCK_LINKS):
 	"""Meits format parser
 
@@ -1001,6 +1061,8 @@ def convert(args):
 	args.unweight  - force unweighing (omit weights)
 	args.commented  - allow comments in the output file (default: True). Note:
 		these comments might for the header (.nsl formats) and contain provenance
+	args.bincache  - create or update the binary CSR cache of the NSL input network to
+		parse the cache instead of the text, otherwise only the valid existent cache is used
 
 	args.outfmt  - output format for the network, FormatSpec
 	args.resolve  - resolution strategy in case the output file already exists
@@ -1039,8 +1101,16 @@ def convert(args):
 				# Write provenance to the forming file as a comment
 				if args.commented:
 					fout.write('{} Converted from {}\n'.format(args.outfmt.symcmt, args.network))
+				inpfmt = args.inpfmt
+				# Parse the binary CSR cache of the network instead of the text if the cache is valid
+				if loadNslCsr is not None and inpfmt.id in ('nse', 'nsa'):
+					csr = loadNslCsr(args.network, inpfmt.id == 'nsa', update=args.bincache)
+					if csr is not None:
+						print('The binary cache of {} is used'.format(args.network))
+						inpfmt = FormatSpec(inpfmt.id, inpfmt.symcmt, inpfmt.descr, parser=parseBlockCsr(csr)
+							, exts=inpfmt.exts)
 				#outfmt.convertStream(fout, finp, unweight, remdub, frcedg, inpfmt)
-				convertStream(fout, args.outfmt, finp, args.inpfmt, args.unweight, args.remdub
+				convertStream(fout, args.outfmt, finp, inpfmt, args.unweight, args.remdub
 					, args.frcedg, args.commented)
 				print('{} -> {} conversion is completed'.format(args.network, foutName))
 		except (IOError, ValueError):
@@ -1083,6 +1153,11 @@ def parseArgs(params=None):
 	# , const=None, default=None, type=None, choices=None, required=False, help=None, metavar=None)
 	ipars.add_argument('-i', '--inpfmt', dest='inpfmt', choices=viewkeys(inpfmts)
 		, help='input network (graph) format')  # , default='pjk'
+	ipars.add_argument('-b', '--bincache', dest='bincache', action='store_true'
+		, help='create or update the binary CSR cache (<network>.csr) of the .nse/a input network'
+		' to be parsed instead of the text, which is the valid existent cache only by default.'
+		' The links of each source node are grouped and the weights are canonically formatted'
+		' (1e-5 -> 1e-05) in the output')
 
 	mpars = parser.add_argument_group('Additional Modifiers')
 	mpars.add_argument('-d', '--remdup', dest='remdub', action='store_true'
@@ -1142,5 +1217,15 @@ def parseArgs(params=None):
 	return args
 
 
+def convertArgv(params):
+	"""Convert the network specified by the command line arguments
+
+	Executed by the warm Python workers (PyJob of the ExecPool) having this module preloaded.
+
+	params: list(str)  - command line arguments of the converter
+	"""
+	convert(parseArgs(params))
+
+
 if __name__ == '__main__':
 	convert(parseArgs())
@@ -0,0 +1,499 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:Description:  Execution agent of the Multi-Process Execution Pool distributing the jobs among
+	several hosts (or disjoint CPU sets of a single host) without SSH.
+
+	The agent listens on a TCP or Unix socket and executes the requested Job specs
+	(args, workdir, timeout, memlim, affinity, output channels) by its own ExecPool
+	with the same semantics, the affinity is applied if the agent has the affinity step.
+	The piped output of the remote job is relayed being truncated to the tail of Job.pipetail bytes.
+	The master ExecPool(agents=[<address>, ...]) dispatches
+	each job either to the local host or to the agent having the most free workers
+	(cores) and then RAM. The remote job is represented in the master by a lightweight
+	proxy process (this module with the "exec" command), so the timeouts, callbacks,
+	tasks and output channels of the jobs are handled by the master as for the local
+	jobs: the proxy relays the output and the exit code of the remote job and the
+	termination of the proxy (closing its connection) terminates the remote job.
+
+	NOTE: the paths (workdir, file output channels) are interpreted on the agent host,
+	so the hosts are expected to share the file system. The file output channels of the
+	remote jobs are restricted to their workdir.
+
+	ATTENTION: the agent executes the requested commands, so the requests are authenticated
+	by the shared secret specified in the MPEAGENT_SECRET environment variable of the agent
+	and the master (inherited by the proxies). The secret is required for the TCP socket
+	(including the loopback interface), without the secret the agent listens only on the Unix
+	socket accessible only by its owner.
+
+	Usage:
+		$ ./mpeagent.py serve <address> [-w <wksnum>] [-c <cpus> | -a <afnstep>] [-m <memlimit>] [-l <latency>]
+	address  - <host>:<port> of the TCP socket or the path of the Unix socket
+
+	Example of two agents on the disjoint CPUs of the local host:
+		$ export MPEAGENT_SECRET=<secret>  # Required for the TCP sockets
+		$ ./mpeagent.py serve localhost:8091 -c 0-3 &
+		$ ./mpeagent.py serve /tmp/mpeagent2.sock -c 4-7 &
+	and the master pool having 2 local workers on the remained CPUs:
+		ExecPool(2, agents=['localhost:8091', '/tmp/mpeagent2.sock'])
+
+:Authors: (c) Artem Lutov <artem@exascale.info>
+:Organizations: eXascale Infolab <http://exascale.info/>, Lumais <http://www.lumais.com/>
+:Date: 2018-11
+"""
+from __future__ import print_function, division  # Required for stderr output, must be the first import
+# External API (exporting functions)
+__all__ = ['AgentLink', 'ExecAgent', 'sockaddr', 'request']
+
+import sys
+import os
+import time
+import json
+import errno
+import hmac  # Authentication of the requests
+import socket
+import subprocess
+import threading  # The agent connections are served in the dedicated threads
+import argparse
+try:
+	import socketserver
+except ImportError:
+	import SocketServer as socketserver  # Python 2
+# Consider time interface compatibility for Python before v3.3
+if not hasattr(time, 'perf_counter'):  #pylint: disable=C0413
+	time.perf_counter = time.time
+
+# Note: ExecPool is imported only by the agent on serving to keep the job proxies lightweight
+
+_TIMEOUT = 5  # Timeout of the agent requests in seconds
+_LATENCY = 0.05  # Latency of the agent ExecPool in seconds, defines the latency of the jobs admission
+_SECRETENV = 'MPEAGENT_SECRET'  # Environment variable of the shared secret authenticating the requests
+# Command of the proxy process executing the job on the agent
+_PROXYCMD = (sys.executable, os.path.splitext(os.path.abspath(__file__))[0] + '.py', 'exec')
+
+
+def sockaddr(address):
+	"""Socket family and address by the textual address
+
+	address: str  - <host>:<port> of the TCP socket or the path of the Unix socket
+
+	return  family, addr  - socket family and address
+
+	>>> sockaddr('localhost:8091') == (socket.AF_INET, ('localhost', 8091))
+	True
+	>>> sockaddr('/tmp/mpeagent.sock') == (socket.AF_UNIX, '/tmp/mpeagent.sock')
+	True
+	"""
+	host, sep, port = address.rpartition(':')
+	if sep and port.isdigit() and '/' not in address:
+		return socket.AF_INET, (host or 'localhost', int(port))
+	return socket.AF_UNIX, address
+
+
+def agentSecret():
+	"""The shared secret authenticating the agent requests
+
+	return  str  - the secret, None if not specified
+	"""
+	return os.environ.get(_SECRETENV) or None
+
+
+def outpath(path, workdir):
+	"""Absolute path of the file output channel of the remote job restricted to its workdir
+
+	path: str  - path of the output file, the relative path is interpreted in the workdir
+	workdir: str  - absolute path of the working directory of the job
+
+	return  str  - the absolute path of the output file
+
+	Raises:
+		ValueError  - the path is located outside the workdir
+
+	>>> outpath('logs/job.log', '/tmp/wdir') == os.path.join(os.path.realpath('/tmp/wdir'), 'logs', 'job.log')
+	True
+	>>> outpath('../job.log', '/tmp/wdir')
+	Traceback (most recent call last):
+	ValueError: The output is located outside the workdir: ../job.log
+	"""
+	wdir = os.path.realpath(workdir)
+	res = os.path.realpath(os.path.join(wdir, path))
+	if not res.startswith(os.path.join(wdir, '')):
+		raise ValueError('The output is located outside the workdir: ' + path)
+	return res
+
+
+def connect(address, timeout=None):
+	"""Connect to the agent
+
+	address: str  - address of the agent
+	timeout: float  - timeout of the socket operations in seconds, None means blocking
+
+	return  socket  - the connected socket
+	"""
+	family, addr = sockaddr(address)
+	sock = socket.socket(family, socket.SOCK_STREAM)
+	sock.settimeout(timeout)
+	try:
+		sock.connect(addr)
+	except Exception:
+		sock.close()
+		raise
+	return sock
+
+
+def send(sock, msg, token=None):
+	"""Send the message
+
+	sock: socket  - the connected socket
+	msg: dict  - the message serializable to JSON
+	token: str  - the shared secret authenticating the request, None if not required
+	"""
+	if token is not None:
+		msg = dict(msg, token=token)
+	sock.sendall((json.dumps(msg) + '\n').encode())
+
+
+def recv(rfile):
+	"""Receive the message
+
+	rfile  - binary file of the connected socket
+
+	return  dict  - the message, None on the closed connection
+	"""
+	line = rfile.readline()
+	return json.loads(line.decode()) if line else None
+
+
+def request(address, msg, timeout=_TIMEOUT):
+	"""Perform the single request to the agent
+
+	address: str  - address of the agent
+	msg: dict  - the request
+	timeout: float  - timeout of the request in seconds
+
+	return  dict  - the reply
+	"""
+	sock = connect(address, timeout)
+	try:
+		send(sock, msg, agentSecret())
+		rfile = sock.makefile('rb')
+		try:
+			return recv(rfile)
+		finally:
+			rfile.close()
+	finally:
+		sock.close()
+
+
+class AgentLink(object):
+	"""Link of the master ExecPool to the execution agent"""
+	__slots__ = ('address', 'wksnum', 'nbusy', 'memfree', '_tinfo')
+
+	def __init__(self, address):
+		"""Link initialization
+
+		address: str  - <host>:<port> of the TCP socket or the path of the Unix socket of the agent
+
+		Internal attributes:
+		wksnum: int  - the number of the agent workers, 0 if the agent is unreachable
+		nbusy: int  - the number of the jobs dispatched to the agent and being executed
+		memfree: float  - available memory of the agent host in GB
+		"""
+		self.address = address
+		self.wksnum = 0
+		self.nbusy = 0
+		self.memfree = 0.
+		self._tinfo = None  # Time of the agent info update
+
+	def __str__(self):
+		return self.address
+
+	def free(self):
+		"""The number of free workers of the agent"""
+		return self.wksnum - self.nbusy
+
+	def update(self, latency=0.):
+		"""Update the info of the agent if it is older than the latency
+
+		latency: float  - max age of the info in seconds
+
+		return  bool  - whether the agent is reachable
+		"""
+		tcur = time.perf_counter()
+		if self._tinfo is not None and tcur - self._tinfo < latency:
+			return self.wksnum > 0
+		self._tinfo = tcur
+		try:
+			info = request(self.address, {'op': 'info'})
+			if info is None:
+				raise ValueError('the connection is closed')
+		except (IOError, OSError, ValueError) as err:
+			print('WARNING, the execution agent "{}" is unreachable: {}'.format(self.address, err), file=sys.stderr)
+			self.wksnum = 0
+			self.memfree = 0.
+			return False
+		self.wksnum = info['wksnum']
+		self.memfree = info['memfree']
+		return True
+
+	def args(self, job):
+		"""Arguments of the proxy process executing the job on the agent
+
+		job: Job  - the job to be executed remotely
+
+		return  list(str)  - the proxy process arguments
+		"""
+		spec = {'name': job.name, 'args': [str(arg) for arg in job.args]
+			# Note: the workdir is interpreted in the context of the caller
+			, 'workdir': os.path.abspath(job.workdir or os.getcwd()), 'timeout': job.timeout
+			, 'memlim': job.memlim, 'omitafn': job._omitafn, 'category': job.category, 'size': job.size  #pylint: disable=W0212
+			# The file output channels are written by the agent within the workdir,
+			# otherwise the output is relayed by the proxy
+			, 'stdout': os.path.abspath(job.stdout) if isinstance(job.stdout, str) else None
+			, 'stderr': os.path.abspath(job.stderr) if isinstance(job.stderr, str) else None}
+		return list(_PROXYCMD) + [self.address, json.dumps(spec)]
+
+
+def proxy(address, spec):
+	"""Execute the job on the agent relaying its output and exit code
+
+	The remote job is terminated by the agent when the connection is closed
+	(on the termination of the proxy).
+
+	address: str  - address of the agent
+	spec: dict  - the job spec
+
+	return  int  - exit code of the remote job
+	"""
+	try:
+		sock = connect(address)
+		send(sock, {'op': 'exec', 'job': spec}, agentSecret())
+		rep = recv(sock.makefile('rb'))
+	except (IOError, OSError) as err:
+		print('ERROR, "{}" can not be executed by the agent "{}": {}'.format(spec['name'], address, err)
+			, file=sys.stderr)
+		return getattr(err, 'errno', None) or errno.ECONNABORTED
+	if rep is None:
+		print('ERROR, the agent "{}" closed the connection executing "{}"'.format(address, spec['name'])
+			, file=sys.stderr)
+		return errno.ECONNABORTED
+	for out, chn in ((rep.get('out'), sys.stdout), (rep.get('err'), sys.stderr)):
+		if out:
+			chn.write(out)
+			chn.flush()
+	code = rep.get('code')
+	if code is None:  # The job has been canceled before the start
+		return errno.ECANCELED
+	if code < 0:
+		# Reproduce the termination of the remote job by the signal
+		os.kill(os.getpid(), -code)
+	return code
+
+
+class _AgentHandler(socketserver.StreamRequestHandler):
+	"""Handler of the agent connection"""
+	def handle(self):
+		msg = recv(self.rfile)
+		if not msg:
+			return
+		agent = self.server.agent
+		if not agent.authentic(msg.get('token')):
+			print('WARNING, the unauthenticated request to the agent is rejected from: {}'
+				.format(self.client_address or 'the Unix socket'), file=sys.stderr)
+			return
+		if msg.get('op') == 'info':
+			send(self.connection, agent.info())
+		elif msg.get('op') == 'exec':
+			agent.execute(msg['job'], self)
+		else:
+			print('WARNING, unknown request to the agent: {}'.format(msg.get('op')), file=sys.stderr)
+
+
+class ExecAgent(object):
+	"""Execution agent executing the jobs requested by the master ExecPool"""
+	def __init__(self, address, wksnum=None, cpus=None, memlimit=0., latency=_LATENCY, name=None, secret=None
+	, afnstep=None):
+		"""Agent initialization
+
+		address: str  - <host>:<port> of the TCP socket or the path of the Unix socket to be listened,
+			the TCP socket requires the secret
+		wksnum: int  - the number of the agent workers, the number of cpus by default
+		cpus: list(int)  - logical CPUs dedicated to the agent and inherited by its jobs,
+			None means all CPUs
+		memlimit: float  - memory limit of the agent jobs in GB (see ExecPool)
+		latency: float  - latency of the agent ExecPool in seconds
+		name: str  - name of the agent
+		secret: str  - the shared secret authenticating the requests, the MPEAGENT_SECRET
+			environment variable by default
+		afnstep: int  - affinity step of the agent ExecPool (see AffinityMask) binding the jobs
+			to the dedicated CPUs unless their affinity is omitted, None means the affinity is not applied;
+			the affinity mask covers all CPUs, so it is not combined with the dedicated cpus
+
+		Raises:
+			ValueError  - the TCP socket is listened without the secret or the cpus are combined with the afnstep
+		"""
+		self._secret = secret or agentSecret()
+		if sockaddr(address)[0] != socket.AF_UNIX and self._secret is None:
+			raise ValueError('The secret (${}) is required to listen on the TCP socket: {}'
+				.format(_SECRETENV, address))
+		if cpus and afnstep:
+			raise ValueError('The dedicated cpus can not be combined with the affinity step')
+		# Note: the ExecPool is imported here to keep the job proxies lightweight
+		try:
+			from mpepool import ExecPool, Job, AffinityMask, _memavail
+		except ImportError:
+			from .mpepool import ExecPool, Job, AffinityMask, _memavail
+		self._Job = Job
+		self._memavail = _memavail
+		if cpus:
+			os.sched_setaffinity(0, cpus)  #pylint: disable=E1101
+		self.address = address
+		self.wksnum = wksnum or len(os.sched_getaffinity(0))  #pylint: disable=E1101
+		afnmask = None
+		if afnstep:
+			afnmask = AffinityMask(afnstep)
+			self.wksnum = min(self.wksnum, afnmask.CPUS // afnmask.afnstep)
+		self.pool = ExecPool(self.wksnum, afnmask, memlimit=memlimit, latency=latency
+			, name=name or 'agent ' + address)
+		self._posted = threading.Event()  # Jobs have been posted to the pool
+
+	def authentic(self, token):
+		"""Whether the request is authentic
+
+		token: str  - the secret specified in the request
+
+		return  bool  - the request is authenticated
+		"""
+		if self._secret is None:
+			return True
+		return isinstance(token, str) and hmac.compare_digest(token.encode(), self._secret.encode())
+
+	def info(self):
+		"""Info of the agent
+
+		return  dict  - the info
+		"""
+		return {'wksnum': self.wksnum, 'memfree': self._memavail()}
+
+	def execute(self, spec, handler):
+		"""Execute the job spec until its completion or the connection closing
+
+		spec: dict  - the job spec
+		handler: _AgentHandler  - handler of the connection
+		"""
+		try:
+			outs = [None if not spec[chn] else outpath(spec[chn], spec['workdir']) for chn in ('stdout', 'stderr')]
+		except ValueError as err:
+			print('WARNING, "{}" is rejected: {}'.format(spec['name'], err), file=sys.stderr)
+			send(handler.connection, {'code': errno.EACCES, 'err': 'ERROR, {}\n'.format(err)})
+			return
+		done = threading.Event()
+
+		def onfinish(job):
+			"""Reply the completion of the job relaying the tail of its output"""
+			# Note: the whole output is fetched on the completion of the non-drained jobs
+			outs = [out[-job.pipetail:] if out else out for out in (job.pipedout, job.pipederr)]
+			try:
+				send(handler.connection, {'code': None if job.proc is None else job.proc.returncode
+					, 'out': outs[0], 'err': outs[1]})
+			except (IOError, OSError):
+				pass  # The connection is closed, the job was canceled
+			done.set()
+
+		job = self._Job(spec['name'], workdir=spec['workdir'], args=spec['args'], timeout=spec['timeout']
+			, onfinish=onfinish, category=spec['category'], size=spec['size'], omitafn=spec['omitafn']
+			, memlim=spec['memlim'], stdout=outs[0] or subprocess.PIPE
+			, stderr=outs[1] or subprocess.PIPE)
+		self.pool.post(job)
+		self._posted.set()
+		while not done.is_set():
+			if not handler.rfile.readline():
+				# The connection is closed by the proxy before the job completion
+				if not done.is_set():
+					self.pool.cancel(job)
+				break
+
+	def serve(self):
+		"""Serve the requests until the interruption"""
+		family, addr = sockaddr(self.address)
+		if family == socket.AF_UNIX:
+			if os.path.exists(addr):
+				os.remove(addr)
+			# The socket is accessible only by the owner since its creation,
+			# so the jobs are executed only on the requests of the owner if the secret is not specified
+			umask = os.umask(0o077)
+			try:
+				server = socketserver.ThreadingUnixStreamServer(addr, _AgentHandler)
+			finally:
+				os.umask(umask)
+		else:
+			socketserver.ThreadingTCPServer.allow_reuse_address = True
+			server = socketserver.ThreadingTCPServer(addr, _AgentHandler)
+		server.daemon_threads = True
+		server.agent = self
+		thread = threading.Thread(target=server.serve_forever)
+		thread.daemon = True
+		thread.start()
+		print('The execution agent is listening on {} with {} workers'.format(self.address, self.wksnum))
+		try:
+			with self.pool:
+				while self.pool.alive:
+					self._posted.wait(self.pool.latency)
+					self._posted.clear()
+					self.pool.join()
+					# The failures are traced on each completion of the executing jobs
+					del self.pool.failures[:]
+		finally:
+			server.shutdown()
+			server.server_close()
+			if family == socket.AF_UNIX and os.path.exists(addr):
+				os.remove(addr)
+
+
+def parseCpus(cpus):
+	"""Parse the list of CPUs
+
+	cpus: str  - comma-separated CPUs and their ranges
+
+	return  list(int)  - the CPUs
+
+	>>> parseCpus('0-2,5')
+	[0, 1, 2, 5]
+	"""
+	res = []
+	for rng in cpus.split(','):
+		beg, _, end = rng.partition('-')
+		res.extend(range(int(beg), int(end or beg) + 1))
+	return res
+
+
+def parseArgs(params=None):
+	"""Parse input parameters (arguments)
+
+	params  - the list of arguments to be parsed (argstr.split()), sys.argv is used if args is None
+
+	return args  - parsed arguments
+	"""
+	parser = argparse.ArgumentParser(description='Execution agent of the Multi-Process Execution Pool.')
+	cmds = parser.add_subparsers(dest='cmd')
+	cmds.required = True
+	srv = cmds.add_parser('serve', help='serve the jobs of the master ExecPool')
+	srv.add_argument('address', help='<host>:<port> of the TCP socket or the path of the Unix socket')
+	srv.add_argument('-w', '--wksnum', type=int, default=None, help='the number of workers, the number of CPUs by default')
+	srv.add_argument('-c', '--cpus', type=parseCpus, default=None
+		, help='CPUs dedicated to the agent and its jobs, for example: 0-3,8')
+	srv.add_argument('-a', '--afnstep', type=int, default=None
+		, help='affinity step binding the jobs to the dedicated CPUs (see AffinityMask), not applied by default')
+	srv.add_argument('-m', '--memlimit', type=float, default=0., help='memory limit of the jobs in GB')
+	srv.add_argument('-l', '--latency', type=float, default=_LATENCY, help='latency of the jobs admission in seconds')
+	prx = cmds.add_parser('exec', help='execute the job spec on the agent (the proxy of the master ExecPool)')
+	prx.add_argument('address', help='address of the agent')
+	prx.add_argument('spec', type=json.loads, help='the job spec in JSON')
+	return parser.parse_args(params)
+
+
+if __name__ == '__main__':
+	args = parseArgs()
+	if args.cmd == 'exec':
+		sys.exit(proxy(args.address, args.spec))
+	ExecAgent(args.address, args.wksnum, args.cpus, args.memlimit, args.latency, afnstep=args.afnstep).serve()
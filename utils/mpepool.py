@@ -11,11 +11,19 @@ considering NUMA architecture:
 		non-started jobs rescheduling to satisfy *timeout* and *memory limit* constraints
 	- automatic CPU affinity management and maximization of the dedicated CPU cache
 		vs parallelization for a worker process
+	- NUMA memory placement binding memory of the job to the node of its dedicated CPUs
+		having the most free memory
 	- *timeout per each Job* (it was the main initial motivation to implement this
 		module, because this feature is not provided by any Python implementation out of the box)
 	- onstart/ondone *callbacks*, ondone is called only on successful completion
 		(not termination) for both Jobs and Tasks (group of jobs)
 	- stdout/err output, which can be redirected to any custom file or PIPE
+	- *warm Python workers* (PyJob) executing Python callables in the processes forked
+		from the server having preloaded modules, omitting the interpreter startup
+	- append-only *journal* of the jobs execution to resume the interrupted execution
+		skipping the successfully completed jobs
+	- *distributed execution* dispatching the jobs to the execution agents (mpeagent)
+		on several hosts or disjoint CPU sets, weighting them by the free cores and RAM
 	- custom parameters for each Job and respective owner Task besides the name/id
 
 	Flexible API provides optional automatic restart of jobs on timeout, access to job's process,
@@ -27,6 +35,10 @@ considering NUMA architecture:
 		requires psutil import
 	_CHAINED_CONSTRAINTS  - terminate related jobs on terminating any job by the execution
 		constraints (timeout or RAM limit)
+	_CGROUP  - cgroup v2 with the enabled memory controller to create a cgroup per job,
+		which accounts memory of the whole job process tree without its sampling and enforces
+		the job memlim; MPEPOOL_CGROUP environment variable or the own cgroup of the process
+		if writable; None means /proc/<pid>/statm sampling with the cached descendants
 
 	The load balancing is enabled when global variables _LIMIT_WORKERS_RAM and _CHAINED_CONSTRAINTS
 	are set, jobs categories and relative size (if known) specified. The balancing is performed
@@ -49,7 +61,8 @@ from __future__ import print_function, division  # Required for stderr output, m
 import sys
 import os
 import time
-# import ctypes  # Required for the multiprocessing Value definition
+import ctypes  # Required for the NUMA memory binding via set_mempolicy
+import platform  # Required to identify the set_mempolicy syscall number
 import types  # Required for instance methods definition
 import traceback  # stacktrace
 # To print a stacktrace fragment:
@@ -57,14 +70,29 @@ import traceback  # stacktrace
 # print(traceback.format_exc(5), file=sys.stderr)
 import subprocess
 import errno
+try:
+	import selectors  # Required for the event-driven workers completion (pidfd polling)
+except ImportError:
+	selectors = None  # Python 2, the workers are revised with the fixed latency
 # # Async Tasks management
 # import threading  # Used only for the concurrent Tasks termination by timeout
 # import signal  # Required for the correct handling of KeyboardInterrupt: https://docs.python.org/2/library/thread.html
 import itertools  # chain
+import bisect  # Jobs history indexing by size
+import heapq  # Non-started jobs queue
+from collections import deque  # Tail of the piped output
 
 from multiprocessing import cpu_count, Lock  #, Queue  #, active_children, Value, Process
-from collections import deque
+try:
+	# Warm Python workers are forked by the server process having preloaded modules
+	from multiprocessing import get_context, forkserver
+except ImportError:
+	get_context = None  # Python 2, PyJob is not supported
 from math import sqrt
+try:
+	from shutil import which  # Required to locate the NUMA memory binding app
+except ImportError:
+	from distutils.spawn import find_executable as which  # Python 2
 
 # Consider time interface compatibility with Python before v3.3
 if not hasattr(time, 'perf_counter'):
@@ -117,6 +145,12 @@ if _WEBUI:
 			__imperr = wuerr  # Note: exceptions are local in Python 3
 			_WEBUI = False
 
+# Execution agents to distribute the jobs among several hosts
+try:
+	from mpeagent import AgentLink
+except ImportError:
+	from .mpeagent import AgentLink
+
 # Limit the amount of memory consumption by worker processes.
 # NOTE:
 #  - requires import of psutils
@@ -166,7 +200,54 @@ _RAM_LIMIT = _RAM_SIZE * 0.98 - 0.25  # Maximal consumption of RAM in GB (< _RAM
 # System app to set CPU affinity if required, should be preliminary installed
 # (taskset is present by default on NIX systems)
 _AFFINITYBIN = 'taskset'
+# Native CPU affinity of the started worker processes instead of the _AFFINITYBIN execution
+_SETAFFINITY = hasattr(os, 'sched_setaffinity')
+# System app to bind memory of the job process to the NUMA node of its CPUs if available
+# (numactl package), set_mempolicy syscall is applied to the spawning thread otherwise
+_NUMABIN = 'numactl'
 _DEBUG_TRACE = False  # Trace start / stop and other events to stderr;  1 - brief, 2 - detailed, 3 - in-cycles
+# Event-driven reaping of the completed workers via pidfd (Linux 5.3+, Python 3.9+)
+# instead of waiting for the next revision of the workers after the pool latency
+_PIDFD = selectors is not None and hasattr(os, 'pidfd_open')
+# Page size in bytes used to evaluate memory from /proc/<pid>/statm
+_PAGESIZE = os.sysconf('SC_PAGE_SIZE')
+# Memory of the processes is read from /proc/<pid>/statm instead of psutil if available
+_PROCSTATM = os.path.isfile('/proc/self/statm')
+# Available memory of the system is read from /proc/meminfo instead of psutil if available
+_PROCMEMINFO = os.path.isfile('/proc/meminfo')
+
+
+def _cgroupRoot():
+	"""Delegated cgroup v2 having the memory controller enabled for the subtree
+
+	The cgroup is specified by the MPEPOOL_CGROUP environment variable (absolute path
+	of the cgroup directory) or the own cgroup of the process is used.
+
+	return  path: str  - path of the cgroup or None if the memory controller is not available
+	"""
+	root = os.environ.get('MPEPOOL_CGROUP')
+	if not root:
+		try:
+			with open('/proc/self/cgroup') as fcg:
+				for ln in fcg:
+					# Note: the cgroup v2 (unified hierarchy) has the "0::<path>" format
+					if ln.startswith('0::'):
+						root = '/sys/fs/cgroup' + ln[3:].rstrip('\n')
+						break
+		except IOError:
+			return None
+	try:
+		with open(os.path.join(root, 'cgroup.subtree_control')) as fsc:
+			if 'memory' not in fsc.read().split() or not os.access(root, os.W_OK):
+				return None
+	except (IOError, TypeError):
+		return None
+	return root
+
+
+# Memory accounting and limitation of the jobs by the cgroup v2 memory controller (a cgroup per job)
+# instead of the sampling of the process trees
+_CGROUP = None if not _LIMIT_WORKERS_RAM else _cgroupRoot()
 
 
 def secondsToHms(seconds):
@@ -610,21 +691,6 @@ def unfoldDepthFirst(tinfext, indent=0):
 class Task(object):
 	"""Task is a managing container for subtasks and Jobs"""
 
-	# _tasks = []
-	# _taskManager = None
-	# _taskManagerLock = threading.Lock()
-	#
-	# @staticmethod
-	# def _taskTerminator(*args, **kwargs):
-	# 	tasks = kwargs['tasks']
-	# 	latency = kwargs['latency']
-	# 	lock = kwargs['lock']
-	# 	ctime = time.perf_counter()
-	# 	with lock:
-	# 		for task in tasks:
-	# 			if task.timeout and ctime - task.tstart >= task.timeout:
-	# 				task.terminate()
-
 	def __init__(self, name, timeout=0, onstart=None, ondone=None, onfinish=None, params=None
 		, task=None, latency=1.5, stdout=sys.stdout, stderr=sys.stderr):
 		"""Initialize task, which is a group of subtasks including jobs to be executed
@@ -633,7 +699,9 @@ class Task(object):
 		(terminated or completed with non-zero return code).
 
 		name: str  - task name
-		timeout  - execution timeout in seconds. Default: 0, means infinity. ATTENTION: not implemented
+		timeout  - execution timeout in seconds since the start of the first job of the task by
+			the ExecPool. Default: 0, means infinity. On expiration the non-started jobs of the task
+			(including its subtasks) are canceled and the executing ones are terminated
 		onstart  - a callback, which is executed on the task start (before the subtasks/jobs execution
 			started) in the CONTEXT OF THE CALLER (main process) with the single argument,
 			the task. Default: None
@@ -660,11 +728,12 @@ class Task(object):
 			(each subtask may contain multiple jobs or sub-sub-tasks)
 		numterm: uint  - the number of terminated direct subtasks (including jobs) that are not restarting
 			numdone + numterm <= numadded
+		expired: bool  - the task is terminated by its timeout
 		"""
-		assert isinstance(name, str) and (latency is None or latency >= 0) and (
+		assert isinstance(name, str) and timeout >= 0 and (latency is None or latency >= 0) and (
 			task is None or (isinstance(task, Task) and task != self)), (
-			'Task arguments are invalid, name: {}, latency: {}, task type: {} (valid: {})'
-			.format(name, latency, type(task).__name__, task != self))
+			'Task arguments are invalid, name: {}, timeout: {}, latency: {}, task type: {} (valid: {})'
+			.format(name, timeout, latency, type(task).__name__, task != self))
 		self._lock = Lock()  # Lock for the included jobs
 		# dict(subtask: Task | Job, accterms: uint)
 		# # Dictionary of non-completed (but can be terminated) subtasks with the direct termination counter
@@ -677,7 +746,7 @@ class Task(object):
 		self.onstart = None if not callable(onstart) else types.MethodType(onstart, self)
 		self.ondone = None if not callable(ondone) else types.MethodType(ondone, self)
 		self.onfinish = None if not callable(onfinish) else types.MethodType(onfinish, self)
-		# self.timeout = timeout
+		self.timeout = timeout
 		self.params = params
 		self._latency = latency
 		self.task = task
@@ -689,15 +758,10 @@ class Task(object):
 		self.numadded = 0  # The number of added direct subtasks, the same subtask/job can be re-added several times
 		self.numdone = 0  # The number of completed direct subtasks
 		self.numterm = 0  # Total number of terminated direct subtasks that are not restarting
+		self.expired = False  # The task is terminated by timeout
 		# Update the task if any with this subtask
 		if self.task:
 			self.task.add(self)
-		# Consider subtasks termination by timeout
-		# if self.timeout:
-		# 	if not _tasks:
-		# 		_tasks.append(self)
-		# 		Task._taskManager = threading.Thread(name="TaskManager", target=Task._taskTerminator
-		# 			, kwargs={'tasks': Task._tasks, 'latency': latency})
 
 
 	def __str__(self):
@@ -852,6 +916,144 @@ class Task(object):
 		return res
 
 
+def taskexpired(item):
+	"""Whether the owner task of the item or any its super-task is expired (terminated by timeout)
+
+	item: Job|Task  - the job or task
+
+	return  bool  - the item belongs to the expired task
+	"""
+	task = item.task
+	while task is not None:
+		if task.expired:
+			return True
+		task = task.task
+	return False
+
+
+class JobCgroup(object):
+	"""Cgroup v2 of the job process tree for the memory accounting and limitation
+
+	The job process is attached to the cgroup by the parent right after its spawning, so all
+	its descendants spawned afterwards are accounted in the cgroup by the kernel.
+	NOTE: the descendants forked by the job process before its attachment (a short window after
+	the exec) and the memory allocated meanwhile are not accounted in the cgroup.
+	"""
+	__slots__ = ('path', '_procs')
+
+	def __init__(self, path, memlim=0.):
+		"""Create the cgroup
+
+		path: str  - path of the creating cgroup
+		memlim: float  - max amount of memory in GB for the job process tree enforced
+			by the kernel (memory.max), 0 - unlimited
+		"""
+		os.mkdir(path)
+		self.path = path
+		self._procs = os.path.join(path, 'cgroup.procs')
+		if memlim:
+			try:
+				self._write('memory.max', str(int(inBytes(memlim))))
+			except (IOError, OSError):
+				os.rmdir(path)
+				raise
+
+	def _write(self, name, val):
+		"""Write the cgroup interface file"""
+		with open(os.path.join(self.path, name), 'w') as fcg:
+			fcg.write(val)
+
+	def _read(self, name):
+		"""Read the cgroup interface file"""
+		with open(os.path.join(self.path, name)) as fcg:
+			return fcg.read()
+
+	def attach(self, pid=0):
+		"""Move the process to the cgroup
+
+		pid: int  - id of the process, 0 means the calling process
+		"""
+		fd = os.open(self._procs, os.O_WRONLY)
+		try:
+			os.write(fd, str(pid).encode())
+		finally:
+			os.close(fd)
+
+	def mem(self):
+		"""Current memory consumption of the process tree in bytes"""
+		return int(self._read('memory.current'))
+
+	def peak(self):
+		"""Peak memory consumption of the process tree in bytes, None if not supported (Linux < 5.19)"""
+		try:
+			return int(self._read('memory.peak'))
+		except (IOError, OSError, ValueError):
+			return None
+
+	def oomkills(self):
+		"""The number of processes killed by the memory limit of the cgroup"""
+		try:
+			for ln in self._read('memory.events').splitlines():
+				if ln.startswith('oom_kill '):
+					return int(ln[len('oom_kill '):])
+		except (IOError, OSError, ValueError):
+			pass
+		return 0
+
+	def release(self):
+		"""Kill the remained processes and remove the cgroup
+
+		return  bool  - the cgroup is removed, otherwise it still has the (terminating) processes
+		"""
+		try:
+			self._write('cgroup.kill', '1')  # Linux 5.14+
+		except (IOError, OSError):
+			pass
+		try:
+			os.rmdir(self.path)
+		except OSError as err:
+			if err.errno == errno.ENOENT:
+				return True
+			if err.errno != errno.EBUSY:
+				print('WARNING, the cgroup "{}" can not be removed: {}'.format(self.path, err), file=sys.stderr)
+			return False
+		return True
+
+
+def _statmem(pid):
+	"""Memory consumption of the process from /proc/<pid>/statm
+
+	pid: int  - process id
+
+	return  vms, rss: int  - virtual and resident memory in bytes or None if the process does not exist
+	"""
+	try:
+		with open('/proc/{}/statm'.format(pid)) as fstm:
+			vms, rss = fstm.read().split(None, 2)[:2]
+	except (IOError, OSError, ValueError):
+		return None
+	return int(vms) * _PAGESIZE, int(rss) * _PAGESIZE
+
+
+def _memavail():
+	"""Available memory of the system
+
+	The value is read from /proc/meminfo if possible, which is much faster than psutil.
+
+	return  float  - available memory in gigabytes
+	"""
+	if _PROCMEMINFO:
+		try:
+			with open('/proc/meminfo', 'rb') as fmi:
+				for ln in fmi:
+					# Format: "MemAvailable:   12345678 kB"
+					if ln.startswith(b'MemAvailable:'):
+						return inGigabytes(int(ln.split()[1]) * 1024)
+		except (IOError, OSError, ValueError):
+			pass
+	return inGigabytes(psutil.virtual_memory().available)
+
+
 class Job(object):
 	"""Job is executed in a separate process via Popen or Process object and is
 	managed by the Process Pool Executor
@@ -860,12 +1062,15 @@ class Job(object):
 	# should use some wrapper in the latter case to manage it
 
 	_RTM = 0.85  # Memory retention ratio, used to not drop the memory info fast on temporal releases, E [0, 1)
+	_CHLDUPD = 5  # Period (the number of memory updates) of the refreshing of the cached descendant processes
+	_WRSS = 0.9  # Weight of the rss in the evaluated memory: 0.5 .. 0.98, the remained weight is taken from vms
 	assert 0 <= _RTM < 1, 'Memory retention ratio should E [0, 1)'
 
 	# NOTE: keyword-only arguments are specified after the *, supported only since Python 3
 	def __init__(self, name, workdir=None, args=(), timeout=0, rsrtonto=False, task=None #,*
 	, startdelay=0., onstart=None, ondone=None, onfinish=None, params=None, category=None, size=0, slowdown=1.
-	, omitafn=False, memkind=1, memlim=0., stdout=sys.stdout, stderr=sys.stderr, poutlog=None, perrlog=None):
+	, omitafn=False, memkind=1, memlim=0., stdout=sys.stdout, stderr=sys.stderr, poutlog=None
+	, perrlog=None, pipetail=64*1024, membind=None):
 		"""Initialize job to be executed
 
 		Main parameters:
@@ -878,8 +1083,9 @@ class Job(object):
 			non-deterministic Jobs like generation of the synthetic networks to regenerate
 			the network on border cases overcoming getting stuck on specific values of the rand variables.
 		task: Task  - origin task if this job is a part of the task
-		startdelay  - delay after the job process starting to execute it for some time,
-			executed in the CONTEXT OF THE CALLER (main process).
+		startdelay  - delay after the job process starting to execute it for some time
+			before starting the subsequent jobs; the scheduler is not blocked meanwhile
+			(the completed workers are processed).
 			ATTENTION: should be small (0.1 .. 1 sec)
 		onstart  - a callback, which is executed on the job starting (before the execution
 			started) in the CONTEXT OF THE CALLER (main process) with the single argument,
@@ -904,10 +1110,17 @@ class Job(object):
 			The path is interpreted in the CALLER CONTEXT
 		poutlog: str  - file name to log non-empty piped stdout pre-pended with the timestamp. Actual only if stdout is PIPE.
 		perrlog: str  - file name to log non-empty piped stderr pre-pended with the timestamp. Actual only if stderr is PIPE.
+		pipetail: int  - max size in bytes of the retained tail of the piped output (pipedout/pipederr)
+			drained by the ExecPool during the execution, 0 means the whole output. The output is streamed
+			to the poutlog/perrlog if specified. Actual only for the concurrent jobs if _PIDFD,
+			otherwise the whole output is fetched on the job completion
 
 		Scheduling parameters:
 		omitafn  - omit affinity policy of the scheduler, which is actual when the affinity is enabled
 			and the process has multiple treads
+		membind: bool  - bind memory of the job process to the NUMA node of its dedicated CPUs,
+			which is chosen having the most free memory; None means the policy of the ExecPool.
+			Actual only for the multi-node systems when the affinity is applied and not omitted
 		category  - classification category, typically semantic context or part of the name,
 			used to identify related jobs;
 			requires _CHAINED_CONSTRAINTS
@@ -924,7 +1137,9 @@ class Job(object):
 			1  - mem for the heaviest process of the process tree spawned by the original process
 				(including the origin itself)
 			2  - mem for the whole spawned process tree including the origin process
-		memlim: float  - max amount of memory in GB allowed for the job execution, 0 - unlimited
+		memlim: float  - max amount of memory in GB allowed for the job execution, 0 - unlimited;
+			enforced by the kernel (memory.max of the job cgroup) if the cgroup v2 memory controller
+			is delegated to the execution pool (see _CGROUP)
 
 		Execution parameters, initialized automatically on execution:
 		tstart  - start time, filled automatically on the execution start (before onstart). Default: None
@@ -947,6 +1162,12 @@ class Job(object):
 		wkslim  - worker processes limit (max number) on the job postponing if any,
 			the job is postponed until at most this number of worker processes operate;
 			requires _LIMIT_WORKERS_RAM
+		exptime  - expected execution time in seconds predicted from the ExecPool history
+			for the jobs of the same category, application and non-larger size, None if unknown
+		cpus: set(int)  - logical CPUs dedicated to the job by the CpuAllocator of the ExecPool
+			during the execution, None if the affinity is not applied
+		memnode: int  - NUMA node the memory of the job process is bound to during the execution,
+			None if the memory is not bound
 		chtermtime  - chained termination: None - disabled, False - by memory, True - by time;
 			requires _CHAINED_CONSTRAINTS
 		"""
@@ -978,6 +1199,8 @@ class Job(object):
 		self.stderr = stderr
 		self.poutlog = poutlog
 		self.perrlog = perrlog
+		self.pipetail = pipetail
+		self._pipetails = None  # PipeTail of the drained stdout and stderr, None if the pipes are not drained
 		# Internal properties --------------------------------------------------
 		self.tstart = None  # start time is filled automatically on the execution start, before onstart. Default: None
 		self.tstop = None  # Termination / completion time after ondone
@@ -986,11 +1209,16 @@ class Job(object):
 		self.pipedout = None
 		self.pipederr = None
 		self.terminates = 0  # Accumulated number of the received termination requests caused by the constraints violation
+		self.exptime = None  # Expected execution time predicted from the history of the execution pool
 		# Process-related unified logging descriptors of file / system output channel / PIPE related system object
 		self._stdout = None
 		self._stderr = None
 		# Omit scheduler affinity policy (actual when some process is computed on all treads, etc.)
 		self._omitafn = omitafn
+		self.cpus = None
+		self.membind = membind
+		self.memnode = None
+		self._agent = None  # AgentLink of the execution agent executing the job, None if executed locally
 		# Whether the job is restarting (in process) on timeout or because of the
 		# GROUP memory limit violation (where the job itself does not violate any constraints);
 		# required to be aware whether to complete the owner task
@@ -1004,6 +1232,10 @@ class Job(object):
 			# Consumed implementation-defined type of memory on execution in gigabytes or the least expected
 			# (inherited from the related jobs having the same category and non-smaller size)
 			self.mem = 0.
+			self._mempeak = 0.  # Peak of the evaluated memory consumption, persisted to the history
+			self._cgroup = None  # JobCgroup of the process tree if the memory is accounted by the cgroup
+			self._childs = ()  # Cached descendant processes (pids) for the memory evaluation
+			self._chldupd = 0  # The number of the memory updates until the refreshing of the cached descendants
 		if _CHAINED_CONSTRAINTS:
 			self.category = category  # Job name
 			self.slowdown = slowdown  # Execution slowdown ratio, >= 0, where (0, 1) - speedup, > 1 - slowdown
@@ -1038,6 +1270,8 @@ class Job(object):
 			1  - mem for the heaviest process of the process tree spawned by the original process
 				(including the origin)
 			2  - mem for the whole spawned process tree including the origin process
+			NOTE: the cgroup accounting (if the job has the cgroup) evaluates the whole process tree
+				for both 1 and 2, which is the upper bound of the former
 
 		return  - smooth max of job mem
 		"""
@@ -1045,33 +1279,79 @@ class Job(object):
 			return 0
 		# Current consumption of memory by the job
 		curmem = 0  # Evaluating memory
-		try:
-			up = psutil.Process(self.proc.pid)
-			pmem = up.memory_info()
-			# Note: take weighted average of mem and rss to not over/under reserve RAM especially for Java apps
-			wrss = 0.9  # Weight of the rss: 0.5 .. 0.98
-			curmem = pmem.vms * (1 - wrss) + pmem.rss * wrss
-			if self.memkind:
-				amem = curmem  # Memory consumption of the whole process tree
-				xmem = curmem  # Memory consumption of the heaviest process in the tree
-				for ucp in up.children(recursive=True):  # Note: fetches only children processes
-					pmem = ucp.memory_info()
-					mem = pmem.vms * (1 - wrss) + pmem.rss * wrss  # MB
-					amem += mem
-					if xmem < mem:
-						xmem = mem
-				curmem = amem if self.memkind == 2 else xmem
-		except psutil.Error as err:
-			# The process is finished and such pid does not exist
-			print('WARNING, _updateMem() failed, current proc mem set to 0: {}. {}'.format(
-				err, traceback.format_exc(5)), file=sys.stderr)
+		if self._cgroup is not None and self.memkind:
+			try:
+				curmem = self._cgroup.mem()
+			except (IOError, OSError, ValueError) as err:
+				print('WARNING, _updateMem() failed on the cgroup, current proc mem set to 0: {}'.format(err)
+					, file=sys.stderr)
+		elif _PROCSTATM:
+			curmem = self.__statmTree()
+		else:
+			try:
+				up = psutil.Process(self.proc.pid)
+				pmem = up.memory_info()
+				# Note: take weighted average of mem and rss to not over/under reserve RAM especially for Java apps
+				curmem = pmem.vms * (1 - Job._WRSS) + pmem.rss * Job._WRSS
+				if self.memkind:
+					amem = curmem  # Memory consumption of the whole process tree
+					xmem = curmem  # Memory consumption of the heaviest process in the tree
+					for ucp in up.children(recursive=True):  # Note: fetches only children processes
+						pmem = ucp.memory_info()
+						mem = pmem.vms * (1 - Job._WRSS) + pmem.rss * Job._WRSS  # MB
+						amem += mem
+						if xmem < mem:
+							xmem = mem
+					curmem = amem if self.memkind == 2 else xmem
+			except psutil.Error as err:
+				# The process is finished and such pid does not exist
+				print('WARNING, _updateMem() failed, current proc mem set to 0: {}. {}'.format(
+					err, traceback.format_exc(5)), file=sys.stderr)
 		# Note: even if curmem = 0 update mem smoothly to avoid issues on internal
 		# fails of psutil even thought they should not happen
 		curmem = inGigabytes(curmem)
 		self.mem = max(curmem, self.mem * Job._RTM + curmem * (1-Job._RTM))
+		if self._mempeak < curmem:
+			self._mempeak = curmem
 		return self.mem
 
 
+	def __statmTree(self):
+		"""Evaluate memory of the process tree from /proc/<pid>/statm
+
+		The descendant processes are cached and refreshed only periodically or when
+		some of them are completed, which avoids the process tree walk on each update.
+
+		return  curmem: float  - memory consumption in bytes according to the self.memkind
+		"""
+		pmem = _statmem(self.proc.pid)
+		if pmem is None:
+			return 0
+		# Note: take weighted average of mem and rss to not over/under reserve RAM especially for Java apps
+		curmem = pmem[0] * (1 - Job._WRSS) + pmem[1] * Job._WRSS
+		if not self.memkind:
+			return curmem
+		if self._chldupd <= 0:
+			try:
+				self._childs = [ucp.pid for ucp in psutil.Process(self.proc.pid).children(recursive=True)]
+			except psutil.Error:
+				self._childs = ()
+			self._chldupd = Job._CHLDUPD
+		self._chldupd -= 1
+		amem = curmem  # Memory consumption of the whole process tree
+		xmem = curmem  # Memory consumption of the heaviest process in the tree
+		for pid in self._childs:
+			pmem = _statmem(pid)
+			if pmem is None:
+				self._chldupd = 0  # Refresh the descendants on the next update
+				continue
+			mem = pmem[0] * (1 - Job._WRSS) + pmem[1] * Job._WRSS
+			amem += mem
+			if xmem < mem:
+				xmem = mem
+		return amem if self.memkind == 2 else xmem
+
+
 	def lessmem(self, job):
 		"""Whether the [estimated] memory consumption is less than in the specified job
 
@@ -1123,8 +1403,9 @@ class Job(object):
 		self.fetchPipedData(0)
 		timestamp = None
 		# Persis the piped output if required
-		for pout, plog in ((self.pipedout, self.poutlog), (self.pipederr, self.perrlog)):
-			if not pout or plog is None:  # Omit production of the empty logs
+		for i, (pout, plog) in enumerate(((self.pipedout, self.poutlog), (self.pipederr, self.perrlog))):
+			# Omit production of the empty logs and the logs streamed on the pipe draining
+			if not pout or plog is None or (self._pipetails and self._pipetails[i] is not None):
 				continue
 			# Ensure existence of the parent directory for the filename
 			customfile = isinstance(plog, str)
@@ -1230,219 +1511,1226 @@ class Job(object):
 		#traceback.print_stack(limit=5, file=sys.stderr)
 
 
-def ramfracs(fracsize):
-	"""Evaluate the minimal number of RAM fractions of the specified size in GB
+class PipeTail(object):
+	"""Non-blocking drain of the job pipe retaining the tail of the output
 
-	Used to estimate the reasonable number of processes with the specified minimal
-	dedicated RAM.
+	The output is read by the ExecPool as soon as it is available, so the job is
+	never blocked on the filled pipe and the consumed memory is bounded by the tail.
+	The whole output is optionally streamed to the log.
 
-	fracsize  - minimal size of each fraction in GB, can be a fractional number
-	return the minimal number of RAM fractions having the specified size in GB
+	>>> rfd, wfd = os.pipe()
+	>>> pipe = os.fdopen(rfd, 'rb')
+	>>> ptl = PipeTail(pipe, 8)
+	>>> os.write(wfd, b'line1\\nline2\\nline3\\n'); os.close(wfd)
+	18
+	>>> ptl.drain(), ptl.output()
+	(False, 'line3\\n')
+	>>> pipe.close()
 	"""
-	return int(_RAM_SIZE / fracsize)
+	__slots__ = ('fd', 'tail', '_chunks', '_size', '_log', '_flog')
+	_READSIZE = 64 * 1024  # Max size of the read block in bytes
 
+	def __init__(self, pipe, tail=0, log=None):
+		"""Initialize the drain setting the non-blocking mode of the pipe
 
-def cpucorethreads():
-	"""The number of hardware treads per a CPU core
+		pipe  - the readable pipe (file object) of the job process
+		tail: int  - max size of the retained output in bytes, 0 means the whole output
+		log: str|file  - log of the whole output to be APPENDED with the timestamp header if
+			the log file is not empty, None if not used
+		"""
+		self.fd = pipe.fileno()
+		os.set_blocking(self.fd, False)  #pylint: disable=E1101
+		self.tail = tail
+		self._chunks = deque()
+		self._size = 0  # Size of the retained chunks in bytes
+		self._log = log
+		self._flog = None  # Opened log
+
+	def drain(self):
+		"""Read all available output
+
+		return  bool  - the pipe is open, False on EOF
+		"""
+		while True:
+			try:
+				data = os.read(self.fd, self._READSIZE)
+			except OSError as err:
+				if err.errno == errno.EINTR:
+					continue
+				if err.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+					return True
+				raise
+			if not data:
+				return False
+			if self._log is not None:
+				self.__logged(data)
+			self._chunks.append(data)
+			self._size += len(data)
+			# Retain only the chunks required for the tail
+			while self.tail and self._size - len(self._chunks[0]) >= self.tail:
+				self._size -= len(self._chunks.popleft())
+
+	def output(self):
+		"""The retained output, the partial first line is omitted if the output is truncated
+
+		return  str  - the output
+		"""
+		data = b''.join(self._chunks)
+		if self.tail and len(data) > self.tail:
+			data = data[-self.tail:]
+			inl = data.find(b'\n')
+			if 0 <= inl < len(data) - 1:
+				data = data[inl + 1:]
+		return data.decode(errors='replace')
+
+	def close(self):
+		"""Close the log, the pipe itself is closed by the owner"""
+		if self._flog is not None:
+			if isinstance(self._log, str):
+				self._flog.close()
+			else:
+				self._flog.flush()
+			self._flog = None
 
-	Used to specify CPU affinity dedicating the maximal amount of CPU cache L1/2.
-	"""
-	# -r or -E  - extended regex syntax, -n  - quiet output, /p  - print the match
-	return int(subprocess.check_output(
-		[r"lscpu | sed -rn 's/^Thread\(s\).*(\w+)$/\1/p'"], shell=True))
+	def __logged(self, data):
+		"""Write the data to the log opening it if required
+
+		data: bytes  - the output data
+		"""
+		try:
+			if self._flog is None:
+				if isinstance(self._log, str):
+					basedir = os.path.split(self._log)[0]
+					if basedir and not os.path.exists(basedir):
+						os.makedirs(basedir)
+					self._flog = open(self._log, 'ab')
+					if os.fstat(self._flog.fileno()).st_size:
+						self._flog.write((timeheader(time.gmtime()) + '\n').encode())
+				else:
+					self._log.flush()
+					self._flog = getattr(self._log, 'buffer', self._log)
+			self._flog.write(data)
+		except (IOError, OSError) as err:
+			print('ERROR on logging piped data "{}": {}'.format(self._log, err), file=sys.stderr)
+			self._log = None
 
 
-def cpunodes():
-	"""The number of NUMA nodes, where physical CPUs are located.
+def cpumaskset(cpumask):
+	"""Set of the logical CPUs specified by the affinity mask
 
-	Used to evaluate CPU index from the affinity table index considering the
-	NUMA architecture.
-	Usually NUMA nodes = physical CPUs.
+	cpumask: str  - affinity mask in the taskset list format: comma-separated CPUs and their ranges
+
+	return  set(int)  - logical CPUs
+
+	>>> sorted(cpumaskset('0,2-4'))
+	[0, 2, 3, 4]
 	"""
-	return int(subprocess.check_output(
-		[r"lscpu | sed -rn 's/^NUMA node\(s\).*(\w+)$/\1/p'"], shell=True))
+	cpus = set()
+	for rng in cpumask.split(','):
+		beg, _, end = rng.partition('-')
+		cpus.update(range(int(beg), int(end or beg) + 1))
+	return cpus
+
+
+def _pyexec(func, fargs, fkwargs, workdir, outputs, cpus, cgroup, memnode):
+	"""Execute the callable of the PyJob in the warm worker process
+
+	func: callable  - the executing function, its int result is the exit code
+	fargs: tuple  - positional arguments of the function
+	fkwargs: dict  - keyword arguments of the function
+	workdir: str  - working directory or None
+	outputs: (str, str)  - paths of the stdout and stderr to be redirected to, None means inherited
+	cpus: set(int)  - logical CPUs to bind the process to or None
+	cgroup: JobCgroup  - cgroup of the job to join or None
+	memnode: int  - NUMA node to bind the memory allocations to or None
+	"""
+	if cgroup is not None:
+		cgroup.attach()
+	if cpus:
+		os.sched_setaffinity(0, cpus)  #pylint: disable=E1101
+	if memnode is not None:
+		if not mempolicy(memnode):
+			print('WARNING, memory of the worker #{} can not be bound to the NUMA node {}'
+				.format(os.getpid(), memnode), file=sys.stderr)
+	if workdir:
+		os.chdir(workdir)
+	for fd, fout, path in zip((1, 2), (sys.stdout, sys.stderr), outputs):
+		if path:
+			fout.flush()
+			fdo = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+			os.dup2(fdo, fd)
+			os.close(fdo)
+	try:
+		res = func(*fargs, **fkwargs)
+	finally:
+		sys.stdout.flush()
+		sys.stderr.flush()
+	# Note: the exception yields the exit code 1 with the traceback on stderr
+	sys.exit(res if isinstance(res, int) and not isinstance(res, bool) else 0)
 
 
-def cpusequential(ncpunodes=cpunodes()):
-	"""Enumeration type of the logical CPUs: cross-nodes or sequential
+def pycontext(preload=None):
+	"""Multiprocessing context of the warm Python workers
 
-	The enumeration can be cross-nodes starting with one hardware thread per each
-	NUMA node, or sequential by enumerating all cores and hardware threads in each
-	NUMA node first.
-	For two hardware threads per a physical CPU core, where secondary HW threads
-	are taken in brackets:
-		Crossnodes enumeration, often used for the server CPUs
-		NUMA node0 CPU(s):     0,2(,4,6)		=> PU L#1 (P#4)
-		NUMA node1 CPU(s):     1,3(,5,7)
-		Sequential enumeration, often used for the laptop CPUs
-		NUMA node0 CPU(s):     0(,1),2(,3)		=> PU L#1 (P#1)  - indicates sequential
-		NUMA node1 CPU(s):     4(,5),6(,7)
-	ATTENTION: `hwloc` utility is required to detect the type of logical CPUs
-	enumeration:  `$ sudo apt-get install hwloc`
-	See details: http://www.admin-magazine.com/HPC/Articles/hwloc-Which-Processor-Is-Running-Your-Service
+	The workers are forked by the server process, which imports the preloaded
+	modules once, so the jobs omit the interpreter startup and the modules import.
 
-	ncpunodes  - the number of CPU nodes in the system to assume sequential
-		enumeration for multi-node systems only; >= 1
+	preload: list(str)  - names of the modules to be preloaded, the server is
+		started immediately if specified. The main module is requested to be preloaded
+		as well to avoid its execution (as __mp_main__) by each worker on start
+		where the forkserver supports it.
+		ATTENTION: the server is shared by all execution pools of the process,
+		so the modules should be specified before the first PyJob is started
 
-	return  - enumeration type of the logical CPUs, bool or None:
-		False  - cross-nodes
-		True  - sequential
+	return  - multiprocessing context of the workers, None if not supported
 	"""
-	# Fetch index of the second hardware thread / CPU core / CPU on the first NUMA node
-	res = subprocess.check_output(
-		[r"lstopo-no-graphics | sed -rn 's/\s+PU L#1 \(P#([0-9]+)\)/\1/p'"], shell=True)
+	if get_context is None:
+		return None
 	try:
-		return int(res) == 1
-	except ValueError as err:
-		# res is not a number, i.e. hwloc (lstopo*) is not installed
-		print('WARNING, "lstopo-no-graphics ("hwloc" utilities) call failed: {}'
-			', assuming that multi-node systems have nonsequential CPU enumeration.', err, file=sys.stderr)
-	return ncpunodes == 1
+		ctx = get_context('forkserver')
+	except ValueError:
+		return None  # The platform does not support forkserver
+	if preload:
+		preload = list(preload)
+		if '__main__' not in preload:
+			preload.append('__main__')
+		ctx.set_forkserver_preload(preload)
+		forkserver.ensure_running()
+	return ctx
+
+
+class PyProc(object):
+	"""Warm Python worker process of the PyJob having the subprocess.Popen-like interface"""
+	__slots__ = ('_proc', 'pid', 'returncode', 'stdout', 'stderr')
+
+	def __init__(self, ctx, func, fargs, fkwargs, workdir=None, outputs=(None, None), cpus=None, cgroup=None
+	, memnode=None):
+		"""Start the worker process
+
+		ctx  - multiprocessing context of the workers
+		func: callable  - the executing function, its int result is the exit code
+		fargs: tuple  - positional arguments of the function
+		fkwargs: dict  - keyword arguments of the function
+		workdir: str  - working directory or None
+		outputs: (str, str)  - paths of the stdout and stderr to be redirected to, None means inherited
+		cpus: set(int)  - logical CPUs to bind the process to or None
+		cgroup: JobCgroup  - cgroup of the job to join or None
+		memnode: int  - NUMA node to bind the memory allocations to or None
+		"""
+		self._proc = ctx.Process(target=_pyexec, args=(func, fargs, fkwargs, workdir, outputs, cpus, cgroup
+			, memnode))
+		self._proc.start()
+		self.pid = self._proc.pid
+		self.returncode = None
+		self.stdout = None
+		self.stderr = None
+
+	def poll(self):
+		"""Check whether the process is completed
+
+		return  - exit code or None if the process is running
+		"""
+		if self.returncode is None and not self._proc.is_alive():
+			self.returncode = self._proc.exitcode
+		return self.returncode
 
+	def wait(self, timeout=None):
+		"""Wait for the process completion
 
-class AffinityMask(object):
-	"""Affinity mask
+		return  - exit code or None if the process is running on timeout
+		"""
+		self._proc.join(timeout)
+		return self.poll()
 
-	Affinity table is a reduced CPU table by the non-primary HW treads in each core.
-	Typically, CPUs are enumerated across the nodes:
-	NUMA node0 CPU(s):     0,2,4,6,8,10,12,14,16,18,20,22,24,26,28,30
-	NUMA node1 CPU(s):     1,3,5,7,9,11,13,15,17,19,21,23,25,27,29,31
-	In case the number of HW threads per core is 2 then the physical CPU cores are 1 .. 15:
-	NUMA node0 CPU(s):     0,2,4,6,8,10,12,14	(16,18,20,22,24,26,28,30  - 2nd HW treads)
-	NUMA node1 CPU(s):     1,3,5,7,9,11,13,15	(17,19,21,23,25,27,29,31  - 2nd HW treads)
-	But the enumeration can be also sequential:
-	NUMA node0 CPU(s):     0,(1),2,(3),...
-	...
+	def communicate(self, timeout=None):
+		"""Wait for the process completion, the output is not piped"""
+		self.wait(timeout)
+		return None, None
 
-	Hardware threads share all levels of the CPU cache, physical CPU cores share only the
-	last level of the CPU cache (L2/3).
-	The number of worker processes in the pool should be equal to the:
-	- physical CPU cores for the cache L1/2 maximization
-	- NUMA nodes for the cache L2/3 maximization
+	def terminate(self):
+		"""Terminate the process by SIGTERM"""
+		self._proc.terminate()
 
-	NOTE: `hwloc` utility can be used to detect the type of logical CPUs enumeration:
-	`$ sudo apt-get install hwloc`
-	See details: http://www.admin-magazine.com/HPC/Articles/hwloc-Which-Processor-Is-Running-Your-Service
+	def kill(self):
+		"""Kill the process by SIGKILL"""
+		self._proc.kill()
 
-	# Doctests -----------------------------------------------------------------
-	# Mask for all sequential logical CPU having index #1
-	>>> AffinityMask(1, False, sequential=True)(1) == \
-		str(AffinityMask.CORE_THREADS if AffinityMask.NODES == 1 else AffinityMask.NODE_CPUS)
-	True
 
-	# Mask for the first cross-node logical CPU in the group #1
-	>>> AffinityMask(AffinityMask.CORE_THREADS, sequential=False)(1) == '1'
-	True
+class PyJob(Job):
+	"""Job executing a Python callable in the warm worker process
 
-	# Mask for all cross-node logical CPUs in the group #1
-	>>> AffinityMask(AffinityMask.CORE_THREADS, first=False, sequential=False)(1) == \
-		','.join([str(1 + c*(AffinityMask.CPUS // (AffinityMask.NODES * AffinityMask.CORE_THREADS))) \
-		for c in range(AffinityMask.CORE_THREADS)])
-	True
+	The worker process is forked by the server having the preloaded modules (see
+	pycontext()), which avoids the interpreter startup and the modules import.
+	The worker is a separate process, so the timeout, memory limit and affinity
+	are applied as for the other jobs.
+	NOTE: the callable and its arguments should be picklable, the stdout/stderr can
+	be redirected only to the files (PIPEs are not supported)
+	"""
+	def __init__(self, name, func, fargs=(), fkwargs=None, **kwargs):
+		"""Initialize the job
 
-	# Mask for all sequential logical CPUs in the group #1
-	>>> AffinityMask(AffinityMask.CORE_THREADS, False, sequential=True)(1) == \
-		'-'.join([str(1*(AffinityMask.CPUS // (AffinityMask.NODES * AffinityMask.CORE_THREADS)) + c) \
-		for c in range(AffinityMask.CORE_THREADS)])
-	True
+		name: str  - job name
+		func: callable  - the executing function (a module-level one to be picklable),
+			its int result is the exit code; an exception results in the exit code 1
+		fargs: tuple  - positional arguments of the function
+		fkwargs: dict  - keyword arguments of the function
+		kwargs  - other parameters of the Job except the args
+		"""
+		assert callable(func) and not kwargs.get('args'), (
+			'A callable is expected instead of the args, "{}" func: {}'.format(name, type(func).__name__))
+		super(PyJob, self).__init__(name, **kwargs)
+		for outp in (self.stdout, self.stderr):
+			if outp is subprocess.PIPE or not (outp is None or isinstance(outp, str)
+			or outp in (sys.stdout, sys.stderr)):
+				raise ValueError('Only files can be used as the output of the PyJob "{}": {}'.format(name, outp))
+		self.func = func
+		self.fargs = fargs
+		self.fkwargs = fkwargs if fkwargs is not None else {}
+
+
+class JobHistory(object):
+	"""Persistent history of the resource consumption by the completed jobs
+
+	The history is an append-only text file with a record per each completed job:
+	<category>\t<app>\t<size>\t<mem>\t<duration>\t<code>
+	where app is the executable name of the job, mem is the peak memory consumption
+	in GB (0 if not evaluated) and duration is the execution time in seconds.
+	The records are indexed by the category and application, and then by the job
+	size to predict the resource consumption of the subsequent jobs.
+
+	>>> JobHistory.appname(Job('tjob', args=('./exectime', '-o=t.rcp', '-n=tjob', './louvain', '-i=net.nsl')))
+	'louvain'
+	>>> jh = JobHistory()
+	>>> jh._update(('tcat', None), 2., 0.5, 10., 0)
+	>>> jh.estimate(Job('tjob', category='tcat', size=4)), jh.estimate(Job('tjob', category='tcat', size=1))
+	(1.0, None)
+	"""
+	_SEP = '\t'  # Values separator of the records
+	_WRAPPERS = frozenset(('exectime',))  # Wrappers executing the app specified after their options
 
-	# Mask for all cross-node logical CPU on the NUMA node #0
-	>>> AffinityMask(AffinityMask.CPUS // AffinityMask.NODES, False, sequential=False)(0) == \
-		','.join(['{}-{}'.format(c*(AffinityMask.CPUS // AffinityMask.CORE_THREADS) \
-		, (c+1)*(AffinityMask.CPUS // AffinityMask.CORE_THREADS) - 1) for c in range(AffinityMask.CORE_THREADS)])
-	True
+	def __init__(self, path=None):
+		"""Jobs history initialization, loads the existing records if any
 
-	# Mask for all sequential logical CPU on the NUMA node #0
-	>>> AffinityMask(AffinityMask.CPUS // AffinityMask.NODES, first=False, sequential=True)(0) == \
-		'0-{}'.format(AffinityMask.NODE_CPUS-1)
-	True
+		path: str  - path of the history file, created on the first record;
+			None means the in-memory history of the current execution
 
-	# Exception on too large input index
-	>>> AffinityMask(AffinityMask.CPUS // AffinityMask.NODES, False, sequential=False)(100000)
-	Traceback (most recent call last):
-	IndexError
+		Internal attributes:
+			_index: dict((category, app), (sizes: list(float), stats: dict(size, [mem, duration])))
+				- sorted sizes and the peak resource consumption per each size
+		"""
+		assert path is None or (isinstance(path, str) and path), 'Invalid path of the history: ' + str(path)
+		self.path = path
+		self._index = {}
+		if path is None or not os.path.isfile(path):
+			return
+		with open(path) as fhist:
+			for ln in fhist:
+				ln = ln.rstrip('\n')
+				if not ln or ln[0] == '#':
+					continue
+				try:
+					category, app, size, mem, duration, code = ln.split(self._SEP)
+					self._update((category or None, app or None), float(size), float(mem)
+						, float(duration), int(code))
+				except ValueError as err:
+					print('WARNING, invalid record of the jobs history "{}" is skipped: {}'.format(
+						path, err), file=sys.stderr)
 
-	# Exception on float afnstep
-	>>> AffinityMask(2.1, False)(1)
-	Traceback (most recent call last):
-	AssertionError
 
-	# Exception on afnstep not multiple to the CORE_THREADS
-	>>> AffinityMask(AffinityMask.CORE_THREADS + 1, False)(0)
-	Traceback (most recent call last):
-	AssertionError
-	"""
-	# Logical CPUs: all hardware threads in all physical CPU cores in all physical CPUs in all NUMA nodes
-	CPUS = cpu_count()
-	NODES = cpunodes()  # NUMA nodes (typically, physical CPUs)
-	CORE_THREADS = cpucorethreads()  # Hardware threads per CPU core
-	SEQUENTIAL = cpusequential(NODES)  # Sequential enumeration of the logical CPUs or cross-node enumeration
-
-	CORES = CPUS//CORE_THREADS  # Total number of physical CPU cores
-	NODE_CPUS = CPUS//NODES  # Logical CPUs per each NUMA node
-	#CPU_CORES = NODE_CPUS//CORE_THREADS  # The number of physical cores in each CPU
-	if NODE_CPUS*NODES != CPUS or CORES*CORE_THREADS != CPUS:
-		raise ValueError('Only uniform NUMA nodes are supported:'
-			'  CORE_THREADS: {}, CORES: {}, NODE_CPUS: {}, NODES: {}, CPUS: {}'
-			.format(CORE_THREADS, CORES, NODE_CPUS, NODES, CPUS))
-
-	def __init__(self, afnstep, first=True, sequential=SEQUENTIAL):
-		"""Affinity mask initialization
+	@staticmethod
+	def appname(job):
+		"""Application name of the job
 
-		afnstep: int  - affinity step, integer if applied, allowed values:
-			1, CORE_THREADS * n,  n E {1, 2, ... CPUS / (NODES * CORE_THREADS)}
+		job: Job  - the job
 
-			Used to bind worker processes to the logical CPUs to have warm cache and,
-			optionally, maximize cache size per a worker process.
-			Groups of logical CPUs are selected in a way to maximize the cache locality:
-			the single physical CPU is used taking all its hardware threads in each core
-			before allocating another core.
+		return  app: str  - executable name of the job or None, the wrapped executable for the known wrappers
+		"""
+		if isinstance(job, PyJob):
+			return '.'.join((getattr(job.func, '__module__', None) or '', getattr(job.func, '__name__', '')))
+		if not job.args:
+			return None
+		app = os.path.split(job.args[0])[1]
+		if app in JobHistory._WRAPPERS:
+			# The wrapped executable follows the options of the wrapper
+			for arg in job.args[1:]:
+				if not arg.startswith('-'):
+					return os.path.split(arg)[1]
+		return app
+
+
+	def _update(self, key, size, mem, duration, code):
+		"""Update the index with the record
+
+		key: (category, app)  - key of the record
+		size: float  - size of the job
+		mem: float  - peak memory consumption in GB
+		duration: float  - execution time in seconds
+		code: int  - exit code of the job
+		"""
+		sizes, stats = self._index.setdefault(key, ([], {}))
+		st = stats.get(size)
+		if st is None:
+			bisect.insort(sizes, size)
+			# Note: the duration is meaningful only for the successfully completed jobs
+			stats[size] = [mem, None if code else duration]
+			return
+		if st[0] < mem:
+			st[0] = mem
+		if not code and (st[1] is None or st[1] < duration):
+			st[1] = duration
 
-			Typical Values:
-			1  - maximize parallelization for the single-threaded apps
-				(the number of worker processes = logical CPUs)
-			CORE_THREADS  - maximize the dedicated CPU cache L1/2
-				(the number of worker processes = physical CPU cores)
-			CPUS / NODES  - maximize the dedicated CPU cache L3
-				(the number of worker processes = physical CPUs)
-		first  - mask the first logical unit or all units in the selected group.
-			One unit per the group maximizes the dedicated CPU cache for the
-			single-threaded worker, all units should be used for the multi-threaded
-			apps.
-		sequential  - sequential or cross nodes enumeration of the CPUs in the NUMA nodes:
-			None  - undefined, interpreted as cross-nodes (the most widely used on servers)
-			False  - cross-nodes
-			True  - sequential
 
-			For two hardware threads per a physical CPU core, where secondary HW threads
-			are taken in brackets:
-			Crossnodes enumeration, often used for the server CPUs
-			NUMA node0 CPU(s):     0,2(,4,6)
-			NUMA node1 CPU(s):     1,3(,5,7)
-			Sequential enumeration, often used for the laptop CPUs
-			NUMA node0 CPU(s):     0(,1),2(,3)
-			NUMA node1 CPU(s):     4(,5),6(,7)
-		"""
-		assert ((afnstep == 1 or (afnstep >= self.CORE_THREADS
-			and not afnstep % self.CORE_THREADS)) and isinstance(first, bool)
-			and (sequential is None or isinstance(sequential, bool))
-			), ('Arguments are invalid:  afnstep: {}, first: {}, sequential: {}'
-			.format(afnstep, first, sequential))
-		self.afnstep = int(afnstep)  # To convert 2.0 to 2
-		self.first = first
-		self.sequential = sequential
+	def predict(self, job):
+		"""Predict resource consumption of the job
 
+		The values of the job having the same category, application and the largest
+		size not exceeding the size of the specified job are taken as the least
+		expected values.
 
-	def __call__(self, i):
-		"""Evaluate CPUs affinity mask for the specified group index of the size afnstep
+		job: Job  - the job to be evaluated
 
-		i  - index of the selecting group of logical CPUs
-		return  - mask of the first or all logical CPUs
+		return  mem: float, duration: float  - expected peak memory consumption in GB
+			and execution time in seconds, None if unknown
 		"""
-		if i < 0 or (i + 1) * self.afnstep > self.CPUS:
-			raise IndexError('Index is out of range for the given affinity step:'
-				'  i: {}, afnstep: {}, cpus: {} vs {} (afnstep * (i+1))'
-				.format(i, self.afnstep, self.CPUS, i * self.afnstep))
+		size, st = self._nearest(job)
+		if size is None:
+			return None, None
+		return tuple(st)
+
+
+	def estimate(self, job):
+		"""Estimate the peak memory consumption of the job
+
+		The peak memory of the job having the same category, application and the largest
+		size not exceeding the size of the specified job is scaled linearly to the job size,
+		which overestimates the memory of the jobs having the sublinear memory complexity.
+
+		job: Job  - the job to be evaluated
+
+		return  mem: float  - expected peak memory consumption in GB, None if unknown
+		"""
+		size, st = self._nearest(job)
+		if size is None or not st[0]:
+			return None
+		jsize = getattr(job, 'size', 0)
+		return st[0] if not size or jsize <= size else st[0] * jsize / size
+
+
+	def _nearest(self, job):
+		"""Statistics of the job having the same category, application and the largest
+		size not exceeding the size of the specified job
+
+		job: Job  - the job to be evaluated
+
+		return  size: float, stats: [mem, duration]  - the size and statistics, (None, None) if not exist
+		"""
+		ist = self._index.get((getattr(job, 'category', None), self.appname(job)))
+		if ist is None:
+			return None, None
+		sizes, stats = ist
+		i = bisect.bisect_right(sizes, getattr(job, 'size', 0))
+		if not i:
+			return None, None
+		return sizes[i - 1], stats[sizes[i - 1]]
+
+
+	def add(self, job):
+		"""Persist the resource consumption of the completed job
+
+		job: Job  - the completed job having the process
+		"""
+		assert job.proc is not None and job.tstart is not None and job.tstop is not None, (
+			'A completed job is expected: ' + job.name)
+		category = getattr(job, 'category', None)
+		app = self.appname(job)
+		size = float(getattr(job, 'size', 0))
+		mem = getattr(job, '_mempeak', 0.)
+		duration = job.tstop - job.tstart
+		code = job.proc.returncode if job.proc.returncode is not None else -1
+		self._update((category, app), size, mem, duration, code)
+		if self.path is None:
+			return
+		basedir = os.path.split(self.path)[0]
+		# Note: the file is reopened on each record to retain the history on crashes
+		try:
+			if basedir and not os.path.exists(basedir):
+				os.makedirs(basedir)
+			with open(self.path, 'a') as fhist:
+				fhist.write(self._SEP.join(('' if category is None else str(category), app or ''
+					, repr(size), '{:.6f}'.format(mem), '{:.4f}'.format(duration), str(code))) + '\n')
+		except (IOError, OSError) as err:
+			print('ERROR, the jobs history "{}" can not be extended with "{}": {}'.format(
+				self.path, job.name, err), file=sys.stderr)
+
+
+class JobJournal(object):
+	"""Append-only journal of the jobs execution to resume the interrupted execution
+
+	The journal is a text file with a record per each event of the job:
+	<event>\t<timestamp>\t<name>\t<value>\t<duration>
+	where event is Q (queued), S (started, value is the pid) or D (done, value is the
+	exit code, 0 only for the graceful completion), timestamp is the wall-clock time.
+	The jobs are identified by their names qualified with the names of the owner tasks
+	(see key()), which should be unique. The successfully completed jobs are loaded on
+	the journal opening to be skipped on the rescheduling.
+
+	>>> import tempfile
+	>>> jnl = JobJournal(os.path.join(tempfile.mkdtemp(), 'tpool.jnl'))
+	>>> jnl.write('Q', 'tjob'); jnl.write('D', 'tjob', 0, 1.5); jnl.close()
+	>>> JobJournal(jnl.path).done
+	{'tjob'}
+	>>> JobJournal.key(Job('tjob', task=Task('tnet', task=Task('tapp'))))
+	'tapp/tnet/tjob'
+	"""
+	_SEP = '\t'  # Values separator of the records
+	_KEYSEP = '/'  # Separator of the task names in the job key
+
+	def __init__(self, path):
+		"""Journal initialization, loads the successfully completed jobs if any
+
+		path: str  - path of the journal file, created on the first record
+
+		Attributes:
+			done: set(str)  - names of the successfully completed jobs
+		"""
+		assert isinstance(path, str) and path, 'Invalid path of the journal: ' + str(path)
+		self.path = path
+		self.done = set()
+		self._fjnl = None  # Journal file opened on the first record
+		if not os.path.isfile(path):
+			return
+		with open(path) as fjnl:
+			for ln in fjnl:
+				rec = ln.rstrip('\n').split(self._SEP)
+				if len(rec) < 4 or rec[0] != 'D':
+					continue
+				try:
+					if int(rec[3]):
+						self.done.discard(rec[2])
+					else:
+						self.done.add(rec[2])
+				except ValueError as err:
+					print('WARNING, invalid record of the jobs journal "{}" is skipped: {}'.format(
+						path, err), file=sys.stderr)
+
+
+	@staticmethod
+	def key(job):
+		"""Journal key of the job, its name qualified with the names of the owner tasks
+
+		The jobs of distinct tasks (e.g. the same algorithm on distinct networks) might
+		have the same names and are distinguished by the owner tasks.
+
+		job: Job  - the job
+
+		return  key: str  - the job name prefixed with the owner task names from the root
+		"""
+		names = [job.name]
+		task = job.task
+		while task is not None:
+			names.append(task.name)
+			task = task.task
+		return JobJournal._KEYSEP.join(reversed(names))
+
+
+	def write(self, event, name, value='', duration=None):
+		"""Append the record to the journal
+
+		event: str  - event of the job: Q, S or D
+		name: str  - journal key of the job, see key()
+		value  - pid for the S event, exit code for the D event
+		duration: float  - execution time in seconds for the D event
+		"""
+		try:
+			if self._fjnl is None:
+				basedir = os.path.split(self.path)[0]
+				if basedir and not os.path.exists(basedir):
+					os.makedirs(basedir)
+				self._fjnl = open(self.path, 'a')
+			self._fjnl.write(self._SEP.join((event, '{:.3f}'.format(time.time()), name, str(value)
+				, '' if duration is None else '{:.4f}'.format(duration))) + '\n')
+			# Note: the queuing records are not flushed, they are restored by the rescheduling
+			if event != 'Q':
+				self._fjnl.flush()
+		except (IOError, OSError) as err:
+			print('ERROR, the jobs journal "{}" can not be extended with "{}": {}'.format(
+				self.path, name, err), file=sys.stderr)
+
+
+	def close(self):
+		"""Close the journal file"""
+		if self._fjnl is not None:
+			self._fjnl.close()
+			self._fjnl = None
+
+
+class JobQueue(object):
+	"""Queue of the non-started jobs ordered by the workers limit
+
+	The jobs having larger workers limit (lighter jobs) are started first, the jobs
+	having the same workers limit are started in the scheduling order except the
+	priority jobs, which are started before the others.
+	The queue is a binary heap with lazy removal and the jobs index by category,
+	so the next job is fetched in O(log n) and the jobs of the category
+	are selected without the queue traversing.
+
+	>>> jq = JobQueue()
+	>>> jq.push(Job('a'), 2); jq.push(Job('b'), 3); jq.push(Job('c'), 2, True)
+	>>> [j.name for j in jq]
+	['b', 'c', 'a']
+	>>> jq.pop().name, len(jq)
+	('b', 2)
+	>>> jq.extend(((Job('d'), 2), (Job('e'), 3))); [j.name for j in jq]
+	['e', 'c', 'a', 'd']
+	"""
+	__slots__ = ('_heap', '_ents', '_cats', '_seq', '_pseq', '_uid', '_stale')
+
+	def __init__(self):
+		"""Queue initialization
+
+		Internal attributes:
+			_heap: list([wkey, seq, sub, uid, job])  - heap of the entries, where wkey is
+				the negated workers limit, seq is the scheduling sequence number (negative
+				for the priority jobs), sub is the ordering of the jobs relocated before
+				the job with the same seq and uid is a unique tie breaker;
+				job is None for the removed entries
+			_ents: dict(Job, list)  - entries of the queued jobs
+			_cats: dict(category, set(Job))  - queued jobs by category
+			_stale: int  - the number of the removed entries remained in the heap
+		"""
+		self._heap = []
+		self._ents = {}
+		self._cats = {}
+		self._seq = itertools.count(1)
+		self._pseq = itertools.count(1)
+		self._uid = itertools.count()
+		self._stale = 0
+
+
+	def __len__(self):
+		return len(self._ents)
+
+
+	def __bool__(self):
+		return bool(self._ents)
+
+	__nonzero__ = __bool__  # Python2 compatibility
+
+
+	def __iter__(self):
+		"""Jobs in the order of their starting, O(n log n)"""
+		return (ent[-1] for ent in sorted(self._heap) if ent[-1] is not None)
+
+
+	def __contains__(self, job):
+		return job in self._ents
+
+
+	def snapshot(self):
+		"""Snapshot of the jobs to be queried in the order of their starting by another thread
+
+		The heap is copied in O(n) without the ordering, which is performed lazily on the query.
+
+		return  QueueView  - the snapshot of the scheduled jobs
+		"""
+		return QueueView(list(self._heap))
+
+
+	def push(self, job, wkslim=0, priority=False):
+		"""Schedule the job
+
+		job: Job  - the scheduling job
+		wkslim: int  - workers limit of the job, the jobs with larger limit are started first
+		priority: bool  - start the job before the scheduled jobs having the same wkslim
+		"""
+		assert job not in self._ents, 'The job "{}" is already scheduled'.format(job.name)
+		self.__add(job, [-(wkslim or 0), -next(self._pseq) if priority else next(self._seq)
+			, 0, next(self._uid), job])
+
+
+	def extend(self, jobs):
+		"""Schedule the jobs in the specified order rebuilding the heap once
+
+		jobs: iterable((Job, int))  - the scheduling jobs with their workers limits
+		"""
+		heap = self._heap
+		ents = self._ents
+		for job, wkslim in jobs:
+			assert job not in ents, 'The job "{}" is already scheduled'.format(job.name)
+			ent = [-(wkslim or 0), next(self._seq), 0, next(self._uid), job]
+			heap.append(ent)
+			ents[job] = ent
+			category = getattr(job, 'category', None)
+			if category is not None:
+				self._cats.setdefault(category, set()).add(job)
+		heapq.heapify(heap)
+
+
+	def relocate(self, job, wkslim, before=None):
+		"""Update workers limit of the scheduled job changing its position
+
+		job: Job  - the scheduled job
+		wkslim: int  - new workers limit of the job
+		before: Job  - the scheduled job to locate the relocating job directly before it
+			if both have the same wkslim, otherwise the scheduling order is retained
+		"""
+		ent = self.__remove(job)
+		bent = None if before is None else self._ents.get(before)
+		if bent is not None and bent[0] == -(wkslim or 0):
+			self.__add(job, [bent[0], bent[1], bent[2] - 1, next(self._uid), job])
+		else:
+			self.__add(job, [-(wkslim or 0), ent[1], ent[2], next(self._uid), job])
+
+
+	def head(self, num):
+		"""The first jobs to be started
+
+		The heap is walked lazily from its root expanding only the children of
+		the fetched entries, so O(k log k) is taken for k fetched and removed entries.
+
+		num: int  - the max number of the fetching jobs
+
+		return  list(Job)  - the jobs in the order of their starting
+		"""
+		heap = self._heap
+		res = []
+		if num <= 0 or not heap:
+			return res
+		hsize = len(heap)
+		front = [(heap[0], 0)]  # Entries bordering the walked part of the heap with their indexes
+		while front and len(res) < num:
+			ent, i = heapq.heappop(front)
+			if ent[-1] is not None:
+				res.append(ent[-1])
+			for ic in (2 * i + 1, 2 * i + 2):
+				if ic < hsize:
+					heapq.heappush(front, (heap[ic], ic))
+		return res
+
+
+	def ahead(self, job, other):
+		"""Whether the scheduled job is started before the other scheduled job"""
+		return self._ents[job] < self._ents[other]
+
+
+	def peek(self):
+		"""The next job to be started or None"""
+		heap = self._heap
+		while heap and heap[0][-1] is None:
+			heapq.heappop(heap)
+			self._stale -= 1
+		return heap[0][-1] if heap else None
+
+
+	def pop(self):
+		"""Fetch the next job to be started
+
+		return  job: Job  - the fetched job
+
+		Raises:
+			IndexError: the queue is empty
+		"""
+		job = self.peek()
+		if job is None:
+			raise IndexError('pop from an empty job queue')
+		heapq.heappop(self._heap)
+		del self._ents[job]
+		self.__uncategorize(job)
+		return job
+
+
+	def remove(self, job):
+		"""Remove the scheduled job
+
+		job: Job  - the scheduled job
+		"""
+		self.__remove(job)
+
+
+	def category(self, category):
+		"""Scheduled jobs of the category in the order of their starting
+
+		category  - category of the jobs
+
+		return  list(Job)  - the scheduled jobs of the category
+		"""
+		jobs = self._cats.get(category)
+		if not jobs:
+			return []
+		return sorted(jobs, key=self._ents.__getitem__)
+
+
+	def categories(self):
+		"""The number of the scheduled jobs per category
+
+		return  dict(category, int)  - the number of the scheduled jobs by their category
+		"""
+		return {cat: len(jobs) for cat, jobs in viewitems(self._cats)}
+
+
+	def clear(self):
+		"""Remove all the scheduled jobs"""
+		del self._heap[:]
+		self._ents.clear()
+		self._cats.clear()
+		self._stale = 0
+
+
+	def __add(self, job, ent):
+		"""Add the heap entry of the job"""
+		heapq.heappush(self._heap, ent)
+		self._ents[job] = ent
+		category = getattr(job, 'category', None)
+		if category is not None:
+			self._cats.setdefault(category, set()).add(job)
+
+
+	def __remove(self, job):
+		"""Remove the job marking its heap entry as stale
+
+		return  ent: list  - the removed entry
+		"""
+		ent = self._ents.pop(job)
+		ent[-1] = None
+		self.__uncategorize(job)
+		self._stale += 1
+		# Compact the heap when most of the entries are stale
+		if self._stale > len(self._ents) and self._stale >= 64:
+			self._heap = [e for e in self._heap if e[-1] is not None]
+			heapq.heapify(self._heap)
+			self._stale = 0
+		return ent
+
+
+	def __uncategorize(self, job):
+		"""Remove the job from the category index"""
+		category = getattr(job, 'category', None)
+		if category is not None:
+			jobs = self._cats[category]
+			jobs.discard(job)
+			if not jobs:
+				del self._cats[category]
+
+
+def ramfracs(fracsize):
+	"""Evaluate the minimal number of RAM fractions of the specified size in GB
+
+	Used to estimate the reasonable number of processes with the specified minimal
+	dedicated RAM.
+
+	fracsize  - minimal size of each fraction in GB, can be a fractional number
+	return the minimal number of RAM fractions having the specified size in GB
+	"""
+	return int(_RAM_SIZE / fracsize)
+
+
+_SYSCPU = '/sys/devices/system/cpu/'  # Logical CPUs topology in the sysfs
+_SYSNODE = '/sys/devices/system/node/'  # NUMA nodes in the sysfs
+_cputopo = {}  # Lazily evaluated CPU topology:  {property: value}
+
+
+def _syscpus(path):
+	"""Logical CPUs listed in the sysfs file
+
+	path: str  - path of the sysfs file having the list of CPUs like "0-3,8"
+
+	return  set(int)  - logical CPUs or None if the file is not available
+	"""
+	try:
+		with open(path) as fcpus:
+			return cpumaskset(fcpus.read().strip())
+	except (IOError, OSError, ValueError):
+		return None
+
+
+def cpucorethreads():
+	"""The number of hardware treads per a CPU core
+
+	Used to specify CPU affinity dedicating the maximal amount of CPU cache L1/2.
+	The value is read from the sysfs once on the first call.
+	"""
+	threads = _cputopo.get('corethreads')
+	if threads is None:
+		cpus = _syscpus(_SYSCPU + 'cpu0/topology/thread_siblings_list')
+		threads = _cputopo.setdefault('corethreads', len(cpus) if cpus else 1)
+	return threads
+
+
+def cpunodes():
+	"""The number of NUMA nodes, where physical CPUs are located.
+
+	Used to evaluate CPU index from the affinity table index considering the
+	NUMA architecture.
+	Usually NUMA nodes = physical CPUs.
+	The value is read from the sysfs once on the first call.
+	"""
+	nodes = _cputopo.get('nodes')
+	if nodes is None:
+		try:
+			nodes = sum(1 for name in os.listdir(_SYSNODE) if name.startswith('node') and name[4:].isdigit())
+		except OSError:
+			nodes = 0  # The kernel does not support NUMA
+		nodes = _cputopo.setdefault('nodes', max(nodes, 1))
+	return nodes
+
+
+def cpusequential(ncpunodes=None):
+	"""Enumeration type of the logical CPUs: cross-nodes or sequential
+
+	The enumeration can be cross-nodes starting with one hardware thread per each
+	NUMA node, or sequential by enumerating all cores and hardware threads in each
+	NUMA node first.
+	For two hardware threads per a physical CPU core, where secondary HW threads
+	are taken in brackets:
+		Crossnodes enumeration, often used for the server CPUs
+		NUMA node0 CPU(s):     0,2(,4,6)		=> PU L#1 (P#4)
+		NUMA node1 CPU(s):     1,3(,5,7)
+		Sequential enumeration, often used for the laptop CPUs
+		NUMA node0 CPU(s):     0(,1),2(,3)		=> PU L#1 (P#1)  - indicates sequential
+		NUMA node1 CPU(s):     4(,5),6(,7)
+	The type is identified by the second logical CPU in the topology order (PU L#1 in
+	terms of hwloc), which is read from the sysfs once on the first call.
+
+	ncpunodes  - the number of CPU nodes in the system to assume sequential
+		enumeration for multi-node systems only if the topology is not available; >= 1,
+		None means cpunodes()
+
+	return  - enumeration type of the logical CPUs, bool or None:
+		False  - cross-nodes
+		True  - sequential
+	"""
+	seq = _cputopo.get('sequential')
+	if seq is None:
+		# The second hardware thread of the first core or the first hardware thread
+		# of the second core on the first NUMA node
+		cpus = _syscpus(_SYSCPU + 'cpu0/topology/thread_siblings_list')
+		if not cpus or len(cpus) < 2:
+			cpus = _syscpus(_SYSNODE + 'node0/cpulist') or _syscpus(_SYSCPU + 'online')
+		if cpus and len(cpus) >= 2:
+			seq = sorted(cpus)[1] == 1
+		else:
+			seq = (ncpunodes if ncpunodes is not None else cpunodes()) == 1
+		seq = _cputopo.setdefault('sequential', seq)
+	return seq
+
+
+class QueueView(object):
+	"""Snapshot of the jobs queue to be queried by another thread
+
+	The jobs are ordered and indexed by their properties lazily on the first query
+	requiring them, so the subsequent queries of the snapshot are evaluated on the
+	indexes instead of each queued job.
+	NOTE: the jobs removed from the queue after the snapshot (not started) are omitted
+
+	>>> from mpewui import UiResFilterVal
+	>>> jq = JobQueue(); jq.extend(((Job('a', category='x'), 0), (Job('b', category='y'), 0), (Job('c', category='x'), 1)))
+	>>> jqv = jq.snapshot(); [j.name for j in jqv()]
+	['c', 'a', 'b']
+	>>> [j.name for j in jqv.select({'category': UiResFilterVal(beg='x', end=None, opt=False)})]
+	['c', 'a']
+	>>> [j.name for j in jqv.select({'name': UiResFilterVal(beg='b', end='z', opt=False), 'memsize': None})]
+	['c', 'b']
+	>>> [j.name for j in jqv.select({'pid': None})]
+	[]
+	"""
+	__slots__ = ('_heap', '_order', '_index')
+	# Properties of the JobInfo that are None for the non-started jobs
+	_STARTPROPS = frozenset(('pid', 'code', 'tstart', 'tstop', 'duration'))
+
+	def __init__(self, heap):
+		"""Snapshot initialization
+
+		heap: list  - copy of the heap entries of the JobQueue
+
+		Internal attributes:
+			_order: list  - the heap entries in the order of the jobs starting
+			_index: dict(prop: str, dict(val, list(int)))  - positions of the entries in _order
+				by the values of the job properties: name, task (name), category and started (bool)
+		"""
+		self._heap = heap
+		self._order = None
+		self._index = {}
+
+
+	def __call__(self):
+		"""Jobs in the order of their starting"""
+		return (ent[-1] for ent in self.__ordered() if ent[-1] is not None)
+
+
+	def select(self, objflt=None, tasked=False):
+		"""Jobs in the order of their starting preselected by the filter on the indexed properties
+
+		The preselected jobs should be filtered by infodata() since the non-indexed properties
+		are not evaluated. The properties of the started jobs are defined only for the
+		restarting jobs.
+
+		objflt: dict(str, UiResFilterVal)  - objects filter
+		tasked: bool  - select only the jobs assigned to tasks
+		return  iterable(Job)  - the preselected jobs
+		"""
+		order = self.__ordered()
+		cands = None  # Positions of the candidate jobs, None means any
+		for prop, pcon in viewitems(objflt or {}):
+			if prop in self._STARTPROPS:
+				poss = self.__indexed('started').get(True, ())
+			elif prop in ('name', 'task', 'category'):
+				poss = self.__lookup(prop, pcon)
+				if poss is None:
+					continue
+			else:
+				continue
+			cands = set(poss) if cands is None else cands.intersection(poss)
+		if tasked:
+			poss = self.__lookup('task', None)
+			cands = set(poss) if cands is None else cands.intersection(poss)
+		if cands is None:
+			return (ent[-1] for ent in order if ent[-1] is not None)
+		return (order[i][-1] for i in sorted(cands) if order[i][-1] is not None)
+
+
+	def __ordered(self):
+		"""The heap entries in the order of the jobs starting"""
+		order = self._order
+		if order is None:
+			# Note: concurrent queries might order the snapshot simultaneously yielding the same result
+			order = sorted(self._heap)
+			self._order = order
+		return order
+
+
+	def __indexed(self, prop):
+		"""Index of the entries positions by the values of the job property
+
+		prop: str  - the job property: name, task, category or started
+		return  dict(val, list(int))  - ascending positions of the entries in the order of starting by the values
+		"""
+		index = self._index.get(prop)
+		if index is None:
+			index = {}
+			for i, ent in enumerate(self.__ordered()):
+				job = ent[-1]
+				if job is None:
+					continue
+				if prop == 'task':
+					val = None if job.task is None else job.task.name
+				elif prop == 'started':
+					val = job.tstart is not None
+				else:
+					val = getattr(job, prop, None)
+				index.setdefault(val, []).append(i)
+			self._index[prop] = index
+		return index
+
+
+	def __lookup(self, prop, pcon):
+		"""Positions of the entries satisfying the filter of the indexed property
+
+		prop: str  - the indexed property
+		pcon: UiResFilterVal  - the property constraint, None means any non-None value
+		return  iterable(int)  - positions of the entries, None if any entry can satisfy the constraint
+		"""
+		if pcon is not None and pcon.opt:
+			return None
+		index = self.__indexed(prop)
+		if pcon is not None and pcon.end is None:
+			return index.get(pcon.beg, ())
+		try:
+			return list(itertools.chain.from_iterable(poss for val, poss in viewitems(index) if val is not None
+				and (pcon is None or pcon.beg <= val < pcon.end)))
+		except TypeError:  # Incomparable types of the values, which are evaluated by infodata()
+			return None
+
+
+class _CpuTopology(type):
+	"""CPU topology properties of the AffinityMask evaluated lazily on the first access"""
+	@property
+	def CPUS(cls):  #pylint: disable=C0103
+		"""Logical CPUs: all hardware threads in all physical CPU cores in all physical CPUs in all NUMA nodes"""
+		return cpu_count()
+
+	@property
+	def NODES(cls):  #pylint: disable=C0103
+		"""NUMA nodes (typically, physical CPUs)"""
+		cls._validate()
+		return cpunodes()
+
+	@property
+	def CORE_THREADS(cls):  #pylint: disable=C0103
+		"""Hardware threads per CPU core"""
+		cls._validate()
+		return cpucorethreads()
+
+	@property
+	def SEQUENTIAL(cls):  #pylint: disable=C0103
+		"""Sequential enumeration of the logical CPUs or cross-node enumeration"""
+		return cpusequential()
+
+	@property
+	def CORES(cls):  #pylint: disable=C0103
+		"""Total number of physical CPU cores"""
+		return cls.CPUS // cls.CORE_THREADS
+
+	@property
+	def NODE_CPUS(cls):  #pylint: disable=C0103
+		"""Logical CPUs per each NUMA node"""
+		return cls.CPUS // cls.NODES
+
+	@staticmethod
+	def _validate():
+		"""Validate uniformity of the NUMA nodes once"""
+		if _cputopo.get('uniform'):
+			return
+		cpus = cpu_count()
+		nodes = cpunodes()
+		threads = cpucorethreads()
+		if cpus // nodes * nodes != cpus or cpus // threads * threads != cpus:
+			raise ValueError('Only uniform NUMA nodes are supported:'
+				'  CORE_THREADS: {}, CORES: {}, NODE_CPUS: {}, NODES: {}, CPUS: {}'
+				.format(threads, cpus // threads, cpus // nodes, nodes, cpus))
+		_cputopo['uniform'] = True
+
+
+class AffinityMask(_CpuTopology('AffinityMaskBase', (object,), {})):
+	"""Affinity mask
+
+	Affinity table is a reduced CPU table by the non-primary HW treads in each core.
+	Typically, CPUs are enumerated across the nodes:
+	NUMA node0 CPU(s):     0,2,4,6,8,10,12,14,16,18,20,22,24,26,28,30
+	NUMA node1 CPU(s):     1,3,5,7,9,11,13,15,17,19,21,23,25,27,29,31
+	In case the number of HW threads per core is 2 then the physical CPU cores are 1 .. 15:
+	NUMA node0 CPU(s):     0,2,4,6,8,10,12,14	(16,18,20,22,24,26,28,30  - 2nd HW treads)
+	NUMA node1 CPU(s):     1,3,5,7,9,11,13,15	(17,19,21,23,25,27,29,31  - 2nd HW treads)
+	But the enumeration can be also sequential:
+	NUMA node0 CPU(s):     0,(1),2,(3),...
+	...
+
+	Hardware threads share all levels of the CPU cache, physical CPU cores share only the
+	last level of the CPU cache (L2/3).
+	The number of worker processes in the pool should be equal to the:
+	- physical CPU cores for the cache L1/2 maximization
+	- NUMA nodes for the cache L2/3 maximization
+
+	NOTE: `hwloc` utility can be used to detect the type of logical CPUs enumeration:
+	`$ sudo apt-get install hwloc`
+	See details: http://www.admin-magazine.com/HPC/Articles/hwloc-Which-Processor-Is-Running-Your-Service
+
+	# Doctests -----------------------------------------------------------------
+	# Mask for all sequential logical CPU having index #1
+	>>> AffinityMask(1, False, sequential=True)(1) == \
+		str(AffinityMask.CORE_THREADS if AffinityMask.NODES == 1 else AffinityMask.NODE_CPUS)
+	True
+
+	# Mask for the first cross-node logical CPU in the group #1
+	>>> AffinityMask(AffinityMask.CORE_THREADS, sequential=False)(1) == '1'
+	True
+
+	# Mask for all cross-node logical CPUs in the group #1
+	>>> AffinityMask(AffinityMask.CORE_THREADS, first=False, sequential=False)(1) == \
+		','.join([str(1 + c*(AffinityMask.CPUS // (AffinityMask.NODES * AffinityMask.CORE_THREADS))) \
+		for c in range(AffinityMask.CORE_THREADS)])
+	True
+
+	# Mask for all sequential logical CPUs in the group #1
+	>>> AffinityMask(AffinityMask.CORE_THREADS, False, sequential=True)(1) == \
+		'-'.join([str(1*(AffinityMask.CPUS // (AffinityMask.NODES * AffinityMask.CORE_THREADS)) + c) \
+		for c in range(AffinityMask.CORE_THREADS)])
+	True
+
+	# Mask for all cross-node logical CPU on the NUMA node #0
+	>>> AffinityMask(AffinityMask.CPUS // AffinityMask.NODES, False, sequential=False)(0) == \
+		','.join(['{}-{}'.format(c*(AffinityMask.CPUS // AffinityMask.CORE_THREADS) \
+		, (c+1)*(AffinityMask.CPUS // AffinityMask.CORE_THREADS) - 1) for c in range(AffinityMask.CORE_THREADS)])
+	True
+
+	# Mask for all sequential logical CPU on the NUMA node #0
+	>>> AffinityMask(AffinityMask.CPUS // AffinityMask.NODES, first=False, sequential=True)(0) == \
+		'0-{}'.format(AffinityMask.NODE_CPUS-1)
+	True
+
+	# Exception on too large input index
+	>>> AffinityMask(AffinityMask.CPUS // AffinityMask.NODES, False, sequential=False)(100000)
+	Traceback (most recent call last):
+	IndexError
+
+	# Exception on float afnstep
+	>>> AffinityMask(2.1, False)(1)
+	Traceback (most recent call last):
+	AssertionError
+
+	# Exception on afnstep not multiple to the CORE_THREADS
+	>>> AffinityMask(AffinityMask.CORE_THREADS + 1, False)(0)
+	Traceback (most recent call last):
+	AssertionError
+	"""
+	# Note: the CPU topology is evaluated lazily on the first access to avoid
+	# its detection on the module import, the class properties are provided by _CpuTopology
+	CPUS = property(lambda self: type(self).CPUS)
+	NODES = property(lambda self: type(self).NODES)
+	CORE_THREADS = property(lambda self: type(self).CORE_THREADS)
+	SEQUENTIAL = property(lambda self: type(self).SEQUENTIAL)
+	CORES = property(lambda self: type(self).CORES)
+	NODE_CPUS = property(lambda self: type(self).NODE_CPUS)
+
+	def __init__(self, afnstep, first=True, sequential=cpusequential):
+		"""Affinity mask initialization
+
+		afnstep: int  - affinity step, integer if applied, allowed values:
+			1, CORE_THREADS * n,  n E {1, 2, ... CPUS / (NODES * CORE_THREADS)}
+
+			Used to bind worker processes to the logical CPUs to have warm cache and,
+			optionally, maximize cache size per a worker process.
+			Groups of logical CPUs are selected in a way to maximize the cache locality:
+			the single physical CPU is used taking all its hardware threads in each core
+			before allocating another core.
+
+			Typical Values:
+			1  - maximize parallelization for the single-threaded apps
+				(the number of worker processes = logical CPUs)
+			CORE_THREADS  - maximize the dedicated CPU cache L1/2
+				(the number of worker processes = physical CPU cores)
+			CPUS / NODES  - maximize the dedicated CPU cache L3
+				(the number of worker processes = physical CPUs)
+		first  - mask the first logical unit or all units in the selected group.
+			One unit per the group maximizes the dedicated CPU cache for the
+			single-threaded worker, all units should be used for the multi-threaded
+			apps.
+		sequential  - sequential or cross nodes enumeration of the CPUs in the NUMA nodes:
+			None  - undefined, interpreted as cross-nodes (the most widely used on servers)
+			False  - cross-nodes
+			True  - sequential
+			cpusequential  - identified automatically (default)
+
+			For two hardware threads per a physical CPU core, where secondary HW threads
+			are taken in brackets:
+			Crossnodes enumeration, often used for the server CPUs
+			NUMA node0 CPU(s):     0,2(,4,6)
+			NUMA node1 CPU(s):     1,3(,5,7)
+			Sequential enumeration, often used for the laptop CPUs
+			NUMA node0 CPU(s):     0(,1),2(,3)
+			NUMA node1 CPU(s):     4(,5),6(,7)
+		"""
+		if sequential is cpusequential:
+			sequential = cpusequential()
+		assert ((afnstep == 1 or (afnstep >= self.CORE_THREADS
+			and not afnstep % self.CORE_THREADS)) and isinstance(first, bool)
+			and (sequential is None or isinstance(sequential, bool))
+			), ('Arguments are invalid:  afnstep: {}, first: {}, sequential: {}'
+			.format(afnstep, first, sequential))
+		self.afnstep = int(afnstep)  # To convert 2.0 to 2
+		self.first = first
+		self.sequential = sequential
+
+
+	def __call__(self, i):
+		"""Evaluate CPUs affinity mask for the specified group index of the size afnstep
+
+		i  - index of the selecting group of logical CPUs
+		return  - mask of the first or all logical CPUs
+		"""
+		if i < 0 or (i + 1) * self.afnstep > self.CPUS:
+			raise IndexError('Index is out of range for the given affinity step:'
+				'  i: {}, afnstep: {}, cpus: {} vs {} (afnstep * (i+1))'
+				.format(i, self.afnstep, self.CPUS, i * self.afnstep))
 
 		inode = i % self.NODES  # Index of the NUMA node
 		if self.afnstep == 1:
@@ -1499,12 +2787,453 @@ class AffinityMask(object):
 					cpus.append(str(i) if ncores <= 1 else '{}-{}'.format(i, i + ncores-1))
 					if self.first:
 						break
-				assert i + ncores <= self.CPUS, (
-					'Index is out of range for the given affinity step:'
-					'  i: {}, afnstep: {}, ncores: {}, imapped: {}, CPUS: {}'
-					.format(i, self.afnstep, ncores, i + ncores, self.CPUS))
-				cpumask = ','.join(cpus)
-		return cpumask
+				assert i + ncores <= self.CPUS, (
+					'Index is out of range for the given affinity step:'
+					'  i: {}, afnstep: {}, ncores: {}, imapped: {}, CPUS: {}'
+					.format(i, self.afnstep, ncores, i + ncores, self.CPUS))
+				cpumask = ','.join(cpus)
+		return cpumask
+
+
+def nodesfreemem():
+	"""Free memory of the NUMA nodes
+
+	return  list(float)  - free memory in gigabytes per each NUMA node (the index of the list),
+		0 if the node memory information is not available
+	"""
+	frees = []
+	for inode in range(cpunodes()):
+		free = 0
+		try:
+			# Format: "Node 0 MemFree:         1234567 kB"
+			with open('{}node{}/meminfo'.format(_SYSNODE, inode)) as fmem:
+				for ln in fmem:
+					vals = ln.split()
+					if len(vals) >= 4 and vals[2] == 'MemFree:':
+						free = int(vals[3]) * 1024
+						break
+		except (IOError, OSError, ValueError):
+			pass
+		frees.append(inGigabytes(free))
+	return frees
+
+
+_MPOL_DEFAULT = 0  # Default memory policy of the set_mempolicy() allocating on the local node
+_MPOL_BIND = 2  # Memory policy of the set_mempolicy() restricting the allocations to the specified nodes
+# Number of the set_mempolicy syscall per each architecture (the generic one is used by aarch64 and riscv)
+_SYS_SET_MEMPOLICY = {'x86_64': 238, 'amd64': 238, 'i386': 276, 'i686': 276, 'aarch64': 237, 'arm64': 237
+	, 'riscv64': 237, 'ppc64': 261, 'ppc64le': 261, 's390x': 270, 'armv7l': 321}.get(platform.machine().lower())
+_libc = None  # C library to perform the syscalls, loaded on the first request
+
+
+def mempolicy(node=None):
+	"""Bind the memory allocations of the calling thread to the NUMA node
+
+	The memory policy is set via the set_mempolicy syscall for the calling thread and is
+	inherited by the processes spawned by this thread retaining on the exec, so the policy is
+	set on the spawning thread around the process creation similar to the CPU affinity.
+
+	node: int  - NUMA node to bind the memory allocations to, None resets the default policy
+
+	return  bool  - whether the policy is set, False if set_mempolicy is not supported
+	"""
+	global _libc  #pylint: disable=W0603
+	if _SYS_SET_MEMPOLICY is None or not sys.platform.startswith('linux'):
+		return False
+	if _libc is None:
+		try:
+			_libc = ctypes.CDLL(None, use_errno=True)
+		except OSError:
+			return False
+	if node is None:
+		return _libc.syscall(ctypes.c_long(_SYS_SET_MEMPOLICY), ctypes.c_long(_MPOL_DEFAULT)
+			, None, ctypes.c_ulong(0)) == 0
+	ulbits = ctypes.sizeof(ctypes.c_ulong) * 8
+	nodemask = (ctypes.c_ulong * (node // ulbits + 1))()
+	nodemask[node // ulbits] = 1 << node % ulbits
+	# Note: the kernel considers maxnode - 1 bits of the mask
+	maxnode = ctypes.c_ulong(len(nodemask) * ulbits + 1)
+	return _libc.syscall(ctypes.c_long(_SYS_SET_MEMPOLICY), ctypes.c_long(_MPOL_BIND)
+		, nodemask, maxnode) == 0
+
+
+class CpuAllocator(object):
+	"""Allocator of the disjoint sets of logical CPUs to the jobs
+
+	Each slot is a set of the logical CPUs formed by the affinity mask. The free slot
+	of the least loaded NUMA node is allocated first, which balances the jobs among the
+	nodes, and the slots are returned on the jobs completion.
+
+	>>> ca = CpuAllocator(AffinityMask(1), 1)
+	>>> ca.freenodes()
+	{0}
+	>>> ca.acquire('job1', 0), ca.cpus(0), ca.free
+	(0, {0}, 0)
+	>>> ca.acquire('job2')
+	Traceback (most recent call last):
+	IndexError: There are no free CPUs to be allocated
+	>>> ca.release('job1'), ca.free
+	(0, 1)
+	"""
+	__slots__ = ('afnmask', '_owners', '_slots', '_masks', '_cpus', '_nodes', '_nodeload')
+
+	def __init__(self, afnmask, slots):
+		"""Allocator initialization
+
+		afnmask: AffinityMask  - affinity mask forming the sets of logical CPUs
+		slots: int  - the number of the allocated sets, <= afnmask.CPUS // afnmask.afnstep
+		"""
+		assert isinstance(afnmask, AffinityMask) and slots >= 1, ('Invalid arguments, afnmask: {}, slots: {}'
+			.format(type(afnmask).__name__, slots))
+		self.afnmask = afnmask
+		self._masks = [afnmask(i) for i in range(slots)]  # Affinity masks of the slots
+		self._cpus = [cpumaskset(mask) for mask in self._masks]  # Logical CPUs of the slots
+		self._nodes = [i % afnmask.NODES for i in range(slots)]  # NUMA node of each slot
+		self._nodeload = [0] * afnmask.NODES  # The number of allocated slots per each node
+		self._slots = [None] * slots  # Owners of the slots
+		self._owners = {}  # Allocated slots:  {owner: slot}
+
+
+	def __len__(self):
+		"""The number of slots"""
+		return len(self._slots)
+
+
+	@property
+	def free(self):
+		"""The number of free slots"""
+		return len(self._slots) - len(self._owners)
+
+
+	def acquire(self, owner, node=None):
+		"""Allocate a free slot balancing the load of the NUMA nodes
+
+		owner  - owner of the slot (job)
+		node: int  - preferable NUMA node of the slot, None means the least loaded node
+
+		return  islot: int  - index of the allocated slot
+
+		Raises:
+			IndexError  - there are no free slots
+		"""
+		assert owner not in self._owners, 'The owner already has the slot #{}'.format(self._owners[owner])
+		# The free slot of the preferable node if any, otherwise of the least loaded node
+		frees = [i for i, sown in enumerate(self._slots) if sown is None]
+		if not frees:
+			raise IndexError('There are no free CPUs to be allocated')
+		islot = min(frees, key=lambda i: (node is not None and self._nodes[i] != node
+			, self._nodeload[self._nodes[i]]))
+		self._slots[islot] = owner
+		self._owners[owner] = islot
+		self._nodeload[self._nodes[islot]] += 1
+		return islot
+
+
+	def freenodes(self):
+		"""NUMA nodes having free slots, set(int)"""
+		return set(self._nodes[i] for i, sown in enumerate(self._slots) if sown is None)
+
+
+	def release(self, owner):
+		"""Release the slot of the owner if any
+
+		owner  - owner of the slot (job)
+
+		return  islot: int  - index of the released slot or None
+		"""
+		islot = self._owners.pop(owner, None)
+		if islot is not None:
+			self._slots[islot] = None
+			self._nodeload[self._nodes[islot]] -= 1
+		return islot
+
+
+	def mask(self, islot):
+		"""Affinity mask of the slot in the taskset list format"""
+		return self._masks[islot]
+
+
+	def cpus(self, islot):
+		"""Logical CPUs of the slot, set(int)"""
+		return self._cpus[islot]
+
+
+	def node(self, islot):
+		"""NUMA node of the slot"""
+		return self._nodes[islot]
+
+
+class Histogram(object):
+	"""Distribution of the observed values over the fixed buckets
+
+	>>> hist = Histogram((1, 10)); hist.observe(0.5); hist.observe(1); hist.observe(50)
+	>>> hist.cumulative(), hist.sum
+	([(1, 2), (10, 2), (inf, 3)], 51.5)
+	"""
+	__slots__ = ('bounds', 'counts', 'sum')
+
+	def __init__(self, bounds):
+		"""Histogram initialization
+
+		bounds: iterable(float)  - ascending upper bounds (inclusive) of the buckets,
+			the last bucket (+inf) is added implicitly
+		"""
+		self.bounds = tuple(bounds)
+		self.counts = [0] * (len(self.bounds) + 1)  # The number of the observations per bucket
+		self.sum = 0.  # Sum of the observed values
+
+
+	def observe(self, val):
+		"""Register the value
+
+		val: float  - the observed value
+		"""
+		self.counts[bisect.bisect_left(self.bounds, val)] += 1
+		self.sum += val
+
+
+	def cumulative(self):
+		"""Cumulative counts of the observations per upper bound of the buckets
+
+		return  list((bound: float, count: int))  - cumulative counts including the +inf bound,
+			whose count is the total number of the observations
+		"""
+		counts = list(self.counts)  # Note: the histogram can be updated by another thread
+		res = []
+		total = 0
+		for bound, cnt in zip(self.bounds + (float('inf'),), counts):
+			total += cnt
+			res.append((bound, total))
+		return res
+
+
+class PoolMetrics(object):
+	"""Runtime instrumentation of the ExecPool accumulated since its construction
+
+	tick: Histogram  - duration of the scheduling work per tick of the execution cycle
+		excluding the waiting for the workers, sec
+	revise: Histogram  - duration of the workers revision (constraints, completion and admission), sec
+	jobtime: Histogram  - wall time of the completed jobs, sec
+	jobmem: Histogram  - peak memory consumption of the completed jobs if evaluated, GB
+	postponed: int  - the number of the jobs postponed by the memory limit
+	restarted: int  - the number of the restarts of the terminated jobs
+	timeouts: int  - the number of the jobs terminated by their timeout
+	"""
+	__slots__ = ('tick', 'revise', 'jobtime', 'jobmem', 'postponed', 'restarted', 'timeouts')
+
+	def __init__(self):
+		"""Metrics initialization"""
+		self.tick = Histogram((1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1))
+		self.revise = Histogram((1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1))
+		self.jobtime = Histogram((0.1, 1, 10, 60, 600, 3600, 4 * 3600, 24 * 3600))
+		self.jobmem = Histogram((0.01, 0.1, 0.5, 1, 2, 4, 8, 16, 64))
+		self.postponed = 0
+		self.restarted = 0
+		self.timeouts = 0
+
+
+class UiState(object):
+	"""Immutable versioned snapshot of the ExecPool state for the WebUI
+
+	The snapshot is published by the execution cycle on the state changes and queried
+	by the WebUI thread, so neither of them waits for the other. The executing and failed
+	jobs are captured as JobInfo, the info of the non-started jobs and tasks is fetched
+	lazily on the query. The metrics are not copied but referred, so they are always actual.
+	"""
+	__slots__ = ('version', 'name', 'alive', 'summary', 'cpuLoad', 'ramUsage', 'workers', 'jobs', 'failures'
+		, 'categories', 'metrics')
+	_versions = itertools.count(1)  # Versions of the snapshots, unique among the execution pools
+	_JOBSLIM = 50  # Default max number of jobs (including task members) to be listed
+
+	def __init__(self, name, alive, summary, cpuLoad, ramUsage, workers, jobs, failures, categories, metrics):
+		"""Snapshot initialization
+
+		name: str  - name of the execution pool
+		alive: bool  - whether the execution pool is alive
+		summary: SummaryBrief  - execution pool summary
+		cpuLoad: float  - CPU load, E [0, 1]
+		ramUsage: float  - used RAM in GB
+		workers: tuple(JobInfo)  - executing jobs
+		jobs: QueueView  - the non-started jobs
+		failures: tuple(JobInfo)  - failed jobs
+		categories: dict(category, int)  - the number of the non-started jobs per category
+		metrics: PoolMetrics  - runtime instrumentation of the execution pool
+		"""
+		self.version = next(self._versions)
+		self.name = name
+		self.alive = alive
+		self.summary = summary
+		self.cpuLoad = cpuLoad
+		self.ramUsage = ramUsage
+		self.workers = workers
+		self.jobs = jobs
+		self.failures = failures
+		self.categories = categories
+		self.metrics = metrics
+
+	def query(self, cmdid, propflt=None, objflt=None, lim=None, offset=0):
+		"""Form the response data of the UI command
+
+		cmdid: UiCmdId  - UI command identifier
+		propflt: list(str)  - properties (columns) filter
+		objflt: dict(str, UiResFilterVal)  - objects (tasks/jobs) filter
+		lim: uint  - max number of the listed jobs, None means the default value
+		offset: uint  - the number of the first filtered jobs to be skipped (failed, non-started
+			or having tasks depending on the command), the workers are always listed
+
+		return  data: dict  - the response data:
+			- errmsg: str  - error message if any
+			- summary: SummaryBrief  - execution pool summary
+			- workersInfo: list  - information about the workers (executing jobs)
+			- jobsInfo: list  - information about the [failed/deferred] jobs not associated to any tasks
+			- tasksInfo: list  - hierarchical information about the [failed/available] jobs with their tasks
+				starting from the root tasks
+		"""
+		data = {'cpuLoad': self.cpuLoad, 'ramUsage': self.ramUsage, 'summary': self.summary}
+		try:
+			# Be sure that the job/task name column is always included
+			# Note: at least on Python2 if enum has 'name' member then
+			# its .name attribute changes semantic => _name_ should be used
+			if propflt and UiResCol.name._name_ not in propflt:  # Note: .name attribute of the name col
+				# Add name column as the first one
+				propflt = [UiResCol.name._name_] + list(propflt)
+			lim = self._JOBSLIM if lim is None else int(lim)
+			offset = int(offset or 0)
+			# Set the actual Jobs limit value
+			data[UiResOpt.lim] = lim
+			data[UiResOpt.offset] = offset
+			if _DEBUG_TRACE:
+				print("> uicmd.id: {}, propflt: {}, objflt: {}".format(cmdid, propflt, objflt), file=sys.stderr)
+
+			# Form command-specific data
+			jnum = 0  # The number of showing jobs without the tasks, to be <= lim
+			tjnum = 0  # The number of showing jobs having tasks and showing tasks, to be <= lim
+			tinfe0 = dict()  # dict(Task, TaskInfoExt)  - Task information extended, bottom level of the hierarchy
+			if cmdid == UiCmdId.FAILURES:
+				# Fetch info about the failed jobs considering the filtering
+				jobsInfo = None  # Information about the failed jobs not assigned to any tasks
+				header = True  # Add jobs header
+				for fji in self.failures:
+					jdata = infodata(fji, propflt, objflt)
+					if jdata and offset:
+						offset -= 1
+						continue
+					if fji.task is None:
+						if not jdata or (lim and jnum >= lim):
+							continue
+						if header:
+							jobsInfo = [infoheader(JobInfo.iterprop(), propflt)]  #pylint: disable=E1101
+							header = False
+						jobsInfo.append(jdata)
+						jnum += 1
+					elif not lim or tjnum < lim:
+						tie = tinfe0.get(fji.task)
+						if tie is None:
+							tdata = infodata(TaskInfo(fji.task), propflt, objflt)
+							if not tdata:
+								continue
+							tie = tinfe0.setdefault(fji.task, TaskInfoExt(props=None if not tdata else
+								(infoheader(TaskInfo.iterprop(), propflt), tdata)  #pylint: disable=E1101
+								, jobs=None if not jdata else [infoheader(JobInfo.iterprop(), propflt)]))  #pylint: disable=E1101
+							tjnum += 1
+						if jdata:
+							# tie.jobs might be None if the task created before any of its DIRECT jobs failed
+							if tie.jobs is None:
+								tie.jobs = [infoheader(JobInfo.iterprop(), propflt)]  #pylint: disable=E1101
+							tie.jobs.append(jdata)
+							tjnum += 1
+					if lim and jnum >= lim and tjnum >= lim:
+						break
+				# List jobs only if any payload exists besides the header
+				if jobsInfo:
+					# Note: jobsInfo should include at least a header and one job if not empty
+					assert len(jobsInfo) >= 2, 'Unexpected length of jobsInfo'
+					data['jobsInfo'] = jobsInfo
+			elif cmdid == UiCmdId.LIST_JOBS:
+				# Flat workers listing and the upcoming jobs up to the specified limit
+				qjobs = self.jobs.select(objflt)
+				if not objflt:
+					# The page of the non-filtered jobs is fetched without the evaluation of the skipped jobs
+					qjobs = itertools.islice(qjobs, offset, None)
+					offset = 0
+				for key, jobs in (('workersInfo', self.workers), ('jobsInfo', (JobInfo(job) for job in qjobs))):
+					jobsInfo = None
+					jnum = 0  # Counter of the showing jobs
+					for jinf in jobs:
+						jdata = infodata(jinf, propflt, objflt)
+						if not jdata:
+							continue
+						if offset and key == 'jobsInfo':
+							offset -= 1
+							continue
+						if jobsInfo is None:
+							jobsInfo = [infoheader(JobInfo.iterprop(), propflt)]  #pylint: disable=E1101
+						jobsInfo.append(jdata)
+						jnum += 1  # Note: only the filtered jobs are considered
+						# Note: all the workers are listed
+						if lim and jnum >= lim and key == 'jobsInfo':
+							break
+					if jobsInfo:
+						data[key] = jobsInfo
+			elif cmdid == UiCmdId.LIST_TASKS:
+				# List the tasks with their jobs up to the specified limit of covered jobs
+				# Note: the jobs are preselected only by the properties absent in the tasks,
+				# otherwise the task might be matched by the filter in contrast to its jobs
+				tprops = set(TaskInfo.iterprop())  #pylint: disable=E1101
+				qjobs = self.jobs.select(None if not objflt else {prop: pcon
+					for prop, pcon in viewitems(objflt) if prop not in tprops}, tasked=True)
+				for jinf in itertools.chain(self.workers, (JobInfo(job) for job in qjobs)):
+					if jinf.task is None:
+						continue
+					jdata = infodata(jinf, propflt, objflt)
+					if jdata and offset:
+						offset -= 1
+						continue
+					tie = tinfe0.get(jinf.task)
+					if tie is None:
+						tdata = infodata(TaskInfo(jinf.task), propflt, objflt)
+						if not tdata:
+							continue
+						tie = tinfe0.setdefault(jinf.task, TaskInfoExt(props=None if not tdata else
+							(infoheader(TaskInfo.iterprop(), propflt), tdata)  #pylint: disable=E1101
+							, jobs=None if not jdata else [infoheader(JobInfo.iterprop(), propflt)]))  #pylint: disable=E1101
+						tjnum += 1
+					if jdata:
+						# tie.jobs might be None if the task created before any of its DIRECT jobs created
+						if tie.jobs is None:
+							tie.jobs = [infoheader(JobInfo.iterprop(), propflt)]  #pylint: disable=E1101
+						tie.jobs.append(jdata)
+						tjnum += 1
+					if lim and tjnum >= lim:
+						break
+			else:
+				data['errmsg'] = 'Unknown UI command: ' + cmdid.name
+				print('WARNING, Unknown command requested:', cmdid.name, file=sys.stderr)
+			if tinfe0:
+				# Iteratively form the hierarchy of tasks from the bottom level
+				ties = tasksInfoExt(tinfe0, propflt, objflt)
+				if ties:
+					tasksInfo = []
+					tixwide = 0  # tasksInfo max wide
+					for task, tie in viewitems(ties):
+						# Omit repetitive listing of sub-hierarchies (they are listed from the root task)
+						if task.task is not None:
+							continue
+						tls, twide = unfoldDepthFirst(tie, indent=0)
+						tasksInfo.extend(tls)
+						if twide > tixwide:
+							tixwide = twide
+					data['tasksInfo'] = tasksInfo
+					data['tasksInfoWide'] = tixwide
+		except Exception as err:  #pylint: disable=W0703
+			errmsg = 'ERROR, UI command processing failed: {}. {}'.format(err, traceback.format_exc(5))
+			data['errmsg'] = errmsg
+			print(errmsg, file=sys.stderr)
+		if not self.alive or (not self.summary.workers and not self.summary.jobs):
+			errmsg = data.get('errmsg', '')
+			data['errmsg'] = '{}The execution pool{} is not alive'.format(
+				'' if not errmsg else errmsg + '. ', '' if not self.name else ' ' + self.name)
+		return data
 
 
 class ExecPool(object):
@@ -1524,8 +3253,16 @@ class ExecPool(object):
 	# reduce the number of reschedules, recommended value: 1.2 .. 1.6
 	_JMEMTRR = 3 - _GOLDEN  # 1.382; 1.5
 	assert _JMEMTRR >= 1, 'Memory threshold ratio should be >= 1'
-
-	def __init__(self, wksnum=max(_CPUS-1, 1), afnmask=None, memlimit=0., latency=0., name=None, webuiapp=None):
+	_TICKMIN = 0.01  # Min adaptive latency (tick) of the workers revision in sec
+	_TICKRATIO = 0.25  # Ratio of the adaptive tick to the expected duration of the executing jobs
+	_DURWEIGHT = 0.2  # Weight of the last completed job in the moving average of the jobs duration
+	_PACKWND = 64  # The number of the first scheduled jobs considered for the memory-aware packing
+	_UIREFRESH = 1  # Max period of the WebUI state publishing in sec if the state is not changed
+	_UIMEMDELTA = 0.05  # Min relative change of the job memory consumption to be published as the WebUI event
+	_AGENTPROBE = 10  # Min period of the unreachable execution agents probing in sec
+
+	def __init__(self, wksnum=max(_CPUS-1, 1), afnmask=None, memlimit=0., latency=0., name=None, webuiapp=None
+	, history=None, pypreload=None, membind=False, journal=None, agents=None):
 		# afnstep=None, uidir=None
 		"""Execution Pool constructor
 
@@ -1553,10 +3290,37 @@ class ExecPool(object):
 				- value > 0 is automatically limited with total physical RAM to process
 					jobs in RAM almost without the swapping
 		latency  - approximate minimal latency of the workers monitoring in sec, float >= 0;
-			0 means automatically defined value (recommended, typically 2-3 sec)
+			0 means automatically adapted value (recommended): the tick is adapted to the
+			expected duration of the executing jobs (observed durations of the completed
+			jobs or the history) within [_TICKMIN, 1-2 sec].
+			NOTE: the completed workers are reaped immediately if _PIDFD, the latency
+			defines the period of the timeout and memory constraints revision
 		name  - name of the execution pool to distinguish traces from subsequently
 			created execution pools (only on creation or termination)
 		webuiapp: WebUiApp  - WebUI app to inspect load balancer remotely
+		history: str  - path of the persistent jobs history (JobHistory) to predict
+			the expected memory consumption and execution time of the scheduled jobs
+			by the previous executions, None means the in-memory history of the current
+			execution, which is used for the memory-aware admission of the jobs.
+			NOTE: the memory is predicted (and recorded) only if _LIMIT_WORKERS_RAM
+		pypreload: list(str)  - modules to be preloaded by the warm Python workers
+			server of the PyJob, which is started on the pool construction if specified
+		membind: bool  - NUMA placement policy of the jobs having undefined Job.membind: bind memory
+			of the job process to the NUMA node of its dedicated CPUs, the node having the most
+			free memory is chosen among the nodes having free CPUs.
+			NOTE: applicable only on the multi-node systems if afnmask is specified and each its
+			set of CPUs belongs to a single node; the memory is bound by _NUMABIN if available
+		journal: str  - path of the append-only jobs journal (JobJournal) to resume the interrupted
+			execution skipping the successfully completed jobs on their rescheduling, None if not used;
+			True means "<name>.jnl" in the current directory (the pool name is required).
+			NOTE: the jobs are identified by their names qualified with the owner tasks (JobJournal.key())
+		agents: list(str)  - addresses of the execution agents (mpeagent) to distribute the jobs:
+			<host>:<port> of the TCP socket or the path of the Unix socket; the workers of the
+			reachable agents extend the wksnum. Each job is dispatched to the local host or the agent
+			having the most free workers (cores) and then RAM.
+			NOTE: PyJob and sequential jobs are executed locally; the remote jobs are constrained
+			by the memory limits of the agents. The requests are authenticated by the shared secret
+			of the MPEAGENT_SECRET environment variable, which is required for the TCP sockets
 
 		Internal attributes:
 		alive  - whether the execution pool is alive or terminating, bool.
@@ -1568,19 +3332,27 @@ class ExecPool(object):
 			excluding the jobs terminated by timeout that have set .rsrtonto (will be restarted)
 		jobsdone: uint  - the number of successfully completed (non-terminated) jobs with zero code
 		tasks: set(Task)  - tasks associated with the scheduled jobs
+		metrics: PoolMetrics  - runtime instrumentation of the execution pool
+		cpualloc: CpuAllocator  - allocator of the disjoint logical CPUs to the executing jobs
+			according to the afnmask, None if the affinity is not applied.
+			NOTE: the affinity is inherited by the started process from the spawning thread (_SETAFFINITY)
+			or via _AFFINITYBIN otherwise
 		"""
 		assert (wksnum >= 1 and (afnmask is None or isinstance(afnmask, AffinityMask))
 			and memlimit >= 0 and latency >= 0 and (name is None or isinstance(name, str))
-			), ('Arguments are invalid:  wksnum: {}, afnmask: {}, memlimit: {}'
-			', latency: {}, name: {}'.format(wksnum, afnmask, memlimit, latency, name))
+			and (history is None or isinstance(history, str))
+			and (journal in (None, False) or isinstance(journal, str) or (journal is True and name))
+			), ('Arguments are invalid:  wksnum: {}, afnmask: {}, memlimit: {}, latency: {}, name: {}'
+			', history: {}, journal: {}'.format(wksnum, afnmask, memlimit, latency, name, history, journal))
 		self.name = name
 
 		# Verify and update wksnum and afnstep if required
 		if afnmask:
-			# Check whether _AFFINITYBIN exists in the system
+			# Check whether _AFFINITYBIN exists in the system if required
 			try:
-				with open(os.devnull, 'wb') as fdevnull:
-					subprocess.call([_AFFINITYBIN, '-V'], stdout=fdevnull)
+				if not _SETAFFINITY:
+					with open(os.devnull, 'wb') as fdevnull:
+						subprocess.call([_AFFINITYBIN, '-V'], stdout=fdevnull)
 				if afnmask.afnstep * wksnum > afnmask.CPUS:
 					print('WARNING{}, the number of worker processes is reduced'
 						' ({wlim0} -> {wlim} to satisfy the affinity step'
@@ -1594,337 +3366,211 @@ class ExecPool(object):
 					, afnbin=_AFFINITYBIN, err=err), file=sys.stderr)
 		self._wkslim = wksnum  # Max number of resident workers
 		self._workers = set()  # Scheduled and started jobs, i.e. worker processes:  {executing_job, }
-		self._jobs = deque()  # Scheduled jobs that have not been started yet:  deque(job)
+		self._jobs = JobQueue()  # Scheduled jobs that have not been started yet:  JobQueue(job)
 		self._tstart = None  # Start time of the execution of the first task
+		# Completion notifications of the workers: the selector of the pidfds and {job: pidfd}
+		self._wksel = None if not _PIDFD else selectors.DefaultSelector()
+		self._pidfds = {}
 		# Affinity scheduling attributes
 		self._afnmask = afnmask  # Affinity mask functor
-		self._affinity = None if not self._afnmask else [None]*self._wkslim
+		self.cpualloc = None if not self._afnmask else CpuAllocator(self._afnmask, self._wkslim)
+		self.membind = membind
+		# NUMA memory binding is possible if each set of the dedicated CPUs belongs to a single node
+		self._membind = bool(self._afnmask) and self._afnmask.NODES >= 2 and (
+			self._afnmask.afnstep <= self._afnmask.NODE_CPUS)
+		self._numabin = None  # Path of the _NUMABIN app, '' if it is not available; located on the first binding
 		assert (self._wkslim * (1 if not self._afnmask else self._afnmask.afnstep)
-			<= self._CPUS), ('_wkslim or afnstep is too large:'
-			'  _wkslim: {}, afnstep: {}, CPUs: {}'.format(self._wkslim
-			, 1 if not self._afnmask else self._afnmask.afnstep, self._CPUS))
-		# Execution rescheduling attributes
-		self.memlimit = 0. if not _LIMIT_WORKERS_RAM else max(0, min(memlimit, _RAM_LIMIT))  # in GB
-		self.latency = latency if latency else 1 + (self.memlimit != 0.)  # Seconds of sleep on pooling
-		# Predefined private attributes
-		self._termlatency = min(0.2, self.latency)  # 200 ms, job process (worker) termination latency
-		# Lock for the __terminate() to avoid simultaneous call by the signal and normal execution flow
-		self.__termlock = Lock()
-		self.alive = True  # The execution pool is in the working state (has not been terminated)
-		self.failures = []  # Failed jobs (terminated or having non-zero return code)
-		self.jobsdone = 0  # The number of successfully completed jobs (non-terminated and with zero return code)
-		self.tasks = set()
-
-		if self.memlimit and self.memlimit != memlimit:
-			print('WARNING{}, total memory limit is reduced to guarantee the in-RAM'
-				' computations: {:.6f} -> {:.6f} GB'.format('' if not self.name else ' ' + self.name
-				, memlimit, self.memlimit), file=sys.stderr)
-
-		# Initialize WebUI if it has been supplied
-		self._uicmd = None
-		global _WEBUI  #pylint: disable=W0603
-		if _WEBUI and webuiapp is not None:
-			# ATTENTION: Python3 includes the path to the instance type check, which
-			# affects the relative imports (importing mpepool as a sub-package):
-			# <class 'utils.mpewui.WebUiApp'> != <class 'mpewui.WebUiApp'>...
-			if _DEBUG_TRACE:
-				assert isinstance(webuiapp, WebUiApp) or type(webuiapp).__name__ == WebUiApp.__name__, (
-					'Unexpected type of webuiapp: ' + type(webuiapp).__name__)
-			#uiapp = WebUiApp(host='localhost', port=8080, name='MpepoolWebUI', daemon=True)
-			self._uicmd = webuiapp.cmd
-			if WebUiApp.RAM is None:
-				# Note: it is more reasonable to display the specified RAM limit than available memory
-				WebUiApp.RAM = _RAM_LIMIT  # _RAM_SIZE
-			if WebUiApp.LCPUS is None:
-				WebUiApp.LCPUS = AffinityMask.CPUS
-			if WebUiApp.CPUCORES is None:
-				WebUiApp.CPUCORES = AffinityMask.CORES
-			if WebUiApp.CPUNODES is None:
-				WebUiApp.CPUNODES = AffinityMask.NODES  # NUMA nodes (typically, physical CPUs)
-			if WebUiApp.WKSMAX is None:
-				WebUiApp.WKSMAX = wksnum
-			if not webuiapp.is_alive():
-				try:
-					webuiapp.start()
-				except RuntimeError as err:
-					print('WARNING, webuiapp can not be started. Disabled: {}. {}'.format(
-						err, traceback.format_exc(5)), file=sys.stderr)
-					_WEBUI = False
-
-
-	def __str__(self):
-		"""A string representation, which is the .name if defined"""
-		return self.name if self.name is not None else self.__repr__()
-
-
-	def __reviseUi(self):
-		"""Check and handle UI commands
-
-		The command id is set to None and
-		the result is formed in the following .data attributes:
-		- errmsg: str  - error message if any
-		- summary: SummaryBrief  - execution pool summary
-		- workersInfo: list  - information about the workers (executing jobs)
-		- jobsInfo: list  - information about the [failed/deferred] jobs not associated to any tasks
-		- tasksInfo: list  - hierarchical information about the [failed/available] jobs with their tasks
-			starting from the root tasks
-		"""
-		# Process on the next iteration if the client request is not ready
-		if self._uicmd.id is None or not self._uicmd.cond.acquire(blocking=False):
-			return
-		WUIJOBS_LIMIT = 50  # Default max number of jobs (including task members) to be listed in the WebUI
-		try:
-			# self.summary()  # TODO: implement each command in the dedicated function
-			# Read command parameters from the .data
-			data = self._uicmd.data
-			if data:
-				propflt = data.get(UiResOpt.cols)  # Properties (colons header)
-				# Be sure that the job/task name column is always included
-				# Note: at least on Python2 if enum has 'name' member then
-				# its .name attribute changes semantic => _name_ should be used
-				# print('>>> name:', UiResCol.name._name_, file=sys.stderr)
-				if propflt and UiResCol.name._name_ not in propflt:  # Note: .name attribute of the name col
-					# Add name column as the first one
-					try:
-						propflt.insert(0, UiResCol.name._name_)
-					except AttributeError as err:
-						data.clear()
-						self._uicmd.data['errmsg'] = ('Unexpected type of the UiResOpt.cols'
-							' filter values (not a list): ' + type(propflt).__name__)
-						raise
-				objflt = data.get(UiResOpt.flt)
-				lim = int(data.get(UiResOpt.lim, WUIJOBS_LIMIT))
-			else:
-				propflt = None
-				objflt = None
-				lim = WUIJOBS_LIMIT
-			if _DEBUG_TRACE:
-				print("> uicmd.id: {}, propflt: {}, objflt: {}".format(
-					self._uicmd.id, propflt, objflt), file=sys.stderr)
-			# Prepare .data for the response results
-			data.clear()
-			# Set CPU and RAM consumption statistics
-			if _LIMIT_WORKERS_RAM:
-				data['cpuLoad'] = psutil.cpu_percent() / 100.  # float E[0, 1]
-				data['ramUsage'] = inGigabytes(psutil.virtual_memory().used)  # float E [0, 1]
-			else:
-				data['cpuLoad'] = 0
-				data['ramUsage'] = 0
-			# Set the actual Jobs limit value
-			data[UiResOpt.lim] = lim
-			# Summary of the execution pool:
-			# Note: executed in the main thread, so the lock check is required only
-			# to check for the termination
-			acqlock = self.__termlock.acquire(True, 0.01)  # 10 ms
-			if not acqlock or not self.alive:
-				if acqlock:
-					self.__termlock.release()
-				# Note: it just interrupts job start, but does not cause termination
-				# of the whole (already terminated) execution pool
-				print("WARNING, The execution pool{} is terminated and can't response the UI command: {}"
-					.format('' if not self.name else ' ' + self.name, self._uicmd.id.name, file=sys.stderr))
-				return
-
-			smr = SummaryBrief(workers=len(self._workers), jobs=len(self._jobs)
-				, jobsDone=self.jobsdone, jobsFailed=len(self.failures), tasks=len(self.tasks))
-			self.__termlock.release()
-			# Evaluate remained vars
-			# Evaluate tasksFailed and tasksRootFailed from failures
-			tasksRootFailed = 0
-			tasksFailed = set()
-			for fji in self.failures:
-				task = fji.task
-				while task:
-					if task not in tasksFailed:
-						if task.task is None:
-							tasksRootFailed += 1
-						tasksFailed.add(task)
-					task = task.task
-			smr.tasksRootFailed = tasksRootFailed
-			smr.tasksFailed = len(tasksFailed)
-			# Evaluate tasksRoot from tasks
-			tasksRoot = 0
-			for task in self.tasks:
-				if task.task is None:
-					tasksRoot += 1
-			smr.tasksRoot = tasksRoot
-			data['summary'] = smr
-
-			# Form command-specific data
-			jnum = 0  # The number of showing jobs without the tasks, to be <= lim
-			tjnum = 0  # The number of showing jobs having tasks and showing tasks, to be <= lim
-			if self._uicmd.id == UiCmdId.FAILURES:
-				# Fetch info about the failed jobs considering the filtering
-				jobsInfo = None  # Information about the failed jobs not assigned to any tasks
-				tinfe0 = dict()  # dict(Task, TaskInfoExt)  - Task information extended, bottom level of the hierarchy
-				header = True  # Add jobs header
-				for fji in self.failures:
-					# Note: check for the termination in all cycles
-					if not self.alive:
-						return
-					jdata = infodata(fji, propflt, objflt)
-					if fji.task is None:
-						if not jdata or (lim and jnum >= lim):
-							continue
-						if header:
-							jobsInfo = [infoheader(JobInfo.iterprop(), propflt)]  #pylint: disable=E1101
-							header = False
-						jobsInfo.append(jdata)
-						jnum += 1
-					elif not lim or tjnum < lim:
-						tie = tinfe0.get(fji.task)
-						if tie is None:
-							tdata = infodata(TaskInfo(fji.task), propflt, objflt)
-							if not tdata:
-								continue
-							tie = tinfe0.setdefault(fji.task, TaskInfoExt(props=None if not tdata else
-								(infoheader(TaskInfo.iterprop(), propflt), tdata)  #pylint: disable=E1101
-								, jobs=None if not jdata else [infoheader(JobInfo.iterprop(), propflt)]))  #pylint: disable=E1101
-							tjnum += 1
-						if jdata:
-							# tie.jobs might be None if the task created before any of its DIRECT jobs failed
-							if tie.jobs is None:
-								tie.jobs = [infoheader(JobInfo.iterprop(), propflt)]  #pylint: disable=E1101
-							tie.jobs.append(jdata)
-							tjnum += 1
-					if lim and jnum >= lim and tjnum >= lim:
-						break
-				# List jobs only if any payload exists besides the header
-				if jobsInfo:
-					# Note: jobsInfo should include at least a header and one job if not empty
-					assert len(jobsInfo) >= 2, 'Unexpected length of jobsInfo'
-					data['jobsInfo'] = jobsInfo
-				if not tinfe0:
-					return
-
-				# Iteratively form the hierarchy of tasks from the bottom level
-				ties = tasksInfoExt(tinfe0, propflt, objflt)
-				if ties:
-					tasksInfo = []
-					tixwide = 0  # tasksInfo max wide
-					for task, tie in viewitems(ties):
-						# Omit repetitive listing of sub-hierarchies (they are listed from the root task)
-						if task.task is not None:
-							continue
-						tls, twide = unfoldDepthFirst(tie, indent=0)
-						tasksInfo.extend(tls)
-						if twide > tixwide:
-							tixwide = twide
-					tls = None
-					data['tasksInfo'] = tasksInfo  # list(viewvalues(ties))
-					data['tasksInfoWide'] = tixwide
-			elif self._uicmd.id == UiCmdId.LIST_JOBS:
-				# Remained Jobs
-				if (not self._workers and not self._jobs) or not self.alive:
-					return
-				# Flat workers listing
-				jobsInfo = None  # Information about the workers
-				header = True  # Add jobs header
-				for job in self._workers:
-					# Note: check for the termination in all cycles
-					if not self.alive:
-						return
-					jdata = infodata(JobInfo(job), propflt, objflt)
-					if not jdata:
-						continue
-					if header:
-						jobsInfo = [infoheader(JobInfo.iterprop(), propflt)]  #pylint: disable=E1101
-						header = False
-					jobsInfo.append(jdata)
-				if jobsInfo:
-					data['workersInfo'] = jobsInfo
-				# List the upcoming jobs up to the specified limit
-				jobsInfo = None  # Information about the jobs
-				header = True  # Add jobs header
-				jnum = 0  # Counter of the showing jobs
-				for job in self._jobs:
-					# Note: check for the termination in all cycles
-					if not self.alive:
-						return
-					jdata = infodata(JobInfo(job), propflt, objflt)
-					if not jdata:
-						continue
-					if header:
-						jobsInfo = [infoheader(JobInfo.iterprop(), propflt)]  #pylint: disable=E1101
-						header = False
-					jobsInfo.append(jdata)
-					jnum += 1  # Note: only the filtered jobs are considered
-					if lim and jnum >= lim:
-						break
-				if jobsInfo:
-					data['jobsInfo'] = jobsInfo
-					jobsInfo = None
-			elif self._uicmd.id == UiCmdId.LIST_TASKS:
-				# Tasks for the remained Jobs
-				if (not self._workers and not self._jobs) or not self.alive:
-					return
-				# List the tasks with their jobs up to the specified limit of covered jobs
-				tinfe0 = dict()  # dict(Task, TaskInfoExt)  - Task information extended, bottom level of the hierarchy
-				tjnum = 0  # The number of showing jobs having tasks and showing tasks, to be <= lim
-				for jobs in (self._workers, self._jobs):
-					for job in jobs:
-						# Note: check for the termination in all cycles
-						if not self.alive:
-							return
-						if job.task is None:
-							continue
-						# print('>>> Non-zero task: {}'.format(job.task.name))
-						jdata = infodata(JobInfo(job), propflt, objflt)
-						tie = tinfe0.get(job.task)
-						if tie is None:
-							tdata = infodata(TaskInfo(job.task), propflt, objflt)
-							if not tdata:
-								continue
-							tie = tinfe0.setdefault(job.task, TaskInfoExt(props=None if not tdata else
-								(infoheader(TaskInfo.iterprop(), propflt), tdata)  #pylint: disable=E1101
-								, jobs=None if not jdata else [infoheader(JobInfo.iterprop(), propflt)]))  #pylint: disable=E1101
-							tjnum += 1
-						if jdata:
-							# tie.jobs might be None if the task created before any of its DIRECT jobs created
-							if tie.jobs is None:
-								tie.jobs = [infoheader(JobInfo.iterprop(), propflt)]  #pylint: disable=E1101
-							tie.jobs.append(jdata)
-							tjnum += 1
-						if lim and tjnum >= lim:
-							break
-				if not tinfe0:
-					return
-				# Iteratively form the hierarchy of tasks from the bottom level
-				ties = tasksInfoExt(tinfe0, propflt, objflt)
-				# if ties:
-				# 	data['tasksInfo'] = list(viewvalues(ties))
-				if ties:
-					# print('>>> ties size: {}'.format(len(ties)))
-					tasksInfo = []
-					tixwide = 0  # tasksInfo max wide
-					for task, tie in viewitems(ties):
-						# Omit repetative listing of subhierarchies (they are listed from the root task)
-						if task.task is not None:
-							continue
-						tls, twide = unfoldDepthFirst(tie, indent=0)
-						tasksInfo.extend(tls)
-						if twide > tixwide:
-							tixwide = twide
-					tls = None
-					data['tasksInfo'] = tasksInfo  # list(viewvalues(ties))
-					data['tasksInfoWide'] = tixwide
+			<= self._CPUS), ('_wkslim or afnstep is too large:'
+			'  _wkslim: {}, afnstep: {}, CPUs: {}'.format(self._wkslim
+			, 1 if not self._afnmask else self._afnmask.afnstep, self._CPUS))
+		# Execution agents extending the local workers
+		self._wksloc = wksnum  # Max number of the local workers
+		self._agents = []
+		for address in agents or ():
+			agent = AgentLink(address)
+			if agent.update():
+				self._agents.append(agent)
+				self._wkslim += agent.wksnum
+		# Jobs and their cancellations posted from the foreign threads:  deque((job, cancel))
+		self._inbox = deque()
+		self._canceled = set()  # Executing jobs being terminated by the cancellation request without the restart
+		# Jobs skipped being completed according to the journal, whose tasks are notified by the execution cycle
+		# when all the jobs of the tasks are added
+		self._skipped = []
+		# Execution rescheduling attributes
+		self.memlimit = 0. if not _LIMIT_WORKERS_RAM else max(0, min(memlimit, _RAM_LIMIT))  # in GB
+		self.latency = latency if latency else 1 + (self.memlimit != 0.)  # Seconds of sleep on pooling
+		self._adaptive = not latency  # The tick is adapted to the expected duration of the executing jobs
+		self._jobdur = None  # Exponential moving average of the completed jobs duration in sec
+		self._tadmit = 0.  # Time when the subsequent jobs can be started considering the job startdelay
+		# Snapshot of the available memory of the system in GB shared by the jobs submission and revision
+		self._memfree = None
+		self._tmemfree = 0.  # Time of the memory snapshot
+		# Predefined private attributes
+		self._termlatency = min(0.2, self.latency)  # 200 ms, job process (worker) termination latency
+		# Lock for the __terminate() to avoid simultaneous call by the signal and normal execution flow
+		self.__termlock = Lock()
+		self.alive = True  # The execution pool is in the working state (has not been terminated)
+		self.failures = []  # Failed jobs (terminated or having non-zero return code)
+		self.jobsdone = 0  # The number of successfully completed jobs (non-terminated and with zero return code)
+		self.tasks = set()
+		self.metrics = PoolMetrics()  # Runtime instrumentation
+		# Deadlines of the started tasks having the timeout:  heap of (deadline, seq, task)
+		self._deadlines = []
+		self._dlseq = itertools.count()  # Sequence number of the deadlines to order the tasks having the same deadline
+		self._history = JobHistory(history or None)  # Jobs history, persistent if the path is specified
+		# Journal of the jobs execution to resume the interrupted execution
+		self._journal = None if not journal else JobJournal(journal if journal is not True else name + '.jnl')
+		self._pyctx = None if not pypreload else pycontext(pypreload)  # Warm Python workers context for the PyJob
+		# Cgroups of the jobs accounting and limiting memory of the process trees if supported
+		self._cgroups = 0  # The number of the created cgroups, used to name them uniquely
+		self._cgstale = []  # Cgroups to be removed once their terminating processes are reaped
+
+		if self.memlimit and self.memlimit != memlimit:
+			print('WARNING{}, total memory limit is reduced to guarantee the in-RAM'
+				' computations: {:.6f} -> {:.6f} GB'.format('' if not self.name else ' ' + self.name
+				, memlimit, self.memlimit), file=sys.stderr)
+
+		# Initialize WebUI if it has been supplied
+		self._webuiapp = None  # WebUI app to publish the state snapshots
+		self._uifprint = None  # Fingerprint of the published state to identify its changes
+		self._tuipub = 0.  # Time of the last state publishing
+		self._uicpu = 0.  # CPU load of the published state, sampled at most once per _UIREFRESH
+		self._tuicpu = None  # Time of the CPU load sampling
+		self._uievents = None  # State transitions to be published for the WebUI:  [(kind, data)]
+		self._uimems = {}  # Published memory consumption of the workers:  {job: mem}
+		self._uitasks = set()  # Started non-finished tasks, whose completion is published
+		self._uinfails = 0  # The number of the published failures
+		global _WEBUI  #pylint: disable=W0603
+		if _WEBUI and webuiapp is not None:
+			# ATTENTION: Python3 includes the path to the instance type check, which
+			# affects the relative imports (importing mpepool as a sub-package):
+			# <class 'utils.mpewui.WebUiApp'> != <class 'mpewui.WebUiApp'>...
+			if _DEBUG_TRACE:
+				assert isinstance(webuiapp, WebUiApp) or type(webuiapp).__name__ == WebUiApp.__name__, (
+					'Unexpected type of webuiapp: ' + type(webuiapp).__name__)
+			#uiapp = WebUiApp(host='localhost', port=8080, name='MpepoolWebUI', daemon=True)
+			self._webuiapp = webuiapp
+			self._uievents = []
+			if WebUiApp.RAM is None:
+				# Note: it is more reasonable to display the specified RAM limit than available memory
+				WebUiApp.RAM = _RAM_LIMIT  # _RAM_SIZE
+			if WebUiApp.LCPUS is None:
+				WebUiApp.LCPUS = AffinityMask.CPUS
+			if WebUiApp.CPUCORES is None:
+				WebUiApp.CPUCORES = AffinityMask.CORES
+			if WebUiApp.CPUNODES is None:
+				WebUiApp.CPUNODES = AffinityMask.NODES  # NUMA nodes (typically, physical CPUs)
+			if WebUiApp.WKSMAX is None:
+				WebUiApp.WKSMAX = wksnum
+			if not webuiapp.is_alive():
+				try:
+					webuiapp.start()
+				except RuntimeError as err:
+					print('WARNING, webuiapp can not be started. Disabled: {}. {}'.format(
+						err, traceback.format_exc(5)), file=sys.stderr)
+					_WEBUI = False
+
+
+	def __str__(self):
+		"""A string representation, which is the .name if defined"""
+		return self.name if self.name is not None else self.__repr__()
+
+
+	def __publishUi(self, force=False):
+		"""Publish the state snapshot for the WebUI if the state has been changed
+
+		The snapshot is published at most once per tick and is refreshed at least each
+		_UIREFRESH sec to update the resource consumption. The CPU load is sampled at most
+		once per _UIREFRESH and the RAM usage is taken from the available memory snapshot.
+
+		force: bool  - publish the snapshot irrespectively of the changes
+		"""
+		self.__publishUiEvents()
+		tcur = time.perf_counter()
+		fprint = (len(self._workers), len(self._jobs), self.jobsdone, len(self.failures), len(self.tasks), self.alive)
+		if not force and fprint == self._uifprint and tcur - self._tuipub < self._UIREFRESH:
+			return
+		self._uifprint = fprint
+		self._tuipub = tcur
+		try:
+			smr = SummaryBrief(workers=len(self._workers), jobs=len(self._jobs)
+				, jobsDone=self.jobsdone, jobsFailed=len(self.failures), tasks=len(self.tasks))
+			# Evaluate tasksFailed and tasksRootFailed from failures
+			tasksRootFailed = 0
+			tasksFailed = set()
+			for fji in self.failures:
+				task = fji.task
+				while task:
+					if task not in tasksFailed:
+						if task.task is None:
+							tasksRootFailed += 1
+						tasksFailed.add(task)
+					task = task.task
+			smr.tasksRootFailed = tasksRootFailed
+			smr.tasksFailed = len(tasksFailed)
+			# Evaluate tasksRoot from tasks
+			smr.tasksRoot = sum(1 for task in self.tasks if task.task is None)
+			# Set CPU and RAM consumption statistics
+			if _LIMIT_WORKERS_RAM:
+				if self._tuicpu is None or tcur - self._tuicpu >= self._UIREFRESH:
+					self._uicpu = psutil.cpu_percent() / 100.  # float E[0, 1]
+					self._tuicpu = tcur
+				cpuLoad = self._uicpu
+				ramUsage = max(_RAM_SIZE - self.__memfree(), 0.)  # float, GB
 			else:
-				self._uicmd.data['errmsg'] = 'Unknown UI command: ' + self._uicmd.id.name
-				print('WARNING, Unknown command requested:', self._uicmd.id.name, file=sys.stderr)
+				cpuLoad = 0
+				ramUsage = 0
+			# Note: the attribute assignment is atomic, the WebUI fetches either the former or the new snapshot
+			self._webuiapp.state = UiState(self.name, self.alive, smr, cpuLoad, ramUsage
+				, tuple(JobInfo(job) for job in self._workers), self._jobs.snapshot(), tuple(self.failures)
+				, self._jobs.categories(), self.metrics)
 		except Exception as err:  #pylint: disable=W0703
-			errmsg = 'ERROR, UI command processing failed: {}. {}'.format(
-				err, traceback.format_exc(5))
-			self._uicmd.data['errmsg'] = errmsg
-			print(errmsg, file=sys.stderr)
-		finally:
-			if (not self._workers and not self._jobs) or not self.alive:
-				errmsg = self._uicmd.data.get('errmsg', '')
-				errmsg = '{}The execution pool{} is not alive'.format(
-					'' if not errmsg else '. ' + errmsg, '' if not self.name else ' ' + self.name)
-				self._uicmd.data['errmsg'] = errmsg
-			self._uicmd.id = None  # Reset command id for the completed command
-			self._uicmd.cond.notify()
-			self._uicmd.cond.release()
+			print('ERROR, the WebUI state publishing failed: {}. {}'.format(err, traceback.format_exc(5))
+				, file=sys.stderr)
+
+
+	def __uievent(self, kind, job, **attrs):
+		"""Register the job state transition to be published for the WebUI
+
+		kind: str  - the transition: queued, started, memory, finished, failed
+		job: Job|JobInfo  - the transitioned job
+		attrs: dict  - the transition-specific properties
+		"""
+		attrs.update(type='job', name=job.name, task=None if job.task is None else job.task.name, time=time.time())
+		self._uievents.append((kind, attrs))
+
+
+	def __uifailures(self):
+		"""Register the failures appended since the last registration as the WebUI events"""
+		if self._uinfails > len(self.failures):  # The failures have been reset
+			self._uinfails = 0
+		for fji in itertools.islice(self.failures, self._uinfails, None):
+			self.__uievent('failed', fji, pid=fji.pid, rcode=fji.code, duration=fji.duration)
+		self._uinfails = len(self.failures)
+
+
+	def __publishUiEvents(self):
+		"""Publish the registered state transitions for the WebUI
+
+		The failures and memory updates are identified here to cover all the failure cases
+		and to not publish each (insignificant) memory update of the workers.
+		"""
+		self.__uifailures()
+		if self.memlimit:
+			for job in self._workers:
+				mem = self._uimems.get(job)
+				if job.mem and (mem is None or abs(job.mem - mem) > mem * self._UIMEMDELTA):
+					self._uimems[job] = job.mem
+					self.__uievent('memory', job, mem=job.mem)
+		if self._uievents:
+			events = self._uievents
+			self._uievents = []
+			try:
+				self._webuiapp.events.publish(events)
+			except Exception as err:  #pylint: disable=W0703
+				print('ERROR, the WebUI events publishing failed: {}. {}'.format(err, traceback.format_exc(5))
+					, file=sys.stderr)
 
 
 	def __enter__(self):
@@ -1943,6 +3589,8 @@ class ExecPool(object):
 		trcbck  - exception trcbck
 		"""
 		self.__terminate()
+		if self._journal is not None:
+			self._journal.close()
 		# Note: the exception (if any) is propagated if True is not returned here
 
 
@@ -1975,7 +3623,7 @@ class ExecPool(object):
 		traceback.print_stack(limit=5, file=sys.stderr)
 
 		# Shut down all [non-started] jobs
-		for job in self._jobs:
+		for job in list(self._jobs):
 			# Note: the restarting jobs are also terminated here without the owner task notification
 			# since there is no time to execute the task handlers
 			# Add terminating deferred job to the list of failures
@@ -1983,6 +3631,10 @@ class ExecPool(object):
 			# Note: only executing jobs, i.e. workers might have activated affinity
 			print('  Scheduled non-started "{}" is removed'.format(job.name), file=sys.stderr)
 		self._jobs.clear()
+		del self._deadlines[:]
+		self._inbox.clear()
+		self._canceled.clear()
+		del self._skipped[:]
 
 		# Shut down all workers
 		active = False
@@ -2017,6 +3669,8 @@ class ExecPool(object):
 		## Set _wkslim to 0 to not start any jobs
 		#self._wkslim = 0  # ATTENTION: reset of the _wkslim can break silent subsequent reuse of the execution pool
 		self.__termlock.release()
+		if self._webuiapp is not None:
+			self.__publishUi(True)
 		self._traceFailures()
 
 
@@ -2100,8 +3754,7 @@ class ExecPool(object):
 			# # Note: self._jobs scanning is time-consuming
 			and (not self.memlimit or job.mem < self.memlimit)  # and wksnum < self._wkslim
 			and (job.tstart is None) == (job.tstop is None) and (not job.timeout
-			or (True if job.tstart is None else job.tstop - job.tstart < job.timeout)
-			) and (not self._jobs or not self.memlimit or self._jobs[0].wkslim >= self._jobs[-1].wkslim)), (
+			or (True if job.tstart is None else job.tstop - job.tstart < job.timeout))), (
 			'A terminated non-rescheduled job is expected that doest not violate constraints.'
 			' "{}" terminates: {}, started: {}, jwkslim: {} vs {} pwkslim, priority: {}, {} workers, {} jobs: {};'
 			'\nmem: {:.4f} / {:.4f} GB, exectime: {:.4f} ({} .. {}) / {:.4f} sec'.format(
@@ -2123,58 +3776,33 @@ class ExecPool(object):
 		## - it does not impact on the existence of zombie procs
 		#if job.terminates:
 		#	job.proc = None  # Reset old job process if any
-		i = len(self._jobs)  # ATTENTION: required for _CHAINED_CONSTRAINTS processing
-		if not self.memlimit or not self._jobs or self._jobs[-1].wkslim > job.wkslim or (
-		self._jobs[-1].wkslim == job.wkslim and not priority):
-			self._jobs.append(job)
+		# Note: the jobs are ordered by wkslim only on the memory limit, the priority
+		# scheduling places the job to the begin of the jobs with the same wkslim
+		if self.memlimit:
+			self._jobs.push(job, job.wkslim, priority)
 		else:
-			jobsnum = i
-			i = 0
-			if priority:
-				# Add to the begin of jobs with the same wkslim
-				while i < jobsnum and self._jobs[i].wkslim > job.wkslim:
-					i += 1
-			else:
-				# Add to the end of jobs with the same wkslim
-				i = jobsnum - 1
-				while i >= 0 and self._jobs[i].wkslim < job.wkslim:
-					i -= 1
-				i += 1
-			# Note: i < jobsnum due to the top if branch
-			#if i != jobsnum:
-			self._jobs.rotate(-i)
-			self._jobs.appendleft(job)
-			self._jobs.rotate(i)
-			#else:
-			#	self._jobs.append(job)
+			self._jobs.push(job)
+		if priority:
+			self.metrics.restarted += 1
+		else:
+			self.metrics.postponed += 1
+		if self._uievents is not None:
+			self.__uievent('queued', job)
 
 		# Update limit of the worker processes of the other larger non-started jobs
-		# of the same category as the added job has
+		# of the same category as the added job has, which are scheduled before the job
 		if _CHAINED_CONSTRAINTS and job.category is not None:
-			k = 0
-			kend = i
-			while k < kend:
-				pj = self._jobs[k]
-				if pj.category == job.category and pj.size >= job.size:
+			for pj in self._jobs.category(job.category):
+				if pj is job or not self._jobs.ahead(pj, job):
+					break
+				if pj.size >= job.size:
 					# Set mem for the related non-started heavier jobs
 					if self.memlimit and pj.mem < job.mem:
 						pj.mem = job.mem
 					if job.wkslim < pj.wkslim:  # Note: normally this never happens
 						pj.wkslim = job.wkslim
-						# Update location of the jobs in the queue, move the updated
-						# job to the place before the origin
-						if kend - k >= 2:  # There is no sense to reschedule pair of subsequent jobs
-							self._jobs.rotate(-k)
-							# Move / reschedule the job
-							jmv = self._jobs.popleft()  # == pj; -1
-							assert jmv is pj, ('The rescheduling is invalid, unexpected job is removed:'
-								' {} instead of {}'.format(jmv.name, pj.name))
-							self._jobs.rotate(1 + k-i)  # Note: 1+ because one job is removed
-							self._jobs.appendleft(pj)
-							self._jobs.rotate(i-1)
-							kend -= 1  # One more job is added before i
-							k -= 1  # Note: k is incremented below
-				k += 1
+						# Update location of the job in the queue moving it to the place before the origin
+						self._jobs.relocate(pj, pj.wkslim if self.memlimit else 0, job)
 		# print('>  Nonstarted updated jobs: ', ', '.join(['{} ({})'.format(pjob.name, pjob.wkslim) for pjob in self._jobs]))
 
 
@@ -2192,6 +3820,16 @@ class ExecPool(object):
 			# Note: can be cause by the execution pool termination
 			raise ValueError('Free workers should be available ({} busy workers of {}), alive: {}'
 				.format(wksnum, self._wkslim, self.alive))
+		# Dispatch the job to the execution agent if it is more free than the local host
+		if concur and self._agents:
+			agent = self.__dispatch(job)
+			if agent is False:
+				# Note: the executors became unreachable or busy after the admission of the job
+				self._jobs.push(job, 0 if not self.memlimit else job.wkslim, True)
+				if self._uievents is not None:
+					self.__uievent('queued', job)
+				return errno.EAGAIN
+			job._agent = agent
 		#if _DEBUG_TRACE:
 		print('Starting "{}"{}, workers: {} / {}...'.format(job.name, '' if concur else ' in sequential mode'
 			, wksnum, self._wkslim), file=sys.stderr if _DEBUG_TRACE else sys.stdout)
@@ -2202,6 +3840,7 @@ class ExecPool(object):
 			job.proc = None  # Reset old job process if any
 			job.pipedout = None  # Reset piped stdout if any
 			job.pipederr = None  # Reset piped stderr if any
+			job._pipetails = None  #pylint: disable=W0212
 			job.tstop = None  # Reset the completion / termination time
 			job._restarting = False
 			# Note: retain previous value of mem for better scheduling, it is the valid value for the same job
@@ -2211,10 +3850,18 @@ class ExecPool(object):
 		jst = job.task
 		# Note: `jst not in self.tasks` whould prevent super-tasks extension after the jobs started
 		# because a task starts when its first job starts.
+		job.tstart = time.perf_counter()
 		while jst is not None:
+			if jst not in self.tasks:
+				# Schedule the deadline of the starting task
+				if jst.timeout:
+					heapq.heappush(self._deadlines, (job.tstart + jst.timeout, next(self._dlseq), jst))
+				if self._uievents is not None:
+					self._uitasks.add(jst)
+					self._uievents.append(('started', {'type': 'task', 'name': jst.name
+						, 'task': None if jst.task is None else jst.task.name, 'time': time.time()}))
 			self.tasks.add(jst)
 			jst = jst.task
-		job.tstart = time.perf_counter()
 		if job.onstart:
 			# print('>  Starting onstart() for job "{}"'.format(job.name), file=sys.stderr)
 			try:
@@ -2222,6 +3869,10 @@ class ExecPool(object):
 			except Exception as err:  #pylint: disable=W0703
 				print('ERROR in onstart() callback of "{}": {}, the job is discarded. {}'
 					.format(job.name, err, traceback.format_exc(5)), file=sys.stderr)
+				# Release the worker of the execution agent acquired for the discarded job
+				if job._agent is not None:
+					job._agent.nbusy -= 1
+					job._agent = None
 				errinf = getattr(err, 'errno', None)
 				return -1 if errinf is None else errinf.errorcode
 		# Consider custom output channels for the job
@@ -2231,18 +3882,22 @@ class ExecPool(object):
 		try:
 			# Initialize job._stdout/err by the required output channel
 			timestamp = None
-			for joutp in (job.stdout, job.stderr):
+			# Note: stdout and stderr can be the same object (PIPE or file name), so they are distinguished by the index
+			for iout, joutp in enumerate((job.stdout, job.stderr)):
 				if joutp and isinstance(joutp, str):
+					# The output files of the remote job are written by the agent
+					if job._agent is not None:
+						continue
 					basedir = os.path.split(joutp)[0]
 					if basedir and not os.path.exists(basedir):
 						os.makedirs(basedir)
 					try:
 						fout = None
-						if joutp is job.stdout:
+						if iout == 0:
 							fout = open(joutp, 'a')  # Note: the file is closed by the ExecPool on the job worker completion
 							job._stdout = fout  #pylint: disable=W0212
 							outcapt = 'stdout'
-						elif joutp is job.stderr:
+						elif iout == 1:
 							fout = open(joutp, 'a')  # Note: the file is closed by the ExecPool on the job worker completion
 							job._stderr = fout  #pylint: disable=W0212
 							outcapt = 'stderr'
@@ -2256,28 +3911,47 @@ class ExecPool(object):
 					except IOError as err:
 						print('ERROR on opening custom {} "{}" for "{}": {}. Default is used.'
 							.format(outcapt, joutp, job.name, err), file=sys.stderr)
-						if joutp is job.stdout:
+						if iout == 0:
 							job._stdout = sys.stdout
-						if joutp is job.stderr:
+						else:
 							job._stderr = sys.stderr
 				else:
-					if joutp is job.stdout:
+					if iout == 0:
 						job._stdout = joutp
-					elif joutp is job.stderr:
+					elif iout == 1:
 						job._stderr = joutp
 					else:
 						raise ValueError('Invalid output stream channel: ' + str(joutp))
 
 			# print('> "{}" output channels:\n\tstdout: {}\n\tstderr: {}'.format(job.name
 			# 	, job.stdout, job.stderr))  # Note: write to log, not to the stderr
-			if job.args:
+			pyjob = isinstance(job, PyJob)
+			if job.args or pyjob:
 				# Consider CPU affinity
-				# Note: the exception is raised by .index() if the _affinity table
-				# is corrupted (doesn't have the free entry)
-				# Index in the affinity table to bind process to the CPU/core
-				iafn = -1 if not self._affinity or job._omitafn else self._affinity.index(None)  #pylint: disable=W0212
-				if iafn >= 0:
-					job.args = [_AFFINITYBIN, '-c', self._afnmask(iafn)] + list(job.args)
+				# Note: the exception is raised by .acquire() if the CPUs allocator
+				# is corrupted (doesn't have the free slot)
+				# Slot of the CPUs allocator to bind process to the CPU/core
+				iafn = -1
+				# The remote job is executed by the proxy process relaying its output and exit code
+				args = job.args if job._agent is None else job._agent.args(job)
+				mbind = False  # Bind the memory of the spawning thread to the NUMA node to be inherited by the job process
+				if self.cpualloc and not job._omitafn and job._agent is None:  #pylint: disable=W0212
+					node = None  # Preferable NUMA node of the CPUs
+					if self._membind and (job.membind if job.membind is not None else self.membind):
+						frees = nodesfreemem()
+						node = max(self.cpualloc.freenodes(), key=lambda nd: frees[nd])
+					iafn = self.cpualloc.acquire(job, node)
+					job.cpus = self.cpualloc.cpus(iafn)
+					if node is not None:
+						job.memnode = self.cpualloc.node(iafn)
+						if self._numabin is None:
+							self._numabin = which(_NUMABIN) or ''
+						if self._numabin and not pyjob:
+							args = [self._numabin, '--membind={}'.format(job.memnode)] + list(args)
+						elif not pyjob:
+							mbind = True
+					if not pyjob and not _SETAFFINITY:
+						args = [_AFFINITYBIN, '-c', self.cpualloc.mask(iafn)] + list(args)
 				# print('>  Opening proc for "{}" with:\n\tjob.args: {},\n\tcwd: {}'.format(job.name
 				# 	, ' '.join(job.args), job.workdir), file=sys.stderr)
 				acqlock = self.__termlock.acquire(False, 0.01)  # 10 ms
@@ -2288,8 +3962,71 @@ class ExecPool(object):
 					# of the whole (already terminated) execution pool
 					raise EnvironmentError((errno.EINTR,  # errno.ERESTART
 						'Jobs can not be started because the execution pool has been terminated'))
-				# bufsize=-1 - use system default IO buffer size
-				job.proc = subprocess.Popen(job.args, bufsize=-1, cwd=job.workdir, stdout=job._stdout, stderr=job._stderr)
+				# Account and limit memory of the whole process tree by the dedicated cgroup if possible,
+				# otherwise the process tree is sampled on the memory updates
+				if _CGROUP and self.memlimit and job._agent is None:
+					self._cgroups += 1
+					try:
+						job._cgroup = JobCgroup(os.path.join(_CGROUP, 'mpe{}_{}'.format(os.getpid(), self._cgroups))
+							, job.memlim)
+					except (IOError, OSError) as err:
+						job._cgroup = None
+						print('WARNING, the cgroup can not be created for "{}", the process tree is sampled: {}'
+							.format(job.name, err), file=sys.stderr)
+				if pyjob:
+					if self._pyctx is None:
+						self._pyctx = pycontext()
+						if self._pyctx is None:
+							if get_context is None:
+								raise OSError(errno.ENOSYS, 'Python jobs are not supported on this platform')
+							# Note: the workers are started by the default (cold) method if the forkserver is not supported
+							self._pyctx = get_context()
+							print('WARNING, warm Python workers are not supported on this platform'
+								', the default start method is used: ' + self._pyctx.get_start_method(), file=sys.stderr)
+					# Note: the timestamp headers should be written before the worker output
+					for fout in (job._stdout, job._stderr):
+						if fout not in (None, sys.stdout, sys.stderr):
+							fout.flush()
+					job.proc = PyProc(self._pyctx, job.func, job.fargs, job.fkwargs, job.workdir
+						, tuple(outp if isinstance(outp, str) else None for outp in (job.stdout, job.stderr))
+						, job.cpus
+						, None if not _CGROUP else job._cgroup, job.memnode)
+				else:
+					# Bind the spawning thread to the allocated CPUs to be inherited by the started process,
+					# which avoids the extra exec of _AFFINITYBIN and the execution before the binding
+					afnorig = None  # Original affinity of the spawning thread
+					if job.cpus is not None and _SETAFFINITY:
+						afnorig = os.sched_getaffinity(0)  #pylint: disable=E1101
+						os.sched_setaffinity(0, job.cpus)  #pylint: disable=E1101
+					# The memory policy is bound the same way, which is safe with threads unlike the binding
+					# in the forked child (preexec_fn)
+					if mbind and not mempolicy(job.memnode):
+						mbind = False
+						job.memnode = None
+						print('WARNING, memory of "{}" can not be bound to the NUMA node: neither {}'
+							' nor set_mempolicy are available'.format(job.name, _NUMABIN), file=sys.stderr)
+					try:
+						# bufsize=-1 - use system default IO buffer size
+						job.proc = subprocess.Popen(args, bufsize=-1, cwd=job.workdir, stdout=job._stdout
+							, stderr=job._stderr)
+					finally:
+						if afnorig is not None:
+							os.sched_setaffinity(0, afnorig)  #pylint: disable=E1101
+						if mbind:
+							mempolicy()
+					# Attach the started process to the cgroup by the parent, which is safe with threads unlike
+					# the attachment in the forked child (preexec_fn)
+					# Note: the descendants forked by the job before the attachment are not accounted in the cgroup
+					if _CGROUP and job._cgroup is not None:
+						try:
+							job._cgroup.attach(job.proc.pid)
+						except (IOError, OSError) as err:
+							# Note: the completed process can not be attached
+							if job.proc.poll() is None:
+								print('WARNING, "{}" can not be attached to the cgroup, the process tree is sampled: {}'
+									.format(job.name, err), file=sys.stderr)
+							job._cgroup.release()
+							job._cgroup = None
 				# Update job logging descriptors in case of PIPEs to the actual system objects
 				if job._stdout is subprocess.PIPE:
 					job._stdout = job.proc.stdout
@@ -2297,23 +4034,24 @@ class ExecPool(object):
 					job._stderr = job.proc.stderr
 				if concur:
 					self._workers.add(job)
+					self.__watchWorker(job)
+				if self._journal is not None:
+					self._journal.write('S', JobJournal.key(job), job.proc.pid)
+				if self._uievents is not None:
+					self.__uievent('started', job, pid=job.proc.pid)
 				# ATTENTION: the exception can be raised before the lock releasing on process creation
 				self.__termlock.release()
 				# Note: an exception can be thrown below, but the lock is already
 				# released and should not be released again
 				acqlock = False
 				if iafn >= 0:
-					try:
-						self._affinity[iafn] = job.proc.pid
-						print('"{jname}" #{pid}, iafn: {iafn} (CPUs #: {icpus})'
-							.format(jname=job.name, pid=job.proc.pid, iafn=iafn
-							, icpus=self._afnmask(iafn)))  # Note: write to log, not to the stderr
-					except IndexError as err:
-						# Note: BaseException is used to terminate whole execution pool
-						raise BaseException('Affinity table is inconsistent: {}'.format(err))
-				# Wait a little bit to start the process besides its scheduling
+					print('"{jname}" #{pid}, iafn: {iafn} (CPUs #: {icpus}){memnode}'
+						.format(jname=job.name, pid=job.proc.pid, iafn=iafn
+						, icpus=self.cpualloc.mask(iafn), memnode='' if job.memnode is None
+						else ', memory node: {}'.format(job.memnode)))  # Note: write to log, not to the stderr
+				# Defer the start of the subsequent jobs instead of blocking the scheduler
 				if job.startdelay > 0:
-					time.sleep(job.startdelay)
+					self._tadmit = max(self._tadmit, time.perf_counter() + job.startdelay)
 		except BaseException as err:  # Should not occur: subprocess.CalledProcessError
 			# ATTENTION: the exception could be raised on process creation or on not self.alive
 			# with acquired lock, which should be released
@@ -2374,6 +4112,102 @@ class ExecPool(object):
 		return job.proc.returncode
 
 
+	def __watchWorker(self, job):
+		"""Subscribe to the completion notification of the started worker
+
+		job  - the started job having the worker process
+		"""
+		if self._wksel is None:
+			return
+		try:
+			pidfd = os.pidfd_open(job.proc.pid)  #pylint: disable=E1101
+		except OSError as err:
+			# The worker is revised with the pool latency in this case
+			print('WARNING, pidfd can not be opened for "{}" #{}: {}'.format(
+				job.name, job.proc.pid, err), file=sys.stderr)
+			return
+		self._pidfds[job] = pidfd
+		self._wksel.register(pidfd, selectors.EVENT_READ, job)
+		# Drain the piped output during the execution to avoid blocking of the worker on the filled pipe
+		if job.proc.stdout is None and job.proc.stderr is None:
+			return
+		job._pipetails = tuple(None if pipe is None else PipeTail(pipe, job.pipetail, plog)
+			for pipe, plog in ((job.proc.stdout, job.poutlog), (job.proc.stderr, job.perrlog)))
+		for ptl in job._pipetails:
+			if ptl is not None:
+				self._wksel.register(ptl.fd, selectors.EVENT_READ, ptl)
+
+
+	def __unwatchWorker(self, job):
+		"""Unsubscribe from the completion notification of the worker
+
+		job  - the completing job
+		"""
+		pidfd = self._pidfds.pop(job, None)
+		if pidfd is None:
+			return
+		self._wksel.unregister(pidfd)
+		os.close(pidfd)
+		if job._pipetails is None:
+			return
+		# Fetch the remained output, the pipes are closed on the job completion
+		outs = []
+		for ptl in job._pipetails:
+			if ptl is None:
+				outs.append(None)
+				continue
+			try:
+				self._wksel.unregister(ptl.fd)
+			except KeyError:  # The pipe has already reached EOF
+				pass
+			try:
+				ptl.drain()
+			except (OSError, IOError) as err:
+				print('WARNING, piped output draining failed for "{}": {}'.format(job.name, err), file=sys.stderr)
+			outs.append(ptl.output())
+			ptl.close()
+		job.pipedout, job.pipederr = outs
+
+
+	def __waitWorkers(self, timeout):
+		"""Wait for the completion of any worker during the specified time
+
+		timeout: float  - max waiting time in seconds
+
+		The piped output of the workers is drained meanwhile.
+
+		return  completed: bool  - whether some worker has been completed
+		"""
+		if timeout <= 0:
+			return False
+		if not self._pidfds:
+			time.sleep(timeout)
+			return False
+		tend = time.perf_counter() + timeout
+		while timeout > 0:
+			try:
+				events = self._wksel.select(timeout)
+			except (OSError, IOError) as err:  # EINTR before Python 3.5
+				if err.errno != errno.EINTR:
+					raise
+				events = ()
+			completed = False
+			for key, _ in events:
+				if not isinstance(key.data, PipeTail):
+					completed = True
+					continue
+				try:
+					if not key.data.drain():
+						self._wksel.unregister(key.fd)
+				except (OSError, IOError) as err:
+					self._wksel.unregister(key.fd)
+					print('WARNING, piped output draining failed: {}'.format(err), file=sys.stderr)
+			if completed:
+				return True
+			timeout = tend - time.perf_counter()
+		return False
+
+
 	def __complete(self, job, graceful=None):
 		"""Complete the job clearing affinity if required
 
@@ -2382,13 +4216,28 @@ class ExecPool(object):
 			due to some error or externally).
 			None means unknown and should be identified automatically.
 		"""
-		if self._affinity and not job._omitafn and job.proc is not None:  #pylint: disable=W0212
-			try:
-				self._affinity[self._affinity.index(job.proc.pid)] = None
-			except ValueError:
-				print('WARNING, affinity cleanup is requested to the job "{}" without the activated affinity'
+		self.__unwatchWorker(job)
+		agent = job._agent  # The execution agent of the remote job
+		if agent is not None:
+			agent.nbusy -= 1
+			job._agent = None
+		# Return the dedicated CPUs to the allocator
+		if self.cpualloc and job.cpus is not None:
+			if self.cpualloc.release(job) is None:
+				print('WARNING, affinity cleanup is requested to the job "{}" without the allocated CPUs'
 					.format(job.name), file=sys.stderr)
-				# Do nothing if the affinity is not set for this process
+			job.cpus = None
+			job.memnode = None
+		if _CGROUP and job._cgroup is not None:
+			# Fetch the exact peak and identify termination of the job by the kernel on the memory limit
+			peak = job._cgroup.peak()
+			if peak is not None:
+				job._mempeak = inGigabytes(peak)
+			if job._cgroup.oomkills():
+				job.mem = max(job.mem, job.memlim)
+				graceful = False
+				print('WARNING, "{}" is terminated by the memory limit of {:.4f} GB'.format(job.name, job.memlim)
+					, file=sys.stderr)
 		if graceful is None:
 			graceful = not job.terminates and job.proc is not None and not job.proc.returncode
 		# Note: job completion also calls finalization of the owner task and
@@ -2398,6 +4247,26 @@ class ExecPool(object):
 		except Exception as err:  #pylint: disable=W0703
 			print('ERROR, job "{}" completion failed: {}. {}'.format(
 				job.name, err, traceback.format_exc(5)), file=sys.stderr)
+		if self._journal is not None and job.tstop is not None:
+			self._journal.write('D', JobJournal.key(job), 0 if graceful else (job.proc is not None and job.proc.returncode) or -1
+				, job.tstop - job.tstart)
+		if job.proc is not None and job.tstop is not None:
+			# Update the average duration of the jobs for the adaptive tick
+			duration = job.tstop - job.tstart
+			self._jobdur = duration if self._jobdur is None else (
+				self._jobdur + (duration - self._jobdur) * self._DURWEIGHT)
+			# Persist the resource consumption of the executed job, which is not evaluated for the remote jobs
+			if self._history is not None and agent is None:
+				self._history.add(job)
+			self.metrics.jobtime.observe(duration)
+			if _LIMIT_WORKERS_RAM and job._mempeak:
+				self.metrics.jobmem.observe(job._mempeak)
+		if _CGROUP:
+			if job._cgroup is not None and not job._cgroup.release():
+				self._cgstale.append(job._cgroup)
+			job._cgroup = None
+			if self._cgstale:
+				self._cgstale = [cg for cg in self._cgstale if not cg.release()]
 		# Close process-related file/object descriptors
 		# ATTENTION: PIPEd channels should be closed only AFTER the job.complete(),
 		# which redirects their output to the log files if required.
@@ -2427,9 +4296,152 @@ class ExecPool(object):
 			self.jobsdone += 1
 		elif not job._restarting:
 			self.failures.append(JobInfo(job))  # Note: job.tstop should be defined here
+		if self._uievents is not None:
+			self._uimems.pop(job, None)
+			if graceful:
+				self.__uievent('finished', job, pid=None if job.proc is None else job.proc.pid
+					, rcode=None if job.proc is None else job.proc.returncode
+					, duration=None if job.tstop is None else job.tstop - job.tstart)
+			else:
+				self.__uifailures()
+			# Publish the completed tasks
+			task = job.task
+			while task is not None and task.tstop is not None and task in self._uitasks:
+				self._uitasks.remove(task)
+				self._uievents.append(('finished' if not task.numterm else 'failed', {'type': 'task'
+					, 'name': task.name, 'task': None if task.task is None else task.task.name, 'time': time.time()
+					, 'numdone': task.numdone, 'numterm': task.numterm, 'duration': task.tstop - task.tstart}))
+				task = task.task
+
+
+	def __tick(self):
+		"""Latency of the workers revision adapted to the expected duration of the executing jobs
+
+		The expected duration of the job is its predicted execution time (the history or
+		the average duration of the completed jobs), which is extended by the elapsed
+		time of the longer running job. So, the tick is short for the sub-second jobs
+		and grows up to the latency when all executing jobs are long. The jobs having
+		unknown expected duration do not shorten the tick.
+
+		return  tick: float  - the tick in seconds
+		"""
+		if not self._adaptive or not self._workers:
+			return self.latency
+		tcur = time.perf_counter()
+		expdur = self.latency / self._TICKRATIO  # The least expected duration of the executing jobs
+		for job in self._workers:
+			dur = job.exptime if job.exptime is not None else self._jobdur
+			if dur is None:
+				continue
+			expdur = min(expdur, max(tcur - job.tstart, dur))
+		return max(self._TICKMIN, expdur * self._TICKRATIO)
+
+
+	def __memfree(self, refresh=False):
+		"""Available memory of the system from the snapshot
+
+		The snapshot is refreshed on the constraints revision or when it is older than
+		the termination latency, so the submission of many jobs does not query the system.
+
+		refresh: bool  - refresh the snapshot
+
+		return  float  - available memory in gigabytes
+		"""
+		tcur = time.perf_counter()
+		if refresh or self._memfree is None or tcur - self._tmemfree >= self._termlatency:
+			self._memfree = _memavail()
+			self._tmemfree = tcur
+		return self._memfree
+
+
+	def __dispatch(self, job):
+		"""Select the executor of the job among the local host and the execution agents
+
+		The executors having free workers are weighted by the fitting of the expected
+		memory of the job, the number of free workers (cores) and then the free RAM.
+		The workers limit is updated by the reachable agents, so the job is admitted
+		only when some executor has a free worker.
+
+		job: Job  - the starting job
+
+		return  AgentLink  - the execution agent acquired for the job, None means the local host
+			and False means the absence of the free executors, so the job should be queued
+		"""
+		jmem = max(job.mem, self._history.estimate(job) or 0)
+		wksloc = len(self._workers) - sum(agent.nbusy for agent in self._agents)  # Local workers
+		res = False
+		rkey = None
+		if wksloc < self._wksloc:
+			memfree = self.__memfree()
+			res = None
+			rkey = (memfree >= jmem, self._wksloc - wksloc, memfree)
+		# Note: PyJob is executed only locally
+		if not isinstance(job, PyJob):
+			for agent in self._agents:
+				# Note: the agent info is refreshed not more often than the workers termination latency,
+				# the unreachable agents are probed rarely since the probing blocks the scheduling
+				if not agent.update(self._termlatency if agent.wksnum else self._AGENTPROBE) or agent.free() <= 0:
+					continue
+				akey = (agent.memfree >= jmem, agent.free(), agent.memfree)
+				if rkey is None or akey > rkey:
+					res = agent
+					rkey = akey
+			# Consider only the reachable agents in the workers limit retaining their dispatched jobs
+			self._wkslim = self._wksloc + sum(max(agent.wksnum, agent.nbusy) for agent in self._agents)
+		if res:
+			res.nbusy += 1
+		return res
+
+
+	def __cancel(self, job, tcur, reason):
+		"""Cancel the non-started job adding it to the failures
+
+		job  - the non-started job, which is not in the queue
+		tcur: float  - the current time
+		reason: str  - cause of the cancellation for the tracing
+		"""
+		if job.onfinish:
+			applyCallback(job.onfinish, job.name)
+		# Note: the non-started (including the restarting) jobs are among the active items of the task
+		if job.task:
+			job.task.finished(job, False)
+		self.failures.append(JobInfo(job, tcur))
+		print('WARNING, non-started "{}" is canceled by {}'.format(job.name, reason), file=sys.stderr)
+
+
+	def __expireTasks(self, tcur):
+		"""Terminate the tasks having the expired deadlines
+
+		The non-started jobs of the expired tasks (including their subtasks) are
+		canceled and their workers are terminated in a single pass; the workers are
+		completed on the subsequent revisions without the restart.
+
+		tcur: float  - the current time
+		"""
+		expired = False
+		while self._deadlines and self._deadlines[0][0] <= tcur:
+			task = heapq.heappop(self._deadlines)[2]
+			# Note: the completed tasks are omitted
+			if task.tstop is None and not task.expired:
+				task.expired = True
+				expired = True
+				print('WARNING, "{}" is terminated by the timeout of {:.4f} sec'.format(task.name, task.timeout)
+					, file=sys.stderr)
+		if not expired:
+			return
+		for job in list(self._jobs):
+			if taskexpired(job):
+				self._jobs.remove(job)
+				self.__cancel(job, tcur, 'the task timeout')
+		for job in self._workers:
+			if not job.terminates and taskexpired(job):
+				job.terminates += 1
+				# The terminated job should complete the owner task instead of being postponed
+				job._restarting = False
+				job.proc.terminate()
 
 
-	def __reviseWorkers(self):
+	def __reviseWorkers(self, constrain=True):
 		"""Revise the workers
 
 		Check for the completed jobs and their timeouts, update corresponding
@@ -2437,7 +4449,21 @@ class ExecPool(object):
 		Apply chained termination and rescheduling on timeout and memory
 		constraints violation if _CHAINED_CONSTRAINTS.
 		NOTE: This function is not termination safe (might yield exceptions) but it doesn't matter.
+
+		constrain: bool  - revise the timeout and memory constraints of the workers
+			updating their memory consumption, otherwise only the completed workers
+			are processed using the last evaluated memory consumption
 		"""
+		# Complete the jobs skipped according to the journal
+		if self._skipped:
+			skipped = self._skipped
+			self._skipped = []
+			for job in skipped:
+				try:
+					job.task.finished(job, True)
+				except Exception as err:  #pylint: disable=W0703
+					print('ERROR, the task "{}" notification on the skipped job "{}" failed: {}. {}'.format(
+						job.task.name, job.name, err, traceback.format_exc(5)), file=sys.stderr)
 		# Process completed jobs, check timeouts and memory constraints matching
 		completed = set()  # Completed workers:  {proc,}
 		memall = 0.  # Consuming memory by workers
@@ -2452,6 +4478,11 @@ class ExecPool(object):
 			if job.proc.poll() is not None:  # Not None means the process has been terminated / completed
 				completed.add(job)
 				continue
+			# Reap the completed workers only, the constraints are revised with the pool latency
+			if not constrain:
+				if self.memlimit:
+					memall += job.mem
+				continue
 
 			exectime = tcur - job.tstart
 			# Update memory statistics (if required) and skip jobs that do not exceed the specified time/memory constraints
@@ -2557,25 +4588,22 @@ class ExecPool(object):
 			# Traverse over the non-started jobs with defined job category and size removing too heavy jobs
 			# if _DEBUG_TRACE >= 2:
 			# 	print('>  Updating chained constraints in non-started jobs: ', ', '.join([job.name for job in self._jobs]))
-			jrot = 0  # Accumulated rotation
-			ij = 0  # Job index
-			while ij < len(self._jobs) - jrot:  # Note: len(jobs) catches external jobs termination / modification
-				job = self._jobs[ij]
-				if job.category is not None and job.size:
+			# Note: only the non-started jobs of the origins categories are fetched using the queue index
+			for category in set(jorg.category for jorg in itertools.chain(viewvalues(jtorigs), viewvalues(jmorigs))):
+				for job in self._jobs.category(category):
+					if not job.size:
+						continue
 					# Travers over the chain origins and check matches skipping the origins themselves
 					# Time constraints
 					for jorg in viewvalues(jtorigs):
 						if (job.category == jorg.category
 						and job.size * job.slowdown >= jorg.size * jorg.slowdown):
 							# Remove the item adding it to the list of failed jobs
-							self._jobs.rotate(-ij)
-							jrot += ij
+							self._jobs.remove(job)
 							# Notify owner task of the failed restarting jobs
-							jrm = self._jobs.popleft()
-							if jrm._restarting and jrm.task:
-								jrm.task.finished(self, False)
-							self.failures.append(JobInfo(jrm, tcur))
-							ij = -1  # Later +1 is added, so the index will be 0
+							if job._restarting and job.task:
+								job.task.finished(self, False)
+							self.failures.append(JobInfo(job, tcur))
 							print('WARNING, non-started "{}" with weight {} is canceled by timeout chain from "{}" with weight {}'.format(
 								job.name, job.size * job.slowdown, jorg.name, jorg.size * jorg.slowdown), file=sys.stderr)
 							break
@@ -2585,20 +4613,14 @@ class ExecPool(object):
 							if (job.category == jorg.category
 							and job.lessmem(jorg) is False):
 								# Remove the item adding it to the list of failed jobs
-								self._jobs.rotate(-ij)
-								jrot += ij
+								self._jobs.remove(job)
 								# Notify owner task of the failed restarting jobs
-								jrm = self._jobs.popleft()
-								if jrm._restarting and jrm.task:
-									jrm.task.finished(self, False)
-								self.failures.append(JobInfo(jrm, tcur))
-								ij = -1  # Later +1 is added, so the index will be 0
+								if job._restarting and job.task:
+									job.task.finished(self, False)
+								self.failures.append(JobInfo(job, tcur))
 								print('WARNING, non-started "{}" with size {} is canceled by memory limit chain from "{}" with size {}'
 									' and mem {:.4f}'.format(job.name, job.size, jorg.name, jorg.size, jorg.mem), file=sys.stderr)
 								break
-				ij += 1
-			# Recover initial order of the jobs
-			self._jobs.rotate(jrot)
 		# check for the external termination
 		if not self.alive:
 			return
@@ -2613,7 +4635,7 @@ class ExecPool(object):
 		# Check memory limitation fulfilling for all remained processes and resource consumption counters
 		if self.memlimit:
 			# Amount of free RAM (RSS) in GB; skip it if memlimit is not requested
-			memfree = inGigabytes(psutil.virtual_memory().available)
+			memfree = self.__memfree(constrain)
 		# Jobs should use less memory than the limit
 		# Consider terminatin of all executing workers by the constraints violation
 		if self._workers and self.memlimit and (memall >= self.memlimit or memfree <= self._MEMLOW):
@@ -2698,17 +4720,25 @@ class ExecPool(object):
 			# Restart the job if it was terminated and should be restarted
 			if not job.terminates:
 				continue
+			if job in self._canceled:
+				self._canceled.remove(job)
+				print('WARNING, "{}" #{} is terminated by the cancellation request, executed: {:.4f} sec'
+					.format(job.name, job.proc.pid, exectime), file=sys.stderr)
+				continue
+			if job.timeout and exectime >= job.timeout:
+				self.metrics.timeouts += 1
 			print('WARNING, "{}" #{} is terminated because of the {} violation'
 				', chtermtime: {}, consumes {:.4f} / {:.4f} GB, timeout {:.4f} sec, executed: {:.4f} sec ({} h {} m {:.4f} s)'
 				.format(job.name, job.proc.pid
-				, 'timeout' if job.timeout and exectime >= job.timeout else (
+				, 'timeout' if job.timeout and exectime >= job.timeout else 'task timeout' if taskexpired(job) else (
 					('' if not self.memlimit or job.mem >= self.memlimit
 						or (job.memlim and job.mem >= job.memlim) else 'group ') + 'memory limit')
 				, None if not _CHAINED_CONSTRAINTS else job.chtermtime
 				, 0 if not self.memlimit else job.mem, self.memlimit
 				, job.timeout, exectime, *secondsToHms(exectime)), file=sys.stderr)
 			# Skip memory limit and timeout violating jobs that do not require auto-restart (applicable only for the timeout)
-			if (job.timeout and exectime >= job.timeout and not job.rsrtonto) or (_CHAINED_CONSTRAINTS
+			# and the jobs of the expired tasks
+			if (job.timeout and exectime >= job.timeout and not job.rsrtonto) or taskexpired(job) or (_CHAINED_CONSTRAINTS
 			# Note: self.memlimit indicates that ExecPool tracs the memory consumption (sets job.mem)
 			and job.chtermtime is not None) or (self.memlimit and (job.mem >= self.memlimit
 			or (job.memlim and job.mem >= job.memlim))):
@@ -2733,6 +4763,7 @@ class ExecPool(object):
 				#		, file=sys.stderr)
 				#assert not self.memlimit or memall + job.mem * self._JMEMTRR < self.memlimit, (
 				#	'Group exceeding of the memory limit should be already processed')
+				self.metrics.restarted += 1
 				if not self.__start(job) and self.memlimit:  # Note: successful start returns 0
 					memall += job.mem  # Reuse .mem from the previous run if exists
 				# Note: do not call complete() on failed restart
@@ -2754,36 +4785,57 @@ class ExecPool(object):
 		# Start subsequent job or postpone it further
 		# if _DEBUG_TRACE >= 2:
 		# 	print('  Nonstarted jobs: ', ', '.join(['{} ({})'.format(job.name, job.wkslim) for job in self._jobs]))
+		# Note: all startable jobs are admitted in a single pass bounded by the memory and workers limits
 		if not terminating or not self._workers:  # Start only after the terminated jobs terminated and released the memory
-			while self._jobs and len(self._workers) < self._wkslim and self.alive:
+			memres = 0.  # Memory reserved for the jobs started in this pass, which do not consume it yet
+			while self._jobs and len(self._workers) < self._wkslim and self.alive and (
+			self._tadmit <= time.perf_counter()):
 				#if _DEBUG_TRACE >= 3:
 				#	print('  "{}" (expected totmem: {:.4f} / {:.4f} GB) is being rescheduled, {} non-started jobs: {}'
-				#		.format(self._jobs[0].name, 0 if not self.memlimit else memall + job.mem, self.memlimit
+				#		.format(self._jobs.peek().name, 0 if not self.memlimit else memall + job.mem, self.memlimit
 				#		, len(self._jobs), ', '.join([j.name for j in self._jobs])), file=sys.stderr)
-				job = self._jobs[0]
+				job = self._jobs.peek()
+				jmemx = 0.  # Memory reserved for the job
 				# Jobs should use less memory than the limit, a worker process violating
 				# (time/memory) constraints are already filtered out
 				# Note: self._workers to not postpone the single existing job
-				if self.memlimit:
+				if self._workers and self.memlimit:
 					# Extended estimated job mem
-					jmemx = (job.mem if job.mem else memall / (1 + len(self._workers))) * self._JMEMTRR
-				if self._workers and self.memlimit and ((memall + jmemx >= self.memlimit
-				# Note: omit the low memory condition for a single worker, otherwise the pool can't be executed
-				) or (memfree - jmemx <= self._MEMLOW)):  # (memfree - jmemx <= self._MEMLOW and self._workers)
-					# Note: only restarted jobs have defined mem
-					# Postpone the job updating its workers limit
-					assert job.mem < self.memlimit and (not job.memlim or job.mem < job.memlim
-						), 'The workers exceeding memory constraints were already filtered out'
-					if job.mem:
-						self.__postpone(self._jobs.popleft())
-					break
-				elif not self.__start(self._jobs.popleft()):  # Note: successful start returns 0
-					if self.memlimit:
+					jmemx = self.__memestimate(job, memall)
+					# Note: omit the low memory condition for a single worker, otherwise the pool can't be executed
+					memavl = min(self.memlimit - memall, memfree - self._MEMLOW) - memres
+					if jmemx >= memavl:
+						# Pack the largest fitting job among the first scheduled jobs (first-fit decreasing)
+						# instead of starting the job, which is likely to be terminated by the memory limit
+						job, jmemx = self.__packable(memall, memavl)
+						if job is None:
+							job = self._jobs.peek()
+							# Note: only restarted jobs have defined mem
+							# Postpone the job updating its workers limit
+							assert job.mem < self.memlimit and (not job.memlim or job.mem < job.memlim
+								), 'The workers exceeding memory constraints were already filtered out'
+							if job.mem:
+								self.__postpone(self._jobs.pop())
+							break
+					self._jobs.remove(job)
+					memres += jmemx
+				else:
+					self._jobs.pop()
+				errcode = self.__start(job)
+				if not errcode:  # Note: successful start returns 0
+					if self.memlimit and job.mem:
 						memall += job.mem  # Reuse .mem from the previous run if exists
+						# The reservation is retained only for the expected growth of the accounted memory
+						memres -= min(jmemx, job.mem)
 					# If the jobs terminated and workers became empty then only a single worker should be created
 					if terminating:
 						break
-		assert (self._workers or not self._jobs) and self._wkslim and (
+				else:
+					memres -= jmemx  # The job is not started
+					if errcode == errno.EAGAIN:
+						break  # The job is queued back since the executors have no free workers
+		# Note: the admission of the jobs can be deferred by the startdelay of the started job
+		assert (self._workers or not self._jobs or self._tadmit > time.perf_counter()) and self._wkslim and (
 			len(self._workers) <= self._wkslim), (
 			'Worker processes should always exist if non-started jobs are remained:'
 			'  workers: {}, wkslim: {}, jobs: {}'.format(len(self._workers)
@@ -2804,6 +4856,10 @@ class ExecPool(object):
 			self.alive = True
 			del self.failures[:]
 			self.tasks.clear()
+			del self._deadlines[:]
+			self._canceled.clear()
+			del self._skipped[:]
+			self._uitasks.clear()
 		else:
 			raise ValueError('Terminating dirty execution pool can not be reseted:'
 				'  alive: {}, {} workers, {} jobs'.format(self.alive
@@ -2837,56 +4893,234 @@ class ExecPool(object):
 		# Start the execution timer
 		if self._tstart is None:
 			self._tstart = time.perf_counter()
-		# Initialize the [latest] value of job workers limit
-		if self.memlimit and not job.wkslim:
-			# Consider earlier executed jobs and updated execution pool
-			job.wkslim = self._wkslim if not job.wkslim else min(job.wkslim, self._wkslim)
+		errcode = self.__prepare(job)
+		if errcode is not None:
+			return errcode
+		errcode = 0
 		if concur:
 			# Evaluate total memory consumed by the worker processes
+			memall = 0.
+			memfree = 0.
 			if self.memlimit:
-				memall = 0.
 				for wj in self._workers:
 					memall += wj.mem
 				# Amount of free RAM (RSS) in GB; skip it if memlimit is not requested
-				memfree = inGigabytes(psutil.virtual_memory().available)
-				# Extended estimated job mem
-				jmemx = (job.mem if job.mem else memall / (1 + len(self._workers))) * self._JMEMTRR
+				memfree = self.__memfree()
 			# Schedule the job, postpone it if already non-started jobs exist or there are no any free workers
-			if self._workers and (self._jobs or len(self._workers) >= self._wkslim or (
-			self.memlimit and ((memall + jmemx >= self.memlimit
-			# Note: omit the low memory condition for a single worker, otherwise the pool can't be executed
-			) or (memfree - jmemx <= self._MEMLOW)))):  # (memfree - jmemx <= self._MEMLOW and self._workers)
-				# if _DEBUG_TRACE >= 2:
-				# 	print('  Postponing "{}", {} jobs, {} workers, {} wkslim'
-				# 		', group memlim violation: {}, lowmem: {}'.format(job.name, len(self._jobs)
-				# 		, len(self._workers), self._wkslim, self.memlimit and (memall and memall + (job.mem if job.mem else
-				# 		memall / (1 + len(self._workers))) * self._JMEMTRR >= self.memlimit)
-				# 		, self.memlimit and (memfree - jmemx <= self._MEMLOW and self._workers)))
-				if not self.memlimit or not self._jobs or self._jobs[-1].wkslim >= job.wkslim:
-					self._jobs.append(job)
-				else:
-					jobsnum = len(self._jobs)
-					# Add to the end of jobs with the same wkslim
-					i = jobsnum - 1
-					while i >= 0 and self._jobs[i].wkslim < job.wkslim:
-						i -= 1
-					i += 1
-					# Note: i < jobsnum in the else branch
-					self._jobs.rotate(-i)
-					self._jobs.appendleft(job)
-					self._jobs.rotate(i)
+			if not self.__admissible(job, memall, memfree):
+				# Add to the end of jobs with the same wkslim
+				self._jobs.push(job, 0 if not self.memlimit else job.wkslim)
+				if self._uievents is not None:
+					self.__uievent('queued', job)
 				#self.__reviseWorkers()  # Anyway the workers are revised if exist in the working cycle
 			else:
 				if _DEBUG_TRACE >= 2:
 					print('  Starting "{}", {} jobs, {} workers, {} wkslim'.format(job.name, len(self._jobs)
 						, len(self._workers), self._wkslim))
 				errcode = self.__start(job)
+				if errcode == errno.EAGAIN:
+					errcode = 0  # The job is queued
 		else:
 			errcode = self.__start(job, False)
 			# Note: sequential non-concurrent job is completed automatically on any fails
 		return errcode
 
 
+	def executemany(self, jobs, key=None, reverse=False):
+		"""Schedule the jobs for the concurrent execution
+
+		The jobs are ordered once, the free workers are occupied by the first jobs and
+		the remained jobs are queued at once, which is much faster than the scheduling
+		of each job by execute().
+
+		jobs: iterable(Job)  - the jobs to be executed
+		key: callable  - sort key of the jobs defining their scheduling order, None means the specified order;
+			for example, the largest-first packing is defined by key=lambda job: job.size, reverse=True
+		reverse: bool  - whether the jobs are sorted by the key in the descending order
+		return int  - 0 on successful scheduling, otherwise the error code of the last failed job
+		"""
+		jobs = list(jobs) if key is None else sorted(jobs, key=key, reverse=reverse)
+		if not self.alive:
+			print('WARNING, scheduling of {} jobs is canceled because the execution pool is not alive'
+				.format(len(jobs)), file=sys.stderr if _DEBUG_TRACE else sys.stdout)
+			return errno.EINTR
+		assert len(self._workers) <= self._wkslim and self._wkslim >= 1, (
+			'Number of workers exceeds the limit or the pool has been terminated:'
+			'  workers: {}, wkslim: {}, alive: {}'
+			.format(len(self._workers), self._wkslim, self.alive))
+		errcode = 0
+		if self._tstart is None:
+			self._tstart = time.perf_counter()
+		memall = 0.
+		memfree = 0.
+		if self.memlimit:
+			for wj in self._workers:
+				memall += wj.mem
+			memfree = self.__memfree()
+		queued = []  # Jobs to be queued:  [(job, wkslim)]
+		deferred = False  # Whether the job was queued back by the start since the executors have no free workers
+		for job in jobs:
+			err = self.__prepare(job)
+			if err is not None:
+				if err:
+					errcode = err
+				continue
+			# Note: the jobs are queued after the first queued one to retain the order
+			if not queued and not deferred and self.alive and self.__admissible(job, memall, memfree):
+				err = self.__start(job)
+				if err == errno.EAGAIN:
+					# The job is queued back, so the subsequent jobs are queued to retain the order
+					deferred = True
+				elif err:
+					errcode = err
+				elif self.memlimit:
+					# Reserve the expected memory of the started job, which does not consume it yet
+					memall += self.__memestimate(job, memall)
+			else:
+				queued.append((job, 0 if not self.memlimit else job.wkslim))
+		if queued:
+			self._jobs.extend(queued)
+			if self._uievents is not None:
+				for job, _ in queued:
+					self.__uievent('queued', job)
+		return errcode
+
+
+	def post(self, job):
+		"""Thread-safe scheduling of the job from a foreign thread
+
+		The job is scheduled by the execution cycle (join) on its next tick
+		or on its start if the execution cycle is not running.
+
+		job: Job  - the job to be executed concurrently
+		"""
+		self._inbox.append((job, False))
+
+
+	def cancel(self, job):
+		"""Thread-safe cancellation of the posted job
+
+		The non-started job is canceled and the executing job is terminated
+		without the restart by the execution cycle (join).
+
+		job: Job  - the job to be canceled
+		"""
+		self._inbox.append((job, True))
+
+
+	def __receive(self):
+		"""Process the jobs and their cancellations posted from the foreign threads"""
+		while self._inbox:
+			job, cancel = self._inbox.popleft()
+			if not cancel:
+				self.execute(job)
+			elif job in self._jobs:
+				self._jobs.remove(job)
+				self.__cancel(job, time.perf_counter(), 'the request')
+			elif job in self._workers and job not in self._canceled:
+				self._canceled.add(job)
+				job.terminates += 1
+				# The terminated job should complete the owner task instead of being postponed
+				job._restarting = False
+				job.proc.terminate()
+
+
+	def __prepare(self, job):
+		"""Prepare the job to be scheduled
+
+		The jobs of the expired tasks are canceled, the jobs completed successfully
+		according to the journal are skipped, the resource consumption of the job is
+		predicted from the history.
+
+		job: Job  - the scheduling job
+
+		return  errcode: int  - None if the job is schedulable, otherwise 0 if it is skipped
+			being completed or errno.ETIME if it is canceled
+		"""
+		# Cancel the jobs of the expired tasks
+		if job.task is not None and taskexpired(job):
+			self.__cancel(job, time.perf_counter(), 'the task timeout')
+			return errno.ETIME
+		if self._journal is not None:
+			if JobJournal.key(job) in self._journal.done:
+				# Note: the callbacks of the job were already executed on its completion, the owner
+				# task is notified by the execution cycle since its remained jobs might not be added yet
+				if job.task:
+					self._skipped.append(job)
+				print('Skipping "{}" completed according to the journal'.format(job.name)
+					, file=sys.stderr if _DEBUG_TRACE else sys.stdout)
+				return 0
+			self._journal.write('Q', JobJournal.key(job))
+		# Predict resource consumption of the job from the history
+		if self._history is not None:
+			mem, job.exptime = self._history.predict(job)
+			# Note: the predicted memory is the least expected value like the one inherited
+			# from the jobs of the same category, and the job should be schedulable
+			if (mem and self.memlimit and not job.mem and mem < self.memlimit
+			and (not job.memlim or mem < job.memlim)):
+				job.mem = mem
+		# Initialize the [latest] value of job workers limit
+		if self.memlimit and not job.wkslim:
+			# Consider earlier executed jobs and updated execution pool
+			job.wkslim = self._wkslim if not job.wkslim else min(job.wkslim, self._wkslim)
+		return None
+
+
+	def __admissible(self, job, memall, memfree):
+		"""Whether the job can be started immediately by a free worker
+
+		job: Job  - the scheduling job
+		memall: float  - memory consumed by the workers in GB, actual only if memlimit
+		memfree: float  - available memory in GB, actual only if memlimit
+
+		return  bool  - the job can be started, otherwise it should be queued
+		"""
+		if not self._workers:
+			return True
+		if self._jobs or len(self._workers) >= self._wkslim or self._tadmit > time.perf_counter():
+			return False
+		if not self.memlimit:
+			return True
+		jmemx = self.__memestimate(job, memall)
+		# Note: the low memory condition is omitted for a single worker, otherwise the pool can't be executed
+		return memall + jmemx < self.memlimit and memfree - jmemx > self._MEMLOW
+
+
+	def __memestimate(self, job, memall):
+		"""Expected peak memory of the job extended with the safety margin for its growth
+
+		The consumed or inherited memory of the job, the memory estimated by the jobs
+		history scaled to the job size or the average memory of the workers (if the
+		former values are unknown) is taken.
+
+		job: Job  - the scheduling job
+		memall: float  - memory consumed by the workers in GB
+
+		return  float  - the extended expected memory in GB
+		"""
+		mem = max(job.mem, self._history.estimate(job) or 0)
+		if not mem:
+			mem = memall / (1 + len(self._workers))
+		return mem * self._JMEMTRR
+
+
+	def __packable(self, memall, memavl):
+		"""The largest job fitting into the available memory among the first scheduled jobs
+
+		memall: float  - memory consumed by the workers in GB
+		memavl: float  - available memory for the jobs in GB
+
+		return  job: Job, jmemx: float  - the job and its extended expected memory in GB,
+			(None, None) if there are no fitting jobs
+		"""
+		res = (None, None)
+		for job in self._jobs.head(self._PACKWND):
+			jmemx = self.__memestimate(job, memall)
+			if jmemx < memavl and (res[0] is None or jmemx > res[1]):
+				res = (job, jmemx)
+		return res
+
+
 	def join(self, timeout=0.):
 		"""Execution cycle
 
@@ -2897,22 +5131,51 @@ class ExecPool(object):
 			constraints (timeout, memory limit, etc.)
 		"""
 		#assert timeout >= 0., 'timeout validation failed'
+		if self._inbox:
+			self.__receive()
 		if self._tstart is None:
 			assert not self._jobs and not self._workers, (
 				'Start time should be defined for non-empty execution pool')
 			return False
 
 		self.__reviseWorkers()
+		trevise = time.perf_counter()  # Time of the last revision of the workers constraints
 		while self.alive and (self._jobs or self._workers):
 			if timeout and time.perf_counter() - self._tstart > timeout:
 				print('WARNING, the execution pool is terminated on timeout', file=sys.stderr)
 				self.__terminate()
 				return False
-			time.sleep(self.latency)
-			self.__reviseWorkers()
-			# Revise UI command(s) if the WebUI app has been connected
-			if self._uicmd is not None:
-				self.__reviseUi()
+			tick = self.__tick()
+			# Note: the constraints are revised not more often than the workers termination latency
+			# to give the terminating workers time to complete before killing them
+			trevnext = trevise + max(tick, self._termlatency)
+			# Wait for the workers completion until the next revision, deferred admission or the task deadline;
+			# the completed workers are reaped on each tick if they are not watched
+			tcur = time.perf_counter()
+			twake = trevnext if self._pidfds else min(trevnext, tcur + tick)
+			if self._tadmit > tcur:
+				twake = min(twake, self._tadmit)
+			if self._deadlines:
+				twake = min(twake, self._deadlines[0][0])
+			self.__waitWorkers(twake - time.perf_counter())
+			ttick = time.perf_counter()  # Start of the scheduling work of the tick
+			if self._inbox:
+				self.__receive()
+			tcur = time.perf_counter()
+			if self._deadlines and self._deadlines[0][0] <= tcur:
+				self.__expireTasks(tcur)
+			constrain = tcur >= trevnext
+			if constrain:
+				trevise = tcur
+			tcur = time.perf_counter()
+			self.__reviseWorkers(constrain)
+			self.metrics.revise.observe(time.perf_counter() - tcur)
+			# Publish the state snapshot if the WebUI app has been connected
+			if self._webuiapp is not None:
+				self.__publishUi()
+			self.metrics.tick.observe(time.perf_counter() - ttick)
+		if self._webuiapp is not None:
+			self.__publishUi(True)
 		self._traceFailures()
 		print('The execution pool{} is completed, duration: {} h {} m {:.4f} s'.format(
 			'' if self.name is None else ' ' + self.name
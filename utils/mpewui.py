@@ -4,7 +4,9 @@
 :Description:  Minimalistic Web User Interface for the Multiprocess Execution Pool.
     The functionality includes only fetching of the specified attributes of the
     scheduled and executing Jobs in the specified format (HTML table / JSON / TXT)
-    for the profiling and debugging.
+    for the profiling and debugging, and streaming of the job and task state
+    transitions (Server-Sent Events / JSON lines) for the incremental monitoring
+    and the runtime metrics in the Prometheus text format for the local scrapers.
 
 :Authors: (c) Artem Lutov <artem@exascale.info>
 :Organizations: eXascale Infolab <http://exascale.info/>, Lumais <http://www.lumais.com/>
@@ -12,12 +14,18 @@
 """
 from __future__ import print_function, division  # Required for stderr output, must be the first import
 # External API (exporting functions)
-__all__ = ['WebUiApp', 'UiCmdId', 'UiResOpt', 'UiResFmt', 'UiResCol']
+__all__ = ['WebUiApp', 'UiEvents', 'UiCmdId', 'UiResOpt', 'UiResFmt', 'UiResCol']
 
 # import signal  # Required for the correct handling of KeyboardInterrupt: https://docs.python.org/2/library/thread.html
 import threading  # Run bottle in the dedicated thread
 from functools import partial  # Custom parameterized routes
-from collections import namedtuple  # UiResFilterVal
+from collections import namedtuple, deque  # UiResFilterVal, UiEvents
+from itertools import islice  # UiEvents
+from wsgiref.simple_server import WSGIServer  # Threaded server of the WebUI
+try:
+	from socketserver import ThreadingMixIn
+except ImportError:  # Python 2
+	from SocketServer import ThreadingMixIn
 # Internal format serialization to JSON/HTM/TXT
 import re
 import json
@@ -108,10 +116,10 @@ def inferNumType(val):
 	return val
 
 
-UiCmdId = IntEnum('UiCmdId', 'FAILURES LIST_JOBS LIST_TASKS API_MANUAL')  # JOB_INFO, TASK_INFO
+UiCmdId = IntEnum('UiCmdId', 'FAILURES LIST_JOBS LIST_TASKS API_MANUAL EVENTS METRICS')  # JOB_INFO, TASK_INFO
 """UI Command Identifier associated with the REST URL"""
 
-UiResOpt = IntEnum('UiResOpt', 'fmt cols flt lim refresh')  # fltStatus / kind
+UiResOpt = IntEnum('UiResOpt', 'fmt cols flt lim refresh offset')  # fltStatus / kind
 # Note: filter keys ending with '*' are optional (such columns allowed
 # to be absent in the target item)
 """UI Command parameters
@@ -125,6 +133,7 @@ flt: str(UiResFilterVal)  - filter target items per each column, notations:
 lim: uint  - limit of the listed number of the active jobs / tasks having this number of jobs, 0 means any;
 	NOTE: lim omission results in the ExecPool default value for the lim, failures are always fully shown.
 refresh: uint  - page refresh time, seconds >= 2
+offset: uint  - the number of the first filtered jobs to be skipped for the pagination, 0 by default
 """
 # TODO features:
 # - add inverse notation the the item filter: ! - invert condition
@@ -292,31 +301,10 @@ class ResultOptions(object):
 		self.refresh = qdict.get(UiResOpt.refresh.name)
 		if self.refresh:
 			self.refresh = int(self.refresh)  # Note: refresh content value is int
-
-
-class UiCmd(object):
-	"""UI Command (for the MVC controller)"""
-	def __init__(self, cid, data={}):
-		"""UI command
-
-		Args:
-			cid: UiCmdId  - Command identifier
-			data: dict  - request (parameters) to the ExecPool on its call and
-				resulting (response) data (or empty dict) afterwards
-
-		Internal attributes:
-			cond: Condition  - synchronizing condition
-		"""
-		# params (dict)  - Command parameters, params={};   and isinstance(params, dict)
-		#dshape (set(str), optional): Defaults to None. Expected data shape (columns of the returning table)
-		# self.lock = threading.Lock()
-		self.cond = threading.Condition()  # (self.lock)
-		assert (cid is None or isinstance(cid, UiCmdId)) and isinstance(data, dict), (
-			'Unexpected type of arguments, id: {}, data: {}'.format(type(id).__name__, type(data).__name__))
-		self.id = cid
-		# self.dshape = dshape
-		# self.params = params
-		self.data = data
+		# Fetch the pagination offset if any
+		self.offset = int(qdict.get(UiResOpt.offset.name, 0))
+		if self.offset < 0:
+			raise ValueError('The offset should be non-negative: {}'.format(self.offset))
 
 
 class SummaryBrief(object):
@@ -357,6 +345,175 @@ class SummaryBrief(object):
 		return {p: self.__getattribute__(p) for p in self.__slots__}
 
 
+class UiEvents(object):
+	"""Bounded journal of the job and task state transitions streamed by the WebUI
+
+	The events are published by the execution cycle in batches and fetched by the
+	streaming WebUI clients since their last received event, so the traffic is
+	proportional to the state changes rather than to the whole state. Each event is
+	a tuple (seq, kind, data), where seq is a sequential id of the event, kind is
+	the transition name and data is a dict of the transitioned item properties.
+
+	>>> evs = UiEvents(size=2)
+	>>> evs.publish([('queued', {'name': 'j1'}), ('started', {'name': 'j1'})])
+	>>> [seq for seq, kind, data in evs.fetch(0)]
+	[1, 2]
+	>>> evs.fetch(2, timeout=0)
+	[]
+	>>> evs.publish([('finished', {'name': 'j1'})])
+	>>> evs.fetch(0) is None  # The first event has been evicted
+	True
+	>>> [kind for seq, kind, data in evs.fetch(1)]
+	['started', 'finished']
+	"""
+	__slots__ = ('seq', '_events', '_cond')
+
+	def __init__(self, size=8192):
+		"""Events journal initialization
+
+		size: int  - max number of the retained events
+		"""
+		self.seq = 0  # Id of the last published event
+		self._events = deque(maxlen=size)
+		self._cond = threading.Condition()
+
+
+	def publish(self, events):
+		"""Publish the events notifying the waiting clients
+
+		events: iterable((kind, data))  - the events to be published
+		"""
+		with self._cond:
+			for kind, data in events:
+				self.seq += 1
+				self._events.append((self.seq, kind, data))
+			self._cond.notify_all()
+
+
+	def fetch(self, seq, timeout=0):
+		"""Fetch the events following the specified one
+
+		seq: int  - id of the last received event
+		timeout: float  - max time in sec to wait for the new events
+
+		return  list((seq, kind, data)) | None  - the events, None if some of the requested
+			events have been already evicted (or seq is unknown) and the whole state should be refetched
+		"""
+		with self._cond:
+			if self.seq == seq and timeout:
+				self._cond.wait(timeout)
+			if seq > self.seq or (seq < self.seq and self._events[0][0] > seq + 1):
+				return None
+			return list(islice(self._events, len(self._events) - (self.seq - seq), None))
+
+
+def formatTxt(data):
+	"""Format the response data of the UI command in the compact text
+
+	The items are listed as tab-separated values with the header, the task members
+	are indented with tabs, the undefined values are shown as '-'.
+
+	data: dict  - the response data of the UI command, see UiState.query()
+
+	return  str  - the formatted data
+
+	>>> formatTxt({'jobsInfo': [('name', 'pid'), ('j1', 12), ('j2', None)]}).splitlines()
+	['# Jobs', 'name\\tpid', 'j1\\t12', 'j2\\t-']
+	"""
+	lines = []
+	cells = lambda vals: '\t'.join(['-' if val is None else str(val) for val in vals])
+	errmsg = data.get('errmsg')
+	if errmsg:
+		lines.append('# ' + errmsg.replace('\n', '\n# '))
+	smr = data.get('summary')
+	if smr is not None:
+		lines.append('# ' + ' '.join(['{}: {}'.format(prop, val) for prop, val in sorted(smr.json().items())]))
+	for key, title in (('workersInfo', 'Workers'), ('jobsInfo', 'Jobs')):
+		items = data.get(key)
+		if items:
+			lines.append('# ' + title)
+			lines.extend([cells(vals) for vals in items])
+	items = data.get('tasksInfo')
+	if items:
+		lines.append('# Tasks')
+		lines.extend(['\t' * tfi.ident + cells(tfi.data) for tfi in items])
+	lines.append('')
+	return '\n'.join(lines)
+
+
+def formatMetrics(state):
+	"""Format the ExecPool metrics in the Prometheus text exposition format
+
+	state: UiState  - the ExecPool state snapshot
+
+	return  str  - the metrics
+	"""
+	lines = []
+	# Note: label values should escape backslash, double-quote and line feed
+	quoted = lambda val: '"{}"'.format(str(val).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+	pool = '' if state.name is None else 'pool=' + quoted(state.name)
+
+	def labeled(name, labels=''):
+		"""Metric name with the pool and the specified labels"""
+		labels = ','.join(lbs for lbs in (pool, labels) if lbs)
+		return name if not labels else '{}{{{}}}'.format(name, labels)
+
+	def metric(name, mtype, descr, val):
+		"""Append the metric having a single value"""
+		lines.extend(('# HELP {} {}'.format(name, descr), '# TYPE {} {}'.format(name, mtype)
+			, '{} {}'.format(labeled(name), val)))
+
+	def histogram(name, descr, hist, scale=1):
+		"""Append the histogram with the values scaled to the base units"""
+		lines.extend(('# HELP {} {}'.format(name, descr), '# TYPE {} histogram'.format(name)))
+		buckets = hist.cumulative()
+		for bound, cnt in buckets:
+			lines.append('{} {}'.format(labeled(name + '_bucket', 'le="{}"'.format(
+				'+Inf' if bound == float('inf') else repr(bound * scale))), cnt))
+		lines.append('{} {}'.format(labeled(name + '_sum'), repr(hist.sum * scale)))
+		lines.append('{} {}'.format(labeled(name + '_count'), buckets[-1][1]))
+
+	smr = state.summary
+	metric('mpepool_up', 'gauge', 'Whether the execution pool is alive', int(state.alive))
+	metric('mpepool_queue_depth', 'gauge', 'The number of the non-started jobs', smr.jobs)
+	metric('mpepool_workers', 'gauge', 'The number of the executing jobs', smr.workers)
+	metric('mpepool_tasks', 'gauge', 'The number of the started tasks', smr.tasks)
+	metric('mpepool_jobs_completed_total', 'counter', 'The number of the successfully completed jobs', smr.jobsDone)
+	metric('mpepool_jobs_failed_total', 'counter', 'The number of the failed jobs', smr.jobsFailed)
+	# Jobs per category
+	running = {}
+	for wji in state.workers:
+		if wji.category is not None:
+			running[wji.category] = running.get(wji.category, 0) + 1
+	lines.extend(('# HELP mpepool_category_jobs The number of the non-finished jobs per category and state'
+		, '# TYPE mpepool_category_jobs gauge'))
+	for jstate, cats in (('queued', state.categories), ('running', running)):
+		for cat, num in sorted(cats.items(), key=lambda item: str(item[0])):
+			lines.append('{} {}'.format(labeled('mpepool_category_jobs', 'category={},state="{}"'.format(
+				quoted(cat), jstate)), num))
+	metric('mpepool_cpu_load_ratio', 'gauge', 'CPU load of the system', state.cpuLoad)
+	metric('mpepool_ram_used_bytes', 'gauge', 'Used RAM of the system', int(state.ramUsage * 1024**3))
+	mtr = state.metrics
+	metric('mpepool_jobs_postponed_total', 'counter', 'The number of the jobs postponed by the memory limit'
+		, mtr.postponed)
+	metric('mpepool_jobs_restarted_total', 'counter', 'The number of the restarts of the terminated jobs'
+		, mtr.restarted)
+	metric('mpepool_jobs_timeouts_total', 'counter', 'The number of the jobs terminated by their timeout'
+		, mtr.timeouts)
+	histogram('mpepool_tick_seconds', 'Scheduling work per tick of the execution cycle', mtr.tick)
+	histogram('mpepool_revise_seconds', 'Revision of the workers per tick', mtr.revise)
+	histogram('mpepool_job_duration_seconds', 'Wall time of the completed jobs', mtr.jobtime)
+	histogram('mpepool_job_peak_memory_bytes', 'Peak memory consumption of the completed jobs'
+		, mtr.jobmem, 1024**3)
+	lines.append('')
+	return '\n'.join(lines)
+
+
+class ThreadingWsgiServer(ThreadingMixIn, WSGIServer):
+	"""WSGI server handling each request in a dedicated thread to not block the UI by the event streams"""
+	daemon_threads = True
+
+
 class WebUiApp(threading.Thread):
 	"""WebUI App starting in the dedicated thread and providing remote interface to inspect ExecPool"""
 	RAM = None
@@ -364,6 +521,8 @@ class WebUiApp(threading.Thread):
 	CPUCORES = None  # CPU Cores <= LCPUS
 	CPUNODES = None  # NUMA nodes (typically, physical CPUs)
 	WKSMAX = None
+	_RESPMAX = 64  # Max number of the cached responses per the state version
+	_FEEDPING = 15  # Max silence of the event stream in sec, a comment (keep-alive) is sent to the idle client
 
 	def __init__(self, host='localhost', port=8080, name=None, daemon=None, group=None, args=(), kwargs={}):
 		"""WebUI App constructor
@@ -383,21 +542,33 @@ class WebUiApp(threading.Thread):
 			kwargs: dict  - A dictionary of keyword arguments for the target invocation.
 
 		Internal attributes:
-			cmd: UiCmd  - UI command to be executed, which includes (reserved) attribute(s) for the invocation result.
+			state: UiState  - the latest immutable snapshot of the ExecPool state published by the
+				execution cycle, None if not published yet. The snapshot is replaced atomically,
+				so neither the WebUI nor the ExecPool waits for the other.
+			events: UiEvents  - the journal of the job and task state transitions published
+				by the execution cycle and streamed to the clients
 		"""
 		# target (callable, optional): Defaults to None. The callable object to be invoked by the run() method.
-		self.cmd = UiCmd(None)  # Shared data between the UI WebApp and MpePool backend
+		self.state = None  # State snapshot shared between the MpePool backend and the UI WebApp
+		# Responses rendered from the current state:  {(version, UiCmdId, query): (status, ctype, body)}
+		self._responses = {}
+		self._respver = None  # Version of the state of the rendered responses
+		self.events = UiEvents()  # State transitions streamed to the clients
         # Initialize web app before starting the thread
 		webuiapp = bottle.default_app()  # The same as bottle.Bottle()
 		# Define partial function with the substituted first parameter
-		webuiapp.route('/', callback=partial(WebUiApp.root, self.cmd), name=UiCmdId.FAILURES.name)
-		webuiapp.route('/jobs', callback=partial(WebUiApp.jobs, self.cmd), name=UiCmdId.LIST_JOBS.name)
-		webuiapp.route('/tasks', callback=partial(WebUiApp.tasks, self.cmd), name=UiCmdId.LIST_TASKS.name)
+		webuiapp.route('/', callback=partial(WebUiApp.root, self), name=UiCmdId.FAILURES.name)
+		webuiapp.route('/jobs', callback=partial(WebUiApp.jobs, self), name=UiCmdId.LIST_JOBS.name)
+		webuiapp.route('/tasks', callback=partial(WebUiApp.tasks, self), name=UiCmdId.LIST_TASKS.name)
 		webuiapp.route('/apinfo', callback=WebUiApp.apinfo, name=UiCmdId.API_MANUAL.name)
+		webuiapp.route('/events', callback=partial(WebUiApp.feed, self), name=UiCmdId.EVENTS.name)
+		webuiapp.route('/metrics', callback=partial(WebUiApp.metrics, self), name=UiCmdId.METRICS.name)
 		# TODO, add interfaces to inspect tasks and selected jobs/tasks:
 		# webuiapp.route('/job/<name>', callback=mroot, name=UiCmdId.JOB_INFO.name)
 		# webuiapp.route('/task/<name>', callback=mroot, name=UiCmdId.TASK_INFO.name)
 		kwargs.update({'host': host, 'port': port})
+		# Note: the event streams are long-living requests, which should not block the remained ones
+		kwargs.setdefault('server_class', ThreadingWsgiServer)
 		print('WebUI "{}" is starting on {}:{}'.format(name, host, port))
 		super(WebUiApp, self).__init__(group=group, target=webuiapp.run, name=name, args=args, kwargs=kwargs)
 		self.daemon = daemon
@@ -422,8 +593,113 @@ class WebUiApp(threading.Thread):
 			return 'Nothing here, sorry'
 
 
+	def respond(self, cmdid, render):
+		"""Respond to the UI command from the published state snapshot
+
+		The response is identified by the state version (ETag), so the unchanged state
+		is not transferred to the client (304 Not Modified) and the rendered responses are
+		reused for the same queries until the state is updated.
+
+		Args:
+			cmdid (UiCmdId): UI command identifier
+			render (callable): HTML renderer of the response: render(resopts, data) -> str
+
+		Returns:
+			str: the response body
+		"""
+		state = self.state  # Note: the snapshot is replaced atomically by the ExecPool
+		if state is None:
+			# 503  - Service Unavailable
+			bottle.response.status = 503
+			return 'The execution pool has not published its state yet'
+		etag = '"{}"'.format(state.version)
+		bottle.response.set_header('ETag', etag)
+		bottle.response.set_header('Cache-Control', 'no-cache')
+		if etag in (tag.strip() for tag in bottle.request.get_header('If-None-Match', '').split(',')):
+			# 304  - Not Modified
+			bottle.response.status = 304
+			return ''
+		if self._respver != state.version:
+			self._responses = {}
+			self._respver = state.version
+		# Note: the requests are served concurrently, so the responses are also identified by the version
+		key = (state.version, cmdid, bottle.request.query_string)
+		resp = self._responses.get(key)
+		if resp is None:
+			resp = self.__render(state, cmdid, render)
+			if len(self._responses) < self._RESPMAX:
+				self._responses[key] = resp
+		status, ctype, body = resp
+		bottle.response.status = status
+		if ctype:
+			bottle.response.content_type = ctype
+		return body
+
+
 	@staticmethod
-	def root(cmd):
+	def __render(state, cmdid, render):
+		"""Render the response to the UI command
+
+		Args:
+			state (UiState): the ExecPool state snapshot
+			cmdid (UiCmdId): UI command identifier
+			render (callable): HTML renderer of the response
+
+		Returns:
+			status: int, ctype: str, body: str  - HTTP status, content type (None means default) and body
+		"""
+		# Parameters fetching options:
+		# 1. The arguments extracted from the URL:
+		# bottle.request.url_args		# Empty
+		# 2. Raw URL params as str:
+		# bottle.request.query_string	# OK
+		# 3. URL params as MultiDict:
+		# bottle.request.query
+
+		# Parse URL parameters and form the UI command parameters
+		try:
+			resopts = ResultOptions(bottle.request.query)
+		except (KeyError, ValueError) as err:
+			# 400  - Bad Request
+			# 415  - Unsupported Media Type
+			return 400, None, 'Invalid value of the URL parameter, {}'.format(err)
+		data = state.query(cmdid, None if not resopts.cols else resopts.cols.split(',')
+			, None if not resopts.flt else resopts.fltopts, resopts.lim, resopts.offset)
+		# Expected format of data is a table: header, rows
+		if resopts.fmt == UiResFmt.json:
+			return 200, 'application/json', json.dumps(data, default=lambda obj: obj.json())
+		elif resopts.fmt == UiResFmt.txt:
+			return 200, 'text/plain; charset=utf-8', formatTxt(data)
+		#elif fmt == UiResFmt.htm:
+		# HTML format by default
+		return 200, None, render(resopts, data)
+
+
+	@staticmethod
+	def pageargs(resopts, data):
+		"""Common arguments of the HTML page template
+
+		Args:
+			resopts (ResultOptions): result options of the request
+			data (dict): response data of the UI command
+
+		Returns:
+			dict: the template arguments
+		"""
+		smr = data.get('summary')
+		return dict(pageRefresh=resopts.refresh, errmsg=data.get('errmsg')
+			, summary=smr is not None, ramUsage=data.get('ramUsage', 'NA')
+				, ramTotal=WebUiApp.RAM, cpuLoad=data.get('cpuLoad', 'NA')
+				, lcpus=WebUiApp.LCPUS, cpuCores=WebUiApp.CPUCORES, cpuNodes=WebUiApp.CPUNODES
+				, workers=smr.workers, wksmax=WebUiApp.WKSMAX
+				, jobsFailed=smr.jobsFailed, jobs=smr.jobs, jobsDone=smr.jobsDone
+				, tasksRootFailed=smr.tasksRootFailed, tasksRoot=smr.tasksRoot
+				, tasksFailed=smr.tasksFailed, tasks=smr.tasks
+			, lim=data.get(UiResOpt.lim), offset=data.get(UiResOpt.offset))
+
+
+	@staticmethod
+	def root(app):
 		"""Default command of the UI (UiCmdId.FAILURES)
 
 		Shows:
@@ -455,225 +731,94 @@ class WebUiApp(threading.Thread):
 				category  - job category if specified
 
 		Args:
-			cmd (UiCmd): UI command to be executed
+			app (WebUiApp): the WebUI app
 
 		Returns:
 			Jobs listing for the specified detalization in the specified format
 		"""
-		# Parameters fetching options:
-		# 1. The arguments extracted from the URL:
-		# bottle.request.url_args		# Empty
-		# 2. Raw URL params as str:
-		# bottle.request.query_string	# OK
-		# 3. URL params as MultiDict:
-		# bottle.request.query
-
-		# Parse URL parameters and form the UI command parameters
-		try:
-			resopts = ResultOptions(bottle.request.query)
-		except (KeyError, ValueError) as err:
-			# 400  - Bad Request
-			# 415  - Unsupported Media Type
-			bottle.response.status = 400
-			return 'Invalid value of the URL parameter, {}'.format(err)
-			# return 'Invalid URL parameter value of "{}": {}'.format(UiResOpt.fmt.name
-			# 	, bottle.request.query[UiResOpt.fmt.name])  #pylint: disable=E1136
-
-		with cmd.cond:
-			cmd.id = UiCmdId.FAILURES
-			# Prepare .data for the request parameters storage
-			if cmd.data:
-				cmd.data.clear()
-			if resopts.cols:
-				cmd.data[UiResOpt.cols] = resopts.cols.split(',')
-				# cols = None
-			if resopts.flt:
-				cmd.data[UiResOpt.flt] = resopts.fltopts
-				# flt = None
-			if resopts.lim is not None:
-				cmd.data[UiResOpt.lim] = resopts.lim
-			# fltStatus = qdict.get(UiResOpt.fltStatus.name)  #pylint: disable=E1101
-			# if fltStatus:
-			# 	cmd.data[UiResOpt.fltStatus] = fltStatus.split(',')
-
-			# Wait for the command execution and notification
-			# return "cmd.id: {}, cmd.data: {}, keys: {}, vals: {}".format(
-			# 	cmd.id, cmd.data.items(), cmd.data.keys(), cmd.data.values())
-			cmd.cond.wait()
-			# Now .data contains the response results
-			# Read the result and transfer to the client
-			if not cmd.data:
-				# 500 Internal Server Error
-				bottle.response.status = 500
-				return 'Service error occurred, the command has not been executed'
-
-			cmderr = cmd.data.get('errmsg')  # Error message
-			if len(cmd.data) == 1 and cmderr:
-				# Note: occurs mostly if the execution pool is finished
-				# 503  - Service Unavailable
-				bottle.response.status = 503
-				return cmderr
-
-			# Expected format of data is a table: header, rows
-			if resopts.fmt == UiResFmt.json:
-				return json.dumps(cmd.data, default=lambda obj: obj.json())
-			elif resopts.fmt == UiResFmt.txt:
-				# 501  - Not Implemented
-				bottle.response.status = 501
-				return 'Not Implemented'
-				# TOFIX
-				# return '\n'.join(['\t'.join([str(v) for v in cols]) for cols in cmd.data])
-			#elif fmt == UiResFmt.htm:
-			else:  # HTML format by default
-				smr = cmd.data.get('summary')
-				# print('>>> jobsInfo: {}'.format(cmd.data.get('jobsInfo')))
-				return bottle.template('webui', pageRefresh=resopts.refresh, title='Failures'
-					, pageDescr='Information about the failed tasks and jobs.'
-					, page='failures', errmsg=cmderr
-					, summary=smr is not None, ramUsage=cmd.data.get('ramUsage', 'NA')
-						, ramTotal=WebUiApp.RAM, cpuLoad=cmd.data.get('cpuLoad', 'NA')
-						, lcpus=WebUiApp.LCPUS, cpuCores=WebUiApp.CPUCORES, cpuNodes=WebUiApp.CPUNODES
-						, workers=smr.workers, wksmax=WebUiApp.WKSMAX
-						, jobsFailed=smr.jobsFailed, jobs=smr.jobs, jobsDone=smr.jobsDone
-						, tasksRootFailed=smr.tasksRootFailed, tasksRoot=smr.tasksRoot
-						, tasksFailed=smr.tasksFailed, tasks=smr.tasks
-					, jobsFailedInfo=cmd.data.get('jobsInfo'), tasksFailedInfo=cmd.data.get('tasksInfo')
-					, tasksFailedInfoWide=cmd.data.get('tasksInfoWide'), lim=cmd.data.get(UiResOpt.lim)
-					)
+		return app.respond(UiCmdId.FAILURES, lambda resopts, data: bottle.template('webui', title='Failures'
+			, pageDescr='Information about the failed tasks and jobs.', page='failures'
+			, jobsFailedInfo=data.get('jobsInfo'), tasksFailedInfo=data.get('tasksInfo')
+			, tasksFailedInfoWide=data.get('tasksInfoWide'), **WebUiApp.pageargs(resopts, data)))
 
 
 	@staticmethod
-	def jobs(cmd):
+	def jobs(app):
 		"""Jobs listing including workers (UiCmdId.LIST_JOBS)"""
-		# # 501  - Not Implemented
-		# bottle.response.status = 501
-		# return 'Not Implemented'
-		try:
-			resopts = ResultOptions(bottle.request.query)
-		except (KeyError, ValueError) as err:
-			# 400  - Bad Request
-			# 415  - Unsupported Media Type
-			bottle.response.status = 400
-			return 'Invalid value of the URL parameter, {}'.format(err)
-
-		with cmd.cond:
-			cmd.id = UiCmdId.LIST_JOBS
-			# Prepare .data for the request parameters storage
-			if cmd.data:
-				cmd.data.clear()
-			if resopts.cols:
-				cmd.data[UiResOpt.cols] = resopts.cols.split(',')
-				# print('>> cols:', cmd.data[UiResOpt.cols], cmd.data.get(UiResOpt.cols))
-				# cols = None
-			if resopts.flt:
-				cmd.data[UiResOpt.flt] = resopts.fltopts
-				# flt = None
-			if resopts.lim is not None:
-				cmd.data[UiResOpt.lim] = resopts.lim
-
-			cmd.cond.wait()
-			# Now .data contains the response results
-			# Read the result and transfer to the client
-			if not cmd.data:
-				# 500 Internal Server Error
-				bottle.response.status = 500
-				return 'Service error occurred, the command has not been executed'
-
-			cmderr = cmd.data.get('errmsg')  # Error message
-			if len(cmd.data) == 1 and cmderr:
-				# Note: occurs mostly if the execution pool is finished
-				# 503  - Service Unavailable
-				bottle.response.status = 503
-				return cmderr
-
-			if resopts.fmt == UiResFmt.json:
-				return json.dumps(cmd.data, default=lambda obj: obj.json())
-			elif resopts.fmt == UiResFmt.txt:
-				# 501  - Not Implemented
-				bottle.response.status = 501
-				return 'Not Implemented'
-				# TOFIX
-				# return '\n'.join(['\t'.join([str(v) for v in cols]) for cols in cmd.data])
-			#elif fmt == UiResFmt.htm:
-			else:  # HTML format by default
-				smr = cmd.data.get('summary')
-				return bottle.template('webui', pageRefresh=resopts.refresh, title='Jobs'
-					, pageDescr='Information about the executing (workers) and deferred jobs (non-finished items only).'
-					, page='jobs', errmsg=cmderr
-					, summary=smr is not None, ramUsage=cmd.data.get('ramUsage', 'NA')
-						, ramTotal=WebUiApp.RAM, cpuLoad=cmd.data.get('cpuLoad', 'NA')
-						, lcpus=WebUiApp.LCPUS, cpuCores=WebUiApp.CPUCORES, cpuNodes=WebUiApp.CPUNODES
-						, workers=smr.workers, wksmax=WebUiApp.WKSMAX
-						, jobsFailed=smr.jobsFailed, jobs=smr.jobs, jobsDone=smr.jobsDone
-						, tasksRootFailed=smr.tasksRootFailed, tasksRoot=smr.tasksRoot
-						, tasksFailed=smr.tasksFailed, tasks=smr.tasks
-					, workersInfo=cmd.data.get('workersInfo'), jobsInfo=cmd.data.get('jobsInfo')
-					, lim=cmd.data.get(UiResOpt.lim)
-					)
+		return app.respond(UiCmdId.LIST_JOBS, lambda resopts, data: bottle.template('webui', title='Jobs'
+			, pageDescr='Information about the executing (workers) and deferred jobs (non-finished items only).'
+			, page='jobs', workersInfo=data.get('workersInfo'), jobsInfo=data.get('jobsInfo')
+			, **WebUiApp.pageargs(resopts, data)))
 
 
 	@staticmethod
-	def tasks(cmd):
+	def tasks(app):
 		"""Listing of the hierarchical tasks with their subtasks and jobs"""
+		return app.respond(UiCmdId.LIST_TASKS, lambda resopts, data: bottle.template('webui', title='Tasks'
+			, pageDescr='Information about the non-finished hierarchy of tasks with their jobs.'
+			, page='tasks', tasksInfo=data.get('tasksInfo'), tasksInfoWide=data.get('tasksInfoWide')
+			, **WebUiApp.pageargs(resopts, data)))
+
+
+	@staticmethod
+	def feed(app):
+		"""Stream of the job and task state transitions (UiCmdId.EVENTS)
+
+		The events are streamed as Server-Sent Events (text/event-stream) or as
+		newline-delimited JSON objects {"id", "event", "data"} if fmt=json. The stream
+		starts after the event specified by the Last-Event-ID header or the `from` URL
+		parameter, or with the new events if neither is specified. The "reset" event
+		is sent instead of the lost events, which means that the whole state should be
+		refetched from the respective listing.
+		"""
+		fmt = bottle.request.query.get(UiResOpt.fmt.name)
 		try:
-			resopts = ResultOptions(bottle.request.query)
+			if fmt is not None:
+				fmt = UiResFmt[fmt]
+				if fmt != UiResFmt.json:
+					raise KeyError('only json is supported besides the SSE: ' + fmt.name)
+			seq = bottle.request.get_header('Last-Event-ID', bottle.request.query.get('from'))
+			seq = app.events.seq if seq is None else int(seq)
 		except (KeyError, ValueError) as err:
-			# 400  - Bad Request
-			# 415  - Unsupported Media Type
 			bottle.response.status = 400
 			return 'Invalid value of the URL parameter, {}'.format(err)
+		if fmt == UiResFmt.json:
+			bottle.response.content_type = 'application/x-ndjson'
+			evfmt = lambda seq, kind, data: json.dumps({'id': seq, 'event': kind, 'data': data}) + '\n'
+			ping = '\n'
+		else:
+			bottle.response.content_type = 'text/event-stream'
+			evfmt = lambda seq, kind, data: 'id: {}\nevent: {}\ndata: {}\n\n'.format(seq, kind, json.dumps(data))
+			ping = ': ping\n\n'
+		bottle.response.set_header('Cache-Control', 'no-cache')
+		bottle.response.set_header('X-Accel-Buffering', 'no')  # Disable buffering by the reverse proxy
+
+		def stream(seq):
+			"""Stream the events following seq until the client is disconnected"""
+			while True:
+				events = app.events.fetch(seq, WebUiApp._FEEDPING)
+				if events is None:
+					seq = app.events.seq
+					yield evfmt(seq, 'reset', {'seq': seq})
+				elif events:
+					seq = events[-1][0]
+					yield ''.join([evfmt(*ev) for ev in events])
+				else:
+					yield ping
+		return stream(seq)
+
 
-		with cmd.cond:
-			cmd.id = UiCmdId.LIST_TASKS
-			# Prepare .data for the request parameters storage
-			if cmd.data:
-				cmd.data.clear()
-			if resopts.cols:
-				cmd.data[UiResOpt.cols] = resopts.cols.split(',')
-			if resopts.flt:
-				cmd.data[UiResOpt.flt] = resopts.fltopts
-			if resopts.lim is not None:
-				cmd.data[UiResOpt.lim] = resopts.lim
-
-			cmd.cond.wait()
-			# Now .data contains the response results
-			# Read the result and transfer to the client
-			if not cmd.data:
-				# 500 Internal Server Error
-				bottle.response.status = 500
-				return 'Service error occurred, the command has not been executed'
-
-			cmderr = cmd.data.get('errmsg')  # Error message
-			if len(cmd.data) == 1 and cmderr:
-				# Note: occurs mostly if the execution pool is finished
-				# 503  - Service Unavailable
-				bottle.response.status = 503
-				return cmderr
-
-			if resopts.fmt == UiResFmt.json:
-				return json.dumps(cmd.data, default=lambda obj: obj.json())
-			elif resopts.fmt == UiResFmt.txt:
-				# 501  - Not Implemented
-				bottle.response.status = 501
-				return 'Not Implemented'
-				# TOFIX
-				# return '\n'.join(['\t'.join([str(v) for v in cols]) for cols in cmd.data])
-			#elif fmt == UiResFmt.htm:
-			else:  # HTML format by default
-				smr = cmd.data.get('summary')
-				return bottle.template('webui', pageRefresh=resopts.refresh, title='Tasks'
-					, pageDescr='Information about the non-finished hierarchy of tasks with their jobs.'
-					, page='tasks', errmsg=cmderr
-					, summary=smr is not None, ramUsage=cmd.data.get('ramUsage', 'NA')
-						, ramTotal=WebUiApp.RAM, cpuLoad=cmd.data.get('cpuLoad', 'NA')
-						, lcpus=WebUiApp.LCPUS, cpuCores=WebUiApp.CPUCORES, cpuNodes=WebUiApp.CPUNODES
-						, workers=smr.workers, wksmax=WebUiApp.WKSMAX
-						, jobsFailed=smr.jobsFailed, jobs=smr.jobs, jobsDone=smr.jobsDone
-						, tasksRootFailed=smr.tasksRootFailed, tasksRoot=smr.tasksRoot
-						, tasksFailed=smr.tasksFailed, tasks=smr.tasks
-					, tasksInfo=cmd.data.get('tasksInfo'), tasksInfoWide=cmd.data.get('tasksInfoWide')
-					, lim=cmd.data.get(UiResOpt.lim)
-					)
+	@staticmethod
+	def metrics(app):
+		"""Runtime metrics of the ExecPool in the Prometheus text format (UiCmdId.METRICS)"""
+		state = app.state
+		if state is None:
+			bottle.response.status = 503
+			return 'The execution pool has not published its state yet'
+		# Note: the metrics are always actual and not cached, unlike the state listings
+		bottle.response.content_type = 'text/plain; version=0.0.4; charset=utf-8'
+		bottle.response.set_header('Cache-Control', 'no-cache')
+		return formatMetrics(state)
 
 
 	@staticmethod
@@ -240,6 +240,9 @@
 <!-- Show tasks/jobs limit, which restricts the number of shown failed tasks -->
 <p><span class="label">Items limit:</span> {{lim}}</p>
 	% end
+	% if get('offset'):
+<p><span class="label">Offset:</span> {{offset}}</p>
+	% end
 % end  # tasksFailedInfo
 
 <!-- Jobs page specific data ############################################### -->
@@ -283,6 +286,9 @@
 	% if get('lim'):
 <p><span class="label">Jobs limit:</span> {{lim}}</p>
 	% end
+	% if get('offset'):
+<p><span class="label">Offset:</span> {{offset}}</p>
+	% end
 % end  # jobsInfo
 
 <!-- Tasks page specific data ############################################## -->
@@ -320,6 +326,9 @@
 <!-- Show tasks/jobs limit, which restricts the number of shown failed tasks -->
 <p><span class="label">Items limit:</span> {{lim}}</p>
 	% end
+	% if get('offset'):
+<p><span class="label">Offset:</span> {{offset}}</p>
+	% end
 % end  # tasksInfo
 
 <!-- API Manual page specific data ######################################### -->